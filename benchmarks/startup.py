@@ -0,0 +1,99 @@
+"""
+Бенчмарк часу старту: кожна команда — окремий процес Python, як у cron-задачах.
+Час рахується без старту самого інтерпретатора (python -c pass). Команди, що працюють з базою,
+порівнюються з бюджетом понад базовий рівень — імпорт sqlalchemy.orm, виміряний на тій самій машині:
+він займає більшу частину часу старту і сильно залежить від машини, тож абсолютні бюджети
+або хиблять на повільних машинах, або не помічають регресій власного коду на швидких.
+
+    python benchmarks/startup.py            # 10 запусків на команду
+    python benchmarks/startup.py -n 30 --json
+
+Код виходу 1 — якщо медіана хоча б однієї команди перевищила бюджет.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# базовий рівень: те, що імпортує кожна команда з базою і на що код застосунку не впливає
+BASELINE = ["-c", "import sqlalchemy.orm"]
+
+# бюджет (мс): "import main" — понад старт інтерпретатора (кілька мс, тож запас — на шум запуску процесу),
+# решта — понад базовий рівень, ~1.5x від виміряного (140-170 мс): помітна регресія вже дає ❌;
+# на шумних машинах — --budget-scale
+BUDGETS_MS = {
+    "import main": 60,
+    "main.py stats": 200,
+    "main.py search --exact": 220,
+    "main.py report counts": 250,
+}
+# команди, що не імпортують SQLAlchemy (бюджет — без базового рівня)
+NO_BASELINE = {"import main"}
+
+COMMANDS = {
+    "import main": ["-c", "import main"],
+    "main.py stats": ["main.py", "stats"],
+    "main.py search --exact": ["main.py", "search", "--exact", "word_1"],
+    "main.py report counts": ["main.py", "report", "counts"],
+}
+
+
+def run_once(args, env) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=ROOT, env=env, check=False,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - started) * 1000
+
+
+def measure(args, env, runs: int) -> float:
+    run_once(args, env)  # прогрів: кеш файлової системи, .pyc, створення схеми
+    return statistics.median(run_once(args, env) for _ in range(runs))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--runs", type=int, default=10)
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="множник бюджетів (повільні машини)")
+    parser.add_argument("--json", action="store_true", help="результат у JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, SLOVNYK_DB_PATH=str(Path(tmp) / "bench.db"))
+        interpreter = measure(["-c", "pass"], env, args.runs)
+        baseline = measure(BASELINE, env, args.runs) - interpreter
+        results = []
+        for name, cmd in COMMANDS.items():
+            net = round(measure(cmd, env, args.runs) - interpreter, 1)
+            budget = BUDGETS_MS[name] * args.budget_scale
+            if name not in NO_BASELINE:
+                budget += baseline
+            budget = round(budget, 1)
+            # ok рахується з тих самих округлених чисел, що й друкуються
+            results.append({"command": name, "median_ms": net, "budget_ms": budget, "ok": net <= budget})
+    failed = [r["command"] for r in results if not r["ok"]]
+
+    if args.json:
+        print(json.dumps({"interpreter_ms": round(interpreter, 1), "baseline_ms": round(baseline, 1),
+                          "results": results, "failed": failed}, ensure_ascii=False))
+    else:
+        print(f"Старт інтерпретатора: {interpreter:.1f} мс (віднято з результатів)")
+        print(f"Базовий рівень ({BASELINE[-1]}): {baseline:.1f} мс (входить у бюджети команд з базою)")
+        for r in results:
+            mark = "✅" if r["ok"] else "❌"
+            print(f"{mark} {r['command']:<26} {r['median_ms']:>7.1f} мс  (бюджет {r['budget_ms']:.0f} мс)")
+        if failed:
+            print(f"Перевищено бюджет: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Бенчмарк основних операцій на синтетичних словниках (benchmarks/synthetic.py):
+імпорт, пошук (точний, підрядок, нечіткий, автодоповнення), експорт, звіти і видалення.
+Кожен прогін — нова тимчасова база; результат із параметрами і комітом пишеться у JSON,
+щоб порівнювати зміни між версіями.
+
+    python benchmarks/suite.py --words 100000
+    python benchmarks/suite.py --words 1000000 --dictionaries 4 --output bench-1m.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.synthetic import sample_words, write_synthetic_json  # noqa: E402
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def summarize(samples: list[float]) -> dict:
+    """ Секунди -> мілісекунди: середнє, медіана, p95, максимум."""
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))]
+    return {
+        "runs": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(p95, 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+def run_queries(session, fn, queries) -> dict:
+    """ Кожен запит — з порожнім кешем, щоб міряти базу, а не LRU."""
+    from slovnyk.cache import clear_caches
+
+    samples = []
+    for q in queries:
+        clear_caches()
+        _result, seconds = timed(fn, session, q)
+        samples.append(seconds)
+    return summarize(samples)
+
+
+def run_suite(args, workdir: Path) -> dict:
+    os.environ["SLOVNYK_DB_PATH"] = str(workdir / "bench.db")
+    from slovnyk import db, io_json, reports, services
+    from slovnyk.models import Slovnyk, Slovo
+
+    source = workdir / "synthetic.json"
+    data, gen_seconds = timed(write_synthetic_json, source, args.words, args.dictionaries,
+                              args.max_meanings, args.seed)
+    queries = sample_words(args.words, args.dictionaries, args.max_meanings, args.seed, args.queries)
+
+    db.init_db(db.get_engine())
+    session = db.new_session()
+    results = {}
+    try:
+        stats, seconds = timed(io_json.import_file, session, source)
+        results["import"] = {"seconds": round(seconds, 3), "words_per_sec": round(args.words / seconds),
+                             "stats": stats}
+
+        substrings = [q[1:4] for q in queries]
+        prefixes = [q[:3] for q in queries]
+        # друкарська помилка: дві сусідні літери переставлені
+        typos = [q[:1] + q[2:3] + q[1:2] + q[3:] if len(q) > 3 else q for q in queries]
+        results["search_exact"] = run_queries(session, lambda s, q: services.find_words(s, q, exact=True), queries)
+        results["search_substring"] = run_queries(session, services.find_words, substrings)
+        results["search_fuzzy"] = run_queries(session, services.find_similar_words, typos)
+        results["autocomplete"] = run_queries(session, services.autocomplete, prefixes)
+
+        path, seconds = timed(io_json.export_dictionaries_to_file, session, workdir / "export.json")
+        results["export"] = {"seconds": round(seconds, 3), "bytes": path.stat().st_size}
+
+        for name, fn in (("counts", reports.counts_by_dictionary),
+                         ("top", reports.top_words_by_meanings),
+                         ("recent", reports.recent_words)):
+            results[f"report_{name}"] = summarize([timed(fn, session)[1] for _ in range(args.repeat)])
+
+        word_ids = session.query(Slovo.id).order_by(Slovo.id).limit(args.repeat).all()
+        results["delete_word"] = summarize([timed(services.delete_word, session, wid)[1] for (wid,) in word_ids])
+
+        dictionary_id = session.query(Slovnyk.id).order_by(Slovnyk.id.desc()).limit(1).scalar()
+        _deleted, seconds = timed(services.delete_dictionary, session, dictionary_id)
+        results["delete_dictionary"] = {"seconds": round(seconds, 3),
+                                        "words": args.words // args.dictionaries}
+    finally:
+        session.close()
+
+    return {
+        "commit": git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"words": args.words, "dictionaries": args.dictionaries, "max_meanings": args.max_meanings,
+                   "seed": args.seed, "queries": len(queries), "repeat": args.repeat},
+        "data": {"meanings": data["meanings"], "bytes": data["bytes"], "generate_seconds": round(gen_seconds, 3)},
+        "results": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=10000, help="кількість слів (10 тис. – 10 млн)")
+    parser.add_argument("--dictionaries", type=int, default=2)
+    parser.add_argument("--max-meanings", type=int, default=5, help="тлумачень на слово: від 1 до N")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--queries", type=int, default=100, help="запитів на кожен вид пошуку")
+    parser.add_argument("--repeat", type=int, default=20, help="повторів звітів і видалень слів")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--workdir", help="каталог для бази і файлів (за замовчуванням тимчасовий)")
+    args = parser.parse_args(argv)
+    if args.words < args.dictionaries:
+        parser.error("--words має бути не менше --dictionaries")
+
+    if args.workdir:
+        workdir = Path(args.workdir)
+        workdir.mkdir(parents=True, exist_ok=True)
+        report = run_suite(args, workdir)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run_suite(args, Path(tmp))
+
+    Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    for name, r in report["results"].items():
+        value = f"{r['seconds']:.3f} с" if "seconds" in r else f"p50 {r['p50_ms']:.2f} мс, p95 {r['p95_ms']:.2f} мс"
+        print(f"{name:<18} {value}")
+    print(f"Результат: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Детерміновані синтетичні словники для бенчмарків: латинські і кириличні слова зі складів,
+різна кількість тлумачень на слово. Той самий seed — той самий файл.
+
+    python benchmarks/synthetic.py --words 100000 --output /tmp/synthetic.json
+
+Файл пишеться потоково, тож і 10 млн слів не тримаються в пам'яті.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+
+LATIN_SYLLABLES = [
+    "ab", "ac", "al", "an", "ar", "ba", "be", "bo", "ca", "co", "de", "di", "do", "el", "en", "er",
+    "fa", "fi", "ga", "go", "ha", "he", "in", "is", "ka", "la", "le", "li", "lo", "ma", "me", "mi",
+    "mo", "na", "ne", "no", "or", "pa", "pe", "po", "ra", "re", "ri", "ro", "sa", "se", "si", "so",
+    "ta", "te", "ti", "to", "un", "ur", "va", "ve", "vi", "wa", "xe", "ya", "ze", "zo",
+]
+CYRILLIC_SYLLABLES = [
+    "ба", "бе", "бі", "ва", "ве", "ві", "га", "ґу", "да", "де", "ді", "до", "же", "за", "зе", "зі",
+    "ка", "ке", "кі", "ко", "ла", "ле", "лі", "ло", "ма", "ме", "мі", "мо", "на", "не", "ні", "но",
+    "па", "пе", "пі", "по", "ра", "ре", "рі", "ро", "са", "се", "сі", "со", "та", "те", "ті", "то",
+    "ус", "фа", "ха", "ці", "ча", "ше", "щи", "юн", "як", "єр", "їж", "ль", "м'я", "ан", "ор",
+]
+# частки тлумачень (нормальний розподіл не потрібен — важить лише різноманітність)
+MEANINGS_WEIGHTS = [50, 25, 12, 8, 5]
+
+# (назва, тип, склади слова, склади тлумачень)
+KINDS = [
+    ("Синтетичний англійсько-український", "en-uk", LATIN_SYLLABLES, CYRILLIC_SYLLABLES),
+    ("Синтетичний українсько-англійський", "uk-en", CYRILLIC_SYLLABLES, LATIN_SYLLABLES),
+]
+
+
+def make_word(rng: random.Random, syllables, min_len: int = 2, max_len: int = 5) -> str:
+    return "".join(rng.choice(syllables) for _ in range(rng.randint(min_len, max_len)))
+
+
+def iter_words(rng: random.Random, count: int, word_syllables, meaning_syllables, max_meanings: int):
+    """ count унікальних слів (повтор отримує числовий суфікс) з 1..max_meanings тлумачень."""
+    seen = set()
+    weights = MEANINGS_WEIGHTS[:max_meanings] + [1] * max(0, max_meanings - len(MEANINGS_WEIGHTS))
+    for _ in range(count):
+        word = make_word(rng, word_syllables)
+        if rng.random() < 0.15:
+            word = word + " " + make_word(rng, word_syllables, 1, 3)  # фрази
+        if word in seen:
+            word = f"{word}{len(seen)}"
+        seen.add(word)
+        n = rng.choices(range(1, max_meanings + 1), weights=weights)[0]
+        meanings = list(dict.fromkeys(make_word(rng, meaning_syllables, 2, 6) for _ in range(n)))
+        yield word, meanings
+
+
+def dictionary_specs(words: int, dictionaries: int):
+    """ [(назва, тип, склади слова, склади тлумачень, кількість слів)] — слова порівну між словниками."""
+    specs = []
+    for i in range(dictionaries):
+        nazva, typ, word_syl, meaning_syl = KINDS[i % len(KINDS)]
+        count = words // dictionaries + (1 if i < words % dictionaries else 0)
+        specs.append((f"{nazva} {i + 1}", typ, word_syl, meaning_syl, count))
+    return specs
+
+
+def write_synthetic_json(path: Path, words: int, dictionaries: int = 2, max_meanings: int = 5,
+                         seed: int = 42) -> dict:
+    """ Пише файл імпорту (масив словників) і повертає його параметри."""
+    rng = random.Random(seed)
+    total_meanings = 0
+    with path.open("w", encoding="utf-8") as fh:
+        fh.write("[")
+        for i, (nazva, typ, word_syl, meaning_syl, count) in enumerate(dictionary_specs(words, dictionaries)):
+            fh.write(",\n" if i else "\n")
+            fh.write(f'{{"nazva": {json.dumps(nazva, ensure_ascii=False)}, "typ": "{typ}", "slova": [')
+            for j, (word, meanings) in enumerate(iter_words(rng, count, word_syl, meaning_syl, max_meanings)):
+                total_meanings += len(meanings)
+                item = {"slovo": word, "tlumachennia": meanings}
+                fh.write(("," if j else "") + "\n" + json.dumps(item, ensure_ascii=False))
+            fh.write("\n]}")
+        fh.write("\n]\n")
+    return {"path": str(path), "words": words, "dictionaries": dictionaries, "meanings": total_meanings,
+            "max_meanings": max_meanings, "seed": seed, "bytes": path.stat().st_size}
+
+
+def sample_words(words: int, dictionaries: int = 2, max_meanings: int = 5, seed: int = 42,
+                 count: int = 100) -> list[str]:
+    """ count слів з того самого потоку, що й у файлі (для запитів пошуку), рівномірно по всьому обсягу."""
+    rng = random.Random(seed)
+    step = max(1, words // count)
+    picked = []
+    n = 0
+    for _nazva, _typ, word_syl, meaning_syl, per_dict in dictionary_specs(words, dictionaries):
+        for word, _meanings in iter_words(rng, per_dict, word_syl, meaning_syl, max_meanings):
+            if n % step == 0 and len(picked) < count:
+                picked.append(word)
+            n += 1
+    return picked
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=10000)
+    parser.add_argument("--dictionaries", type=int, default=2)
+    parser.add_argument("--max-meanings", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="synthetic.json")
+    args = parser.parse_args(argv)
+    info = write_synthetic_json(Path(args.output), args.words, args.dictionaries, args.max_meanings, args.seed)
+    print(json.dumps(info, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
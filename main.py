@@ -9,37 +9,28 @@ BD: SQLite (SQLAlchemy)
 """
 from __future__ import annotations
 
-import json
-from pathlib import Path
-from datetime import datetime
-import re
+import sys
 
-from sqlalchemy import (
-    create_engine, String, Integer, DateTime, ForeignKey,
-    UniqueConstraint, select, func
-)
-from sqlalchemy.orm import (
-    DeclarativeBase, Mapped, mapped_column, relationship, sessionmaker
-)
-from sqlalchemy.exc import IntegrityError
-
-
-from slovnyk.db import SessionLocal, init_db, make_engine
-from slovnyk.ui import run_menu
-from slovnyk.menus import menu_slovnykyy, menu_slova, menu_reports, search
 
 def main():
-    engine = make_engine()
-    init_db(engine)
-    with SessionLocal() as session:
+    # меню тягне всі модулі застосунку — імпортуємо лише для інтерактивного режиму
+    from slovnyk.db import get_engine, init_db, new_session
+    from slovnyk.ui import run_menu
+    from slovnyk.menus import menu_slovnykyy, menu_slova, menu_reports, menu_search
+
+    init_db(get_engine())
+    with new_session() as session:
         items = [
             ("1", "📚 Словники (CRUD)", lambda: menu_slovnykyy(session)),
             ("2", "📝 Слова і тлумачення (CRUD)", lambda: menu_slova(session)),
-            ("3", "🔎 Пошук", lambda: search(session)),
+            ("3", "🔎 Пошук", lambda: menu_search(session)),
             ("4", "📊 Звіти / експорт / імпорт", lambda: menu_reports(session)),
             ("9", "🚪 Вихід", lambda: (_ for _ in ()).throw(SystemExit())),
         ]
         run_menu("📗 ГОЛОВНЕ МЕНЮ", items, show_back=False)
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from slovnyk.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
     main()
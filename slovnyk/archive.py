@@ -0,0 +1,129 @@
+"""
+Стиснені файли експорту/імпорту і маніфест експорту по словниках.
+
+Стиснення визначається за розширенням (.gz, .xz, .bz2), тому імпорт читає такі файли так само,
+як звичайний .json. Маніфест (manifest.json) лежить поруч з файлами словників:
+    {"format": "slovnyk-manifest", "version": 1, "created_at", "compression",
+     "files": [{"file", "dictionary_id", "nazva", "typ", "bytes", "words", "meanings", "sha256"}]}
+"""
+from __future__ import annotations
+
+import importlib
+import io
+import json
+from contextlib import contextmanager
+from pathlib import Path
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = "slovnyk-manifest"
+MANIFEST_VERSION = 1
+
+# назва стиснення -> розширення файлу
+COMPRESSIONS = {"none": "", "gzip": ".gz", "xz": ".xz", "bz2": ".bz2"}
+# розширення -> модуль стиснення (імпортується лише при потребі: модуль читають CLI і меню на старті)
+_MODULES = {".gz": "gzip", ".xz": "lzma", ".bz2": "bz2"}
+_READ_SIZE = 1 << 20
+
+
+def is_import_file(path: Path) -> bool:
+    """ *.json або стиснений *.json.gz / .json.xz / .json.bz2"""
+    name = path.name.lower()
+    return any(name.endswith(".json" + suffix) for suffix in COMPRESSIONS.values())
+
+
+def list_import_files(directory: Path) -> list[Path]:
+    return sorted(p for p in directory.iterdir() if p.is_file() and is_import_file(p))
+
+
+def open_text(path: Path):
+    """ Текстовий файл для читання; стиснений розпаковується на льоту."""
+    module = _MODULES.get(Path(path).suffix.lower())
+    if module is None:
+        return open(path, "r", encoding="utf-8")
+    return importlib.import_module(module).open(path, "rt", encoding="utf-8")
+
+
+def read_text(path: Path) -> str:
+    with open_text(path) as fh:
+        return fh.read()
+
+
+class _DigestWriter(io.RawIOBase):
+    """ Пише у файл і рахує sha256 та розмір записаних (уже стиснених) байтів."""
+
+    def __init__(self, fh):
+        import hashlib
+
+        self.fh = fh
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.fh.write(b)
+        self.sha256.update(b)
+        self.size += len(b)
+        return len(b)
+
+
+@contextmanager
+def open_text_writer(path: Path, compression: str = "none"):
+    """ (текстовий файл для запису, лічильник) — стиснення потокове, контрольна сума рахується під час запису."""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"невідоме стиснення: {compression} (можна: {', '.join(COMPRESSIONS)})")
+    with open(path, "wb") as raw:
+        digest = _DigestWriter(raw)
+        if compression == "gzip":
+            import gzip
+
+            binary = gzip.GzipFile(fileobj=digest, mode="wb", compresslevel=6, mtime=0)
+        elif compression == "xz":
+            import lzma
+
+            binary = lzma.LZMAFile(digest, "wb", preset=6)
+        elif compression == "bz2":
+            import bz2
+
+            binary = bz2.BZ2File(digest, "wb")
+        else:
+            binary = io.BufferedWriter(digest, _READ_SIZE)
+        fh = io.TextIOWrapper(binary, encoding="utf-8")
+        try:
+            yield fh, digest
+        finally:
+            fh.close()
+
+
+def file_sha256(path: Path) -> str:
+    import hashlib
+
+    sha = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while block := fh.read(_READ_SIZE):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def is_manifest(data) -> bool:
+    return isinstance(data, dict) and data.get("format") == MANIFEST_FORMAT
+
+
+def manifest_files(path: Path, data: dict | None = None) -> list[Path]:
+    """ Файли маніфесту по порядку; ValueError, якщо файлу немає або не збігається розмір чи sha256."""
+    if data is None:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not is_manifest(data):
+        raise ValueError(f"{path}: це не маніфест експорту.")
+    if data.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"{path}: непідтримувана версія маніфесту {data.get('version')}.")
+    files = []
+    for entry in data["files"]:
+        file = Path(path).parent / entry["file"]
+        if not file.is_file():
+            raise ValueError(f"файл з маніфесту не знайдено: {file}")
+        if file.stat().st_size != entry["bytes"] or file_sha256(file) != entry["sha256"]:
+            raise ValueError(f"{file.name}: розмір або контрольна сума не збігається з маніфестом.")
+        files.append(file)
+    return files
@@ -0,0 +1,110 @@
+"""
+Спільне для імпорту JSON (io_json) і застосування дельти (delta): нормалізація записів слів,
+пакетний запис слів і тлумачень (INSERT ... ON CONFLICT DO NOTHING) і форматування JSON.
+"""
+from __future__ import annotations
+
+import json
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .models import Slovnyk, Slovo, Tlumachennia
+
+
+def indent_json(obj, indent: int) -> str:
+    # split("\n"), не splitlines(): рядки JSON можуть містити \u2028 тощо
+    pad = " " * indent
+    return "\n".join(pad + line for line in json.dumps(obj, ensure_ascii=False, indent=2).split("\n"))
+
+
+def get_or_create_dictionary(session, nazva: str, typ: str) -> Slovnyk:
+    obj = session.execute(
+        select(Slovnyk).where(Slovnyk.nazva == nazva, Slovnyk.typ == typ)
+    ).scalar_one_or_none()
+    if obj:
+        return obj
+    obj = Slovnyk(nazva=nazva, typ=typ)
+    session.add(obj)
+    session.flush()
+    return obj
+
+
+# SQLite (старі збірки) не приймає більше 999 параметрів у одному запиті.
+IN_BATCH = 900
+
+
+def word_ids_of(session, dictionary_id: int, words: list[str]) -> dict[str, int]:
+    """ слово -> id для переданих слів словника (IN пачками)."""
+    out = {}
+    for i in range(0, len(words), IN_BATCH):
+        part = words[i:i + IN_BATCH]
+        out.update(session.execute(
+            select(Slovo.word, Slovo.id).where(Slovo.dictionary_id == dictionary_id, Slovo.word.in_(part))
+        ).all())
+    return out
+
+
+def flush_import_chunk(session, dictionary_id: int, chunk, word_ids: dict, meaning_keys: set, stats: dict):
+    """ Запис пачки (слово, [тлумачення]) у базу: INSERT ... ON CONFLICT DO NOTHING."""
+    new_words = []
+    for word_text, _ in chunk:
+        if word_text not in word_ids:
+            word_ids[word_text] = None
+            new_words.append(word_text)
+
+    if new_words:
+        session.execute(
+            sqlite_insert(Slovo).on_conflict_do_nothing(),
+            [{"dictionary_id": dictionary_id, "word": w} for w in new_words],
+        )
+        word_ids.update(word_ids_of(session, dictionary_id, new_words))
+        stats["words"] += len(new_words)
+
+    new_meanings = []
+    for word_text, meanings in chunk:
+        wid = word_ids[word_text]
+        for mtxt in meanings:
+            key = (wid, mtxt)
+            if key in meaning_keys:
+                stats["skipped"] += 1
+                continue
+            meaning_keys.add(key)
+            new_meanings.append({"word_id": wid, "text": mtxt})
+
+    if new_meanings:
+        session.execute(sqlite_insert(Tlumachennia).on_conflict_do_nothing(), new_meanings)
+        stats["meanings"] += len(new_meanings)
+
+
+def import_word(w) -> tuple[str, list[str]] | None:
+    """ Один запис слова з JSON -> (слово, [тлумачення]) або None, якщо слово порожнє."""
+    if not isinstance(w, dict):
+        return None
+
+    word_text = (w.get("slovo") or w.get("word") or "").strip()
+    if not word_text:
+        return None
+
+    meanings_list = w.get("tlumachennia")
+    if meanings_list is None:
+        meanings_list = w.get("meanings")
+    if meanings_list is None:
+        meanings_list = []
+
+    if not isinstance(meanings_list, list):
+        meanings_list = [meanings_list]
+
+    meanings = []
+    for meaning in meanings_list:
+        mtxt = str(meaning).strip()
+        if mtxt:
+            meanings.append(mtxt)
+    return word_text, meanings
+
+
+def normalized_items(words):
+    for w in words:
+        item = import_word(w)
+        if item is not None:
+            yield item
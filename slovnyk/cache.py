@@ -0,0 +1,152 @@
+"""
+Кеш читань у пам'яті процесу: тлумачення слова і результати пошуку.
+Кожна зміна слів/тлумачень у services.py та io_json.py скидає саме ті записи, яких вона стосується.
+Кеш живе в процесі: записи з CLI чи меню (окремий процес) не скидають кеш запущеного сервера —
+до закінчення CACHE_TTL він може віддавати старі результати.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+from .config import CACHE_TTL, SEARCH_CACHE_SIZE, WORD_CACHE_SIZE
+
+# позначка "немає в кеші" (None — теж коректне значення)
+MISS = object()
+
+
+class LRUCache:
+    """
+    Обмежений LRU-кеш з необов'язковим TTL (секунди).
+    Запис можна позначити тегами (id слів) і потім скинути всі записи з тегом — invalidate_tag().
+    Потокобезпечний (HTTP-сервер читає з кількох потоків).
+    Кожне скидання збільшує generation: читач запам'ятовує її до запиту в базу і передає в put(),
+    тож результат, прочитаний до скидання, у кеш уже не потрапить.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (value, expires_at, tags)
+        self._tags = {}  # tag -> {key}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISS
+        value, expires_at, _tags = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            self._drop(key)
+            self.misses += 1
+            return MISS
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value, tags=(), generation=None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return  # поки читали з бази, кеш скинули — значення могло застаріти
+            self._put(key, value, tags)
+
+    def _put(self, key, value, tags):
+        if self.maxsize <= 0:
+            return
+        if key in self._data:
+            self._drop(key)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        tags = frozenset(tags)
+        self._data[key] = (value, expires_at, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._data) > self.maxsize:
+            self._drop(next(iter(self._data)))
+            self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self.generation += 1
+            if key in self._data:
+                self._drop(key)
+
+    def invalidate_tag(self, tag):
+        with self._lock:
+            self.generation += 1
+            for key in self._tags.pop(tag, ()):
+                if key in self._data:
+                    self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+            self._tags.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _drop(self, key):
+        _value, _expires_at, tags = self._data.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+# word_id -> [(meaning_id, text)]
+word_cache = LRUCache(WORD_CACHE_SIZE, CACHE_TTL)
+# (вид пошуку, параметри) -> рядки результату; теги — id слів у результаті
+# (зворотний пошук — ще й MEANINGS_TAG)
+search_cache = LRUCache(SEARCH_CACHE_SIZE, CACHE_TTL)
+
+
+def invalidate_word(word_id: int):
+    """ Змінились тлумачення слова або слово видалено: його записи і результати пошуку з ним."""
+    word_cache.invalidate(word_id)
+    search_cache.invalidate_tag(word_id)
+
+
+# тег усіх результатів зворотного пошуку (за текстом тлумачень)
+MEANINGS_TAG = "meanings"
+
+
+def invalidate_meanings():
+    """ Додано тлумачення або змінено його текст: зворотний пошук міг знайти нові слова."""
+    search_cache.invalidate_tag(MEANINGS_TAG)
+
+
+def invalidate_search():
+    """ З'явилось нове слово, змінився текст слова або назва словника: будь-який запит міг змінитись."""
+    search_cache.clear()
+
+
+def clear_caches():
+    word_cache.clear()
+    search_cache.clear()
+
+
+def cache_stats() -> dict:
+    return {"слова": word_cache.stats(), "пошук": search_cache.stats()}
@@ -0,0 +1,237 @@
+"""
+Неінтерактивний режим для пакетних задач (cron, скрипти): python main.py <команда> ...
+Результат — JSON (або NDJSON для search, по рядку на запит) у stdout, помилки — JSON у stderr.
+Коди виходу: 0 — успіх, 1 — нічого не знайдено, 2 — невірні аргументи, 3 — помилка.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .archive import COMPRESSIONS
+from .config import (
+    DB_PATH, EXPORT_COMPRESSION, EXPORT_WORKERS, IMPORT_CHUNK_SIZE, SERVER_HOST, SERVER_PORT,
+    SERVER_READ_WORKERS, SERVER_REQUEST_TIMEOUT, SQLITE_PROFILE,
+)
+from .db import get_engine, init_db, new_session, pragma_profile
+from .reports import REPORTS
+from .sqlstats import action
+
+# Модулі команд (services, io_json, reports) імпортуються всередині обробників:
+# кожен запуск виконує одну команду і не платить за імпорт решти.
+
+EXIT_OK = 0
+EXIT_NOT_FOUND = 1
+EXIT_USAGE = 2
+EXIT_ERROR = 3
+
+
+def _dump(obj, out=None):
+    out = out or sys.stdout
+    out.write(json.dumps(obj, ensure_ascii=False, default=str) + "\n")
+
+
+def _error(message: str) -> int:
+    _dump({"error": message}, sys.stderr)
+    return EXIT_ERROR
+
+
+def _queries(args):
+    """ Запити з аргументів, а якщо їх немає (або "-") — по одному на рядок зі stdin."""
+    if args.queries and args.queries != ["-"]:
+        yield from args.queries
+        return
+    for line in sys.stdin:
+        q = line.strip()
+        if q:
+            yield q
+
+
+def cmd_search(session, args) -> int:
+    from .services import search_response
+
+    field = "meaning" if args.reverse else "word"
+    if args.reverse and args.mode == "fuzzy":
+        _dump({"error": "--reverse не підтримує --fuzzy."}, sys.stderr)
+        return EXIT_USAGE
+    found_any = False
+    for q in _queries(args):
+        response = search_response(session, q, args.mode, args.dictionary, args.limit, field)
+        found_any = found_any or bool(response["results"])
+        _dump(response)
+        sys.stdout.flush()
+    return EXIT_OK if found_any else EXIT_NOT_FOUND
+
+
+def cmd_import(session, args) -> int:
+    from .io_json import import_directory, import_file
+
+    path = Path(args.path)
+    if not path.exists():
+        return _error(f"файл не знайдено: {path}")
+    if path.is_dir():
+        try:
+            with pragma_profile(session):
+                summary = import_directory(session, path)
+        except ValueError as e:
+            return _error(str(e))
+        _dump({"files": summary})
+        return EXIT_ERROR if any(r["error"] for r in summary) else EXIT_OK
+    try:
+        stats = import_file(session, path, args.chunk_size)
+    except json.JSONDecodeError:
+        return _error("невірний формат JSON (файл не читається як JSON).")
+    except (OSError, ValueError) as e:
+        session.rollback()
+        return _error(str(e))
+    _dump({"path": str(path), **stats})
+    return EXIT_OK
+
+
+def cmd_export(session, args) -> int:
+    from .io_json import export_dictionaries_to_file
+
+    output = Path(args.output) if args.output else None
+    try:
+        if args.snapshot:
+            from .io_json import export_snapshot_to_file
+
+            _dump(export_snapshot_to_file(session, output, mph=not args.no_mph))
+            return EXIT_OK
+        if args.split:
+            from .io_json import export_split_to_dir
+
+            _dump(export_split_to_dir(session, output, args.compress, args.workers))
+            return EXIT_OK
+        if args.delta or args.since is not None:
+            from .delta import export_delta_to_file
+
+            _dump(export_delta_to_file(session, output, args.since))
+            return EXIT_OK
+        path = export_dictionaries_to_file(session, output)
+    except (OSError, ValueError) as e:
+        return _error(str(e))
+    _dump({"path": str(path)})
+    return EXIT_OK
+
+
+def cmd_report(session, args) -> int:
+    from .reports import report_rows
+
+    _dump(report_rows(session, args.name, args.limit))
+    return EXIT_OK
+
+
+def cmd_stats(session, _args) -> int:
+    from sqlalchemy import func, select, text
+
+    from .migrations import current_version
+    from .models import Slovnyk, Tlumachennia
+
+    _dump({
+        "db_path": str(DB_PATH),
+        "db_bytes": DB_PATH.stat().st_size if DB_PATH.exists() else 0,
+        "schema_version": current_version(session),
+        "sqlite_profile": SQLITE_PROFILE,
+        "sqlite_version": session.execute(text("SELECT sqlite_version()")).scalar_one(),
+        "dictionaries": session.execute(select(func.count(Slovnyk.id))).scalar_one(),
+        "words": session.execute(select(func.coalesce(func.sum(Slovnyk.words_count), 0))).scalar_one(),
+        "meanings": session.execute(select(func.count(Tlumachennia.id))).scalar_one(),
+    })
+    return EXIT_OK
+
+
+def cmd_translate(session, args) -> int:
+    from .translate import read_source, translate_text
+
+    try:
+        source = sys.stdin.read() if args.source in (None, "-") else read_source(args.source)
+    except (OSError, UnicodeDecodeError) as e:
+        return _error(str(e))
+    _dump(translate_text(session, source, args.dictionary))
+    return EXIT_OK
+
+
+def cmd_serve(_session, args) -> int:
+    from .server import is_loopback, run_server
+
+    if not is_loopback(args.host) and not args.allow_remote:
+        # сервіс без автентифікації і з POST /words: назовні — лише свідомо
+        _dump({"error": f"{args.host} — не локальна адреса; додайте --allow-remote, якщо це навмисно."}, sys.stderr)
+        return EXIT_USAGE
+    run_server(args.host, args.port, args.workers, args.timeout)
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py", description="SLOVNYK: пакетний режим без меню.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("search", help="пошук слів; запити — аргументи або рядки stdin (NDJSON на виході)")
+    p.add_argument("queries", nargs="*", help="запити; без них або '-' — читати зі stdin")
+    mode = p.add_mutually_exclusive_group()
+    mode.add_argument("--exact", dest="mode", action="store_const", const="exact", help="точний збіг слова")
+    mode.add_argument("--fuzzy", dest="mode", action="store_const", const="fuzzy", help="нечіткий пошук")
+    mode.add_argument("--prefix", dest="mode", action="store_const", const="prefix", help="слова за початком")
+    mode.add_argument("--stem", dest="mode", action="store_const", const="stem",
+                      help="слова з тією самою основою («книгою» -> «книга»)")
+    p.add_argument("--dictionary", type=int, help="ID словника")
+    p.add_argument("--limit", type=int, help="скільки слів повертати на запит")
+    p.add_argument("--reverse", action="store_true",
+                   help="зворотний пошук: слова, в тлумаченнях яких є запит (--exact, --prefix, --stem або підрядок)")
+    p.set_defaults(mode="substring", handler=cmd_search)
+
+    p = sub.add_parser("translate", help="тлумачення всіх слів тексту (файл, рядок або stdin)")
+    p.add_argument("source", nargs="?", help="файл або текст; без нього або '-' — stdin")
+    p.add_argument("--dictionary", type=int, help="ID словника")
+    p.set_defaults(handler=cmd_translate)
+
+    p = sub.add_parser("import", help="імпорт JSON-файлу або всієї папки")
+    p.add_argument("path")
+    p.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    p.set_defaults(handler=cmd_import)
+
+    p = sub.add_parser("export", help="експорт усіх словників у JSON (або лише змін: --delta)")
+    p.add_argument("--output", help="шлях до файлу (за замовчуванням export/slovnyky_export.json)")
+    p.add_argument("--delta", action="store_true", help="лише зміни після попереднього дельта-експорту")
+    p.add_argument("--since", type=int, help="дельта від цієї позначки журналу змін (замість останнього дельта-експорту)")
+    p.add_argument("--snapshot", action="store_true",
+                   help="бінарний знімок для пошуку без бази (python -m slovnyk.snapshot)")
+    p.add_argument("--no-mph", action="store_true", help="знімок без досконалого хешу (менший, точний пошук — бінарний)")
+    p.add_argument("--split", action="store_true",
+                   help="файл на кожен словник + manifest.json (--output — папка, за замовчуванням export/slovnyky)")
+    p.add_argument("--compress", choices=tuple(COMPRESSIONS), default=EXPORT_COMPRESSION, help="стиснення файлів --split")
+    p.add_argument("--workers", type=int, default=EXPORT_WORKERS, help="процесів для --split")
+    p.set_defaults(handler=cmd_export)
+
+    p = sub.add_parser("report", help="звіти у JSON")
+    p.add_argument("name", choices=REPORTS)
+    p.add_argument("--limit", type=int, default=10)
+    p.set_defaults(handler=cmd_report)
+
+    p = sub.add_parser("stats", help="розмір бази і кількість записів")
+    p.set_defaults(handler=cmd_stats)
+
+    p = sub.add_parser("serve", help="локальний HTTP/JSON-сервіс (пошук, слова, автодоповнення, звіти)")
+    p.add_argument("--host", default=SERVER_HOST, help="адреса прослуховування (лише локальна без --allow-remote)")
+    p.add_argument("--allow-remote", action="store_true", help="дозволити нелокальну --host, напр. 0.0.0.0")
+    p.add_argument("--port", type=int, default=SERVER_PORT)
+    p.add_argument("--workers", type=int, default=SERVER_READ_WORKERS, help="потоків читання")
+    p.add_argument("--timeout", type=float, default=SERVER_REQUEST_TIMEOUT, help="тайм-аут запиту, с")
+    p.set_defaults(handler=cmd_serve)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        init_db(get_engine())
+        with new_session() as session, action(f"cli {args.command}"):
+            return args.handler(session, args)
+    except KeyboardInterrupt:
+        return EXIT_ERROR
+    except Exception as e:
+        # заблокована чи пошкоджена база тощо: код 3 і JSON у stderr, а не traceback з кодом 1
+        return _error(f"{type(e).__name__}: {e}")
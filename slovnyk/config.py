@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 PROJECT_NAME = "SLOVNYK"
@@ -10,12 +11,108 @@ DATA_DIR = BASE_DIR / "data"
 INPUT_DIR = BASE_DIR / "input"
 EXPORT_DIR = BASE_DIR / "export"
 
-# для зберігання файлів бази даних, якщо вона ще не існує.
-DATA_DIR.mkdir(parents=True, exist_ok=True)
-# для імпорту JSON-файлів.
-INPUT_DIR.mkdir(parents=True, exist_ok=True)
-# для збереження результатів експорту у JSON.
-EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+# Папки створюються при першому використанні (db.make_engine, ui.ensure_export_dir), а не при імпорті.
 
-# Шлях до файлу БД.
-DB_PATH = DATA_DIR / "dictionary_obj.db"
+# Шлях до файлу БД; змінна оточення SLOVNYK_DB_PATH — інша база (тести, бенчмарки, окремі копії).
+DB_PATH = Path(os.environ.get("SLOVNYK_DB_PATH") or DATA_DIR / "dictionary_obj.db")
+
+# Імпорт JSON: скільки слів записувати в базу за один коміт.
+IMPORT_CHUNK_SIZE = 5000
+# Видалення словника: скільки слів видаляти одним DELETE (між порціями друкується прогрес).
+DELETE_CHUNK_SIZE = 5000
+# Файли, більші за цей розмір (байти), імпортуються потоково, без читання всього файлу в пам'ять.
+STREAM_IMPORT_MIN_BYTES = 50 * 1024 * 1024
+# Імпорт папки: кількість процесів для розбору файлів (None — за кількістю ядер процесора).
+IMPORT_WORKERS = None
+# Експорт по словниках: кількість процесів (None — за кількістю ядер) і стиснення файлів (gzip, xz, bz2, none).
+EXPORT_WORKERS = None
+EXPORT_COMPRESSION = "gzip"
+# Списки слів: скільки рядків на сторінці.
+PAGE_SIZE = 50
+# Автодоповнення: скільки слів показувати за замовчуванням.
+AUTOCOMPLETE_LIMIT = 10
+# Нечіткий пошук ("можливо, ви мали на увазі"): максимальна відстань редагування,
+# скільки кандидатів брати з trigram-індексу і скільки підказок показувати.
+FUZZY_MAX_DISTANCE = 2
+FUZZY_CANDIDATES = 200
+FUZZY_LIMIT = 5
+# Зворотний пошук (слова за текстом тлумачення): скільки знайдених тлумачень повертати щонайбільше.
+REVERSE_LIMIT = 50
+
+# Кеш читань (cache.py): скільки записів тримати і скільки секунд вони живуть (None — без TTL).
+WORD_CACHE_SIZE = 10000
+SEARCH_CACHE_SIZE = 1000
+CACHE_TTL = 600
+
+# HTTP-сервер (server.py): лише localhost; потоки читання, тайм-аут запиту (с).
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_READ_WORKERS = 4
+SERVER_REQUEST_TIMEOUT = 5.0
+# Найбільше тіло запиту (байти); більше — відповідь 413.
+SERVER_MAX_BODY_BYTES = 1024 * 1024
+# Параметр limit: 1..SERVER_MAX_LIMIT (інакше 400); пошук без limit повертає не більше стількох слів.
+SERVER_MAX_LIMIT = 1000
+
+# Статистика SQL-запитів (sqlstats.py), лише за SLOVNYK_SQL_STATS=1: кількість запитів, час і рядки
+# на кожну дію меню, підсумок при виході. Запити, довші за SLOW_QUERY_MS (мс), разом з
+# EXPLAIN QUERY PLAN дописуються у SLOW_QUERY_LOG.
+SQL_STATS = os.environ.get("SLOVNYK_SQL_STATS", "") not in ("", "0")
+SLOW_QUERY_MS = float(os.environ.get("SLOVNYK_SLOW_QUERY_MS") or 50)
+SLOW_QUERY_LOG = Path(os.environ.get("SLOVNYK_SLOW_QUERY_LOG") or DATA_DIR / "slow_queries.log")
+
+# ПРОФІЛІ ПРОДУКТИВНОСТІ SQLite (PRAGMA при кожному підключенні).
+# cache_size < 0 — розмір у КіБ; mmap_size — у байтах; busy_timeout — у мс.
+SQLITE_PROFILES = {
+    # максимальна надійність: кожен коміт одразу на диск
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+    # звичайна робота словника: багато читань, мало записів
+    "read-mostly": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+    # масовий імпорт/експорт: без fsync, великий кеш
+    "bulk-load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256000,
+        "mmap_size": 1024 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+}
+
+# Профіль за замовчуванням; змінна оточення SLOVNYK_SQLITE_PROFILE має пріоритет.
+SQLITE_PROFILE = os.environ.get("SLOVNYK_SQLITE_PROFILE", "read-mostly")
+# Профіль, на який імпорт і експорт перемикаються тимчасово.
+SQLITE_BULK_PROFILE = "bulk-load"
+
+
+def sqlite_pragmas(profile: str | None = None) -> dict:
+    """
+    PRAGMA для профілю. Окреме значення можна перевизначити змінною оточення
+    SLOVNYK_SQLITE_<ІМ'Я>, наприклад SLOVNYK_SQLITE_CACHE_SIZE=-128000.
+    """
+    name = profile or SQLITE_PROFILE
+    if name not in SQLITE_PROFILES:
+        raise ValueError(f"Невідомий профіль SQLite: {name} (є: {', '.join(SQLITE_PROFILES)})")
+    pragmas = dict(SQLITE_PROFILES[name])
+    for key in pragmas:
+        env_value = os.environ.get(f"SLOVNYK_SQLITE_{key.upper()}")
+        if env_value:
+            pragmas[key] = env_value
+    return pragmas
@@ -1,22 +1,167 @@
 from __future__ import annotations
 
-from sqlalchemy import create_engine
+import re
+import weakref
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 
-from .config import DB_PATH
+from .config import DB_PATH, SQLITE_BULK_PROFILE, sqlite_pragmas
+from .migrations import (
+    COUNTER_DRIFT_SQL, COUNTER_REBUILD_SQL, backfill, current_version, latest_version, run_migrations,
+)
 from .models import Base
+from . import sqlstats
+
+# PRAGMA, які можна перемикати на відкритому з'єднанні посеред роботи
+# (journal_mode і foreign_keys всередині транзакції не змінюються).
+RUNTIME_PRAGMAS = ("synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout")
+
+_PRAGMA_VALUE = re.compile(r"^-?[A-Za-z0-9_]+$")
+
+# engine -> PRAGMA його базового профілю
+_ENGINE_PRAGMAS = weakref.WeakKeyDictionary()
+
+
+def apply_pragmas(dbapi_conn, pragmas: dict):
+    cur = dbapi_conn.cursor()
+    try:
+        for name, value in pragmas.items():
+            value = str(value)
+            if not _PRAGMA_VALUE.match(value):
+                raise ValueError(f"Невірне значення PRAGMA {name}: {value!r}")
+            cur.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cur.close()
+
 
 # ПІДКЛЮЧЕННЯ ДО БАЗИ ДАНИХ
-def make_engine():
+def make_engine(profile: str | None = None, readonly: bool = False, pool_size: int | None = None):
+    """
+    Engine SQLite; PRAGMA профілю (config.SQLITE_PROFILES) ставляться при кожному підключенні.
+    readonly=True — з'єднання лише для читання (mode=ro), без зміни journal_mode.
+    """
     db_file = DB_PATH.resolve()
-    return create_engine(f"sqlite:///{db_file.as_posix()}", echo=False, future=True)
+    db_file.parent.mkdir(parents=True, exist_ok=True)
+    pool_args = {"pool_size": pool_size, "max_overflow": 0} if pool_size else {}
+    pragmas = sqlite_pragmas(profile)
+    if readonly:
+        url = f"sqlite:///file:{db_file.as_posix()}?mode=ro&uri=true"
+        pragmas.pop("journal_mode", None)
+    else:
+        url = f"sqlite:///{db_file.as_posix()}"
+    engine = create_engine(url, echo=False, future=True, connect_args=sqlstats.connect_args(), **pool_args)
+    sqlstats.install(engine)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        apply_pragmas(dbapi_conn, pragmas)
+
+    _ENGINE_PRAGMAS[engine] = pragmas
+    return engine
+
+
+@contextmanager
+def pragma_profile(session, profile: str = SQLITE_BULK_PROFILE):
+    """
+    Тимчасово перемикає з'єднання сесії на інший профіль (за замовчуванням bulk-load).
+    З'єднання, взяті з пулу всередині блоку, теж отримують цей профіль,
+    а при поверненні в пул — знову базовий.
+    """
+    engine = session.get_bind()
+    temp = {k: v for k, v in sqlite_pragmas(profile).items() if k in RUNTIME_PRAGMAS}
+    base_all = _ENGINE_PRAGMAS.get(engine) or sqlite_pragmas()
+    base = {k: v for k, v in base_all.items() if k in RUNTIME_PRAGMAS}
+
+    def on_checkout(dbapi_conn, _record, _proxy):
+        apply_pragmas(dbapi_conn, temp)
+
+    def on_checkin(dbapi_conn, _record):
+        if dbapi_conn is not None:
+            apply_pragmas(dbapi_conn, base)
+
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+    apply_pragmas(session.connection().connection.driver_connection, temp)
+    try:
+        yield
+    finally:
+        event.remove(engine, "checkout", on_checkout)
+        event.remove(engine, "checkin", on_checkin)
+        apply_pragmas(session.connection().connection.driver_connection, base)
+
+
+# ПОВНОТЕКСТОВИЙ ІНДЕКС (FTS5): таблиці words_fts / meanings_fts створює міграція 1 (migrations.py).
+# Мінімальна довжина запиту для trigram-індексу (коротші шукаємо через LIKE).
+FTS_MIN_QUERY_LEN = 3
+
+
+def has_fts(conn) -> bool:
+    """ чи є в базі таблиця words_fts"""
+    row = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'words_fts'")
+    ).first()
+    return row is not None
+
+
+def rebuild_search_index(conn):
+    """ Повна перебудова FTS5-індексів з таблиць words і meanings."""
+    conn.execute(text("INSERT INTO words_fts(words_fts) VALUES ('rebuild')"))
+    conn.execute(text("INSERT INTO meanings_fts(meanings_fts) VALUES ('rebuild')"))
+    conn.execute(text("INSERT INTO meaning_stems_fts(meaning_stems_fts) VALUES ('rebuild')"))
+
+
+def rebuild_stems(conn):
+    """ Перерахунок основ word_stem / text_stem поточними стемерами (після заміни стемера)."""
+    from .stemming import stem_key
+
+    backfill(conn, "words", "word", "word_stem", stem_key)
+    backfill(conn, "meanings", "text", "text_stem", stem_key)
+
+
+def counter_drift(conn) -> dict:
+    """ Таблиця -> кількість рядків, де лічильник (words_count / meanings_count) розійшовся з даними."""
+    return {table: conn.execute(text(sql)).scalar_one() for table, sql in COUNTER_DRIFT_SQL.items()}
+
+
+def rebuild_counters(conn):
+    """ Повний перерахунок words_count / meanings_count з таблиць."""
+    for sql in COUNTER_REBUILD_SQL:
+        conn.execute(text(sql))
+
+
+def fts_phrase(q: str) -> str:
+    """ Рядок користувача -> одна фраза FTS5 (лапки екрануються подвоєнням)."""
+    return '"' + q.replace('"', '""') + '"'
 
 
 def init_db(engine):
+    """ Схема і міграції; база вже останньої версії — лише одне читання user_version."""
+    with engine.connect() as conn:
+        up_to_date = current_version(conn) >= latest_version()
+    if up_to_date:
+        return
     Base.metadata.create_all(engine)
+    run_migrations(engine)
+
+
+# Сесії застосунку; bind з'являється при першому get_engine().
+SessionLocal = sessionmaker(autoflush=False, expire_on_commit=False, future=True)
+
+_engine = None
 
 
-SessionLocal = sessionmaker(bind=make_engine(), autoflush=False, expire_on_commit=False, future=True)
+def get_engine():
+    """ Єдиний engine застосунку: створюється при першому виклику, а не при імпорті модуля."""
+    global _engine
+    if _engine is None:
+        _engine = make_engine()
+        SessionLocal.configure(bind=_engine)
+    return _engine
 
 
-SessionLocal = sessionmaker(bind=make_engine(), autoflush=False, expire_on_commit=False, future=True)
+def new_session():
+    """ Сесія на спільному engine (створює його, якщо ще не створено)."""
+    get_engine()
+    return SessionLocal()
@@ -0,0 +1,345 @@
+"""
+Дельта-експорт: лише словники, слова і тлумачення, змінені після останнього дельта-експорту
+(журнал change_log, який ведуть тригери міграції 5), і застосування такої дельти в іншій базі.
+
+Файл дельти:
+    {"format": "slovnyk-delta", "version": 1, "since": N, "until": M,
+     "deleted_dictionaries": [{"nazva", "typ"}],
+     "deleted_words": [{"nazva", "typ", "slovo"}],
+     "renamed_dictionaries": [{"from": {"nazva", "typ"}, "to": {"nazva", "typ"}}],
+     "dictionaries": [{"nazva", "typ", "slova": [{"slovo", "tlumachennia": [...]}]}]}
+
+Слова в "dictionaries" несуть повний поточний список тлумачень: при застосуванні він замінює наявний.
+Ключі видалень і перейменувань — такі, якими вони були на момент since; застосовуються
+в порядку: видалення словників, видалення слів, перейменування, слова.
+"""
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+from sqlalchemy import delete, select, text, update
+
+from .cache import clear_caches
+from .config import EXPORT_DIR, IMPORT_CHUNK_SIZE
+from .db import pragma_profile
+from .bulk import IN_BATCH, flush_import_chunk, get_or_create_dictionary, indent_json, normalized_items, word_ids_of
+from .models import Slovnyk, Slovo, Tlumachennia
+from .ui import ensure_export_dir
+
+DELTA_FORMAT = "slovnyk-delta"
+DELTA_VERSION = 1
+
+
+# ПОЗНАЧКИ СИНХРОНІЗАЦІЇ (таблиця sync_state)
+def get_mark(session, name: str) -> int | None:
+    return session.execute(text("SELECT seq FROM sync_state WHERE name = :n"), {"n": name}).scalar()
+
+
+def set_mark(session, name: str, seq: int):
+    session.execute(
+        text("INSERT INTO sync_state (name, seq) VALUES (:n, :s) ON CONFLICT(name) DO UPDATE SET seq = excluded.seq"),
+        {"n": name, "s": seq},
+    )
+
+
+def last_change_seq(session) -> int:
+    """ seq останнього запису журналу (AUTOINCREMENT: не зменшується і після очищення)."""
+    return session.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'")).scalar() or 0
+
+
+def mark_exported(session, until: int):
+    """ Дельту до until записано: нова позначка і очищення журналу до неї (лише дельта-експорт)."""
+    session.execute(text("DELETE FROM change_log WHERE seq <= :s"), {"s": until})
+    set_mark(session, "export", until)
+    set_mark(session, "pruned", max(until, get_mark(session, "pruned") or 0))
+    session.commit()
+
+
+def is_delta(data) -> bool:
+    return isinstance(data, dict) and data.get("format") == DELTA_FORMAT
+
+
+# ЕКСПОРТ
+def _first_changes(session, entity: str, since: int, until: int) -> dict:
+    """ id -> перший запис зміни/видалення (seq, parent_id, old_name, old_typ) у діапазоні."""
+    first = {}
+    rows = session.execute(text(
+        "SELECT seq, entity_id, parent_id, old_name, old_typ FROM change_log "
+        "WHERE entity = :e AND op != 'I' AND seq > :since AND seq <= :until ORDER BY seq"
+    ), {"e": entity, "since": since, "until": until})
+    for seq, eid, parent_id, old_name, old_typ in rows:
+        first.setdefault(eid, (seq, parent_id, old_name, old_typ))
+    return first
+
+
+def _dictionary_changes(session, since: int, until: int):
+    # і словники, створені після since: копія могла бути знята з повного експорту посеред діапазону,
+    # а там, де їх немає, видалення і перейменування нічого не змінять
+    old = _first_changes(session, "dictionary", since, until)
+    current = dict(
+        (did, (nazva, typ))
+        for did, nazva, typ in session.execute(select(Slovnyk.id, Slovnyk.nazva, Slovnyk.typ)
+                                               .where(Slovnyk.id.in_(list(old))))
+    ) if old else {}
+    old_keys = {did: (ch[2], ch[3]) for did, ch in old.items()}
+    deleted = [did for did in old_keys if did not in current]
+    renamed = [did for did in old_keys if did in current and current[did] != old_keys[did]]
+    new_ids = session.execute(text(
+        "SELECT DISTINCT entity_id FROM change_log WHERE entity = 'dictionary' AND op = 'I' "
+        "AND seq > :since AND seq <= :until"
+    ), {"since": since, "until": until}).scalars().all()
+    return old_keys, current, deleted, renamed, set(new_ids) - set(old_keys)
+
+
+def _deleted_words(session, since: int, until: int, old_dict_keys: dict, deleted_dicts: set):
+    """ Слова, що зникли після since (видалені, перейменовані, перенесені), зі своїм першим ключем у діапазоні."""
+    old = _first_changes(session, "word", since, until)
+    if not old:
+        return []
+    now = {}
+    ids = list(old)
+    for i in range(0, len(ids), IN_BATCH):
+        now.update((wid, (did, w)) for wid, did, w in session.execute(
+            select(Slovo.id, Slovo.dictionary_id, Slovo.word).where(Slovo.id.in_(ids[i:i + IN_BATCH]))
+        ))
+    need = {ch[1] for ch in old.values()} - set(old_dict_keys)
+    dict_keys = dict(old_dict_keys)
+    if need:
+        dict_keys.update((did, (n, t)) for did, n, t in session.execute(
+            select(Slovnyk.id, Slovnyk.nazva, Slovnyk.typ).where(Slovnyk.id.in_(list(need)))
+        ))
+    out = []
+    for wid, (_seq, did, old_word, _typ) in old.items():
+        if did in deleted_dicts or did not in dict_keys or now.get(wid) == (did, old_word):
+            continue
+        nazva, typ = dict_keys[did]
+        out.append({"nazva": nazva, "typ": typ, "slovo": old_word})
+    return out
+
+
+def _iter_changed_dictionaries(session, since: int, until: int, new_dicts: set):
+    """ {"nazva", "typ", "slova"} для словників зі зміненими словами (і нових порожніх); слова — генератор."""
+    session.execute(text("CREATE TEMP TABLE IF NOT EXISTS delta_words (id INTEGER PRIMARY KEY)"))
+    session.execute(text("DELETE FROM delta_words"))
+    session.execute(text(
+        "INSERT OR IGNORE INTO delta_words (id) "
+        "SELECT CASE entity WHEN 'word' THEN entity_id ELSE parent_id END FROM change_log "
+        "WHERE entity IN ('word', 'meaning') AND seq > :since AND seq <= :until"
+    ), {"since": since, "until": until})
+    rows = session.execute(text("""
+        SELECT d.id, d.nazva, d.typ, w.id, w.word, m.text
+        FROM delta_words t
+        JOIN words w ON w.id = t.id
+        JOIN dictionaries d ON d.id = w.dictionary_id
+        LEFT JOIN meanings m ON m.word_id = w.id
+        ORDER BY d.id, w.id, m.id
+    """))
+
+    def words_of(first_row):
+        did = first_row[0]
+        current = None
+        row = first_row
+        while row is not None and row[0] == did:
+            _did, _nazva, _typ, wid, word, mtext = row
+            if current is None or current[0] != wid:
+                if current is not None:
+                    yield {"slovo": current[1], "tlumachennia": current[2]}
+                current = (wid, word, [])
+            if mtext is not None:
+                current[2].append(mtext)
+            row = next(rows, None)
+        if current is not None:
+            yield {"slovo": current[1], "tlumachennia": current[2]}
+        state["next"] = row
+
+    state = {"next": next(rows, None)}
+    seen = set()
+    while state["next"] is not None:
+        row = state["next"]
+        seen.add(row[0])
+        yield {"nazva": row[1], "typ": row[2], "slova": words_of(row)}
+    session.execute(text("DELETE FROM delta_words"))
+
+    empty = sorted(new_dicts - seen)
+    if empty:
+        for did, nazva, typ in session.execute(
+            select(Slovnyk.id, Slovnyk.nazva, Slovnyk.typ).where(Slovnyk.id.in_(empty)).order_by(Slovnyk.id)
+        ):
+            yield {"nazva": nazva, "typ": typ, "slova": iter(())}
+
+
+def _write_list(fh, key: str, items, last: bool = False):
+    fh.write(f'  "{key}": [')
+    for i, item in enumerate(items):
+        fh.write(",\n" if i else "\n")
+        fh.write(indent_json(item, 4))
+    fh.write(("\n  ]" if items else "]") + ("\n" if last else ",\n"))
+
+
+def write_delta_json(session, fh, since: int, until: int) -> dict:
+    """ Потоковий запис дельти (since, until] у відкритий файл. Повертає кількості записів."""
+    old_keys, current, deleted, renamed, new_dicts = _dictionary_changes(session, since, until)
+    deleted_words = _deleted_words(session, since, until, old_keys, set(deleted))
+
+    counts = {"deleted_dictionaries": len(deleted), "deleted_words": len(deleted_words),
+              "renamed_dictionaries": len(renamed), "dictionaries": 0, "words": 0}
+    fh.write("{\n")
+    for key, value in (("format", DELTA_FORMAT), ("version", DELTA_VERSION), ("since", since), ("until", until)):
+        fh.write(f'  "{key}": {json.dumps(value)},\n')
+    _write_list(fh, "deleted_dictionaries", [{"nazva": old_keys[d][0], "typ": old_keys[d][1]} for d in deleted])
+    _write_list(fh, "deleted_words", deleted_words)
+    _write_list(fh, "renamed_dictionaries", [
+        {"from": {"nazva": old_keys[d][0], "typ": old_keys[d][1]},
+         "to": {"nazva": current[d][0], "typ": current[d][1]}}
+        for d in renamed
+    ])
+
+    fh.write('  "dictionaries": [')
+    for i, dct in enumerate(_iter_changed_dictionaries(session, since, until, new_dicts)):
+        fh.write(",\n" if i else "\n")
+        head = json.dumps({"nazva": dct["nazva"], "typ": dct["typ"]}, ensure_ascii=False)[:-1]
+        fh.write(f'    {head}, "slova": [')
+        n = 0
+        for w in dct["slova"]:
+            fh.write(",\n" if n else "\n")
+            fh.write(indent_json(w, 6))
+            n += 1
+        fh.write("\n    ]}" if n else "]}")
+        counts["dictionaries"] += 1
+        counts["words"] += n
+    fh.write("\n  ]\n}\n" if counts["dictionaries"] else "]\n}\n")
+    return counts
+
+
+def export_delta_to_file(session, path: Path | None = None, since: int | None = None) -> dict:
+    """
+    Зміни після since (за замовчуванням — після останнього дельта-експорту) у JSON-файл.
+    Після запису позначка експорту пересувається, а журнал до неї очищується.
+    ValueError — якщо журнал уже очищено далі за since (потрібен повний експорт).
+    """
+    ensure_export_dir()
+    session.rollback()
+    if since is None:
+        since = get_mark(session, "export") or 0
+    pruned = get_mark(session, "pruned") or 0
+    if since < pruned:
+        raise ValueError(f"журнал змін очищено до {pruned}; дельта від {since} неповна — зробіть повний експорт.")
+    until = last_change_seq(session)
+
+    path = path or EXPORT_DIR / f"slovnyky_delta_{since}_{until}.json"
+    tmp_path = path.with_name(path.name + ".tmp")
+    with pragma_profile(session), tmp_path.open("w", encoding="utf-8") as fh:
+        counts = write_delta_json(session, fh, since, until)
+        # тимчасова таблиця відкрила транзакцію запису; PRAGMA профілю міняються лише поза нею
+        session.commit()
+    tmp_path.replace(path)
+    mark_exported(session, until)
+    return {"path": str(path), "since": since, "until": until, **counts}
+
+
+# ЗАСТОСУВАННЯ
+def _dictionary_id(session, nazva: str, typ: str) -> int | None:
+    return session.execute(select(Slovnyk.id).where(Slovnyk.nazva == nazva, Slovnyk.typ == typ)).scalar()
+
+
+def _replace_words(session, dictionary_id: int, items: list, stats: dict, chunk_size: int):
+    """ Слова дельти: нові слова і тлумачення додаються, тлумачення, яких немає у списку, видаляються."""
+    for i in range(0, len(items), chunk_size):
+        chunk = items[i:i + chunk_size]
+        word_ids = word_ids_of(session, dictionary_id, [w for w, _ in chunk])
+        ids = [wid for wid in word_ids.values()]
+        meaning_keys = set()
+        for j in range(0, len(ids), IN_BATCH):
+            meaning_keys.update(session.execute(
+                select(Tlumachennia.word_id, Tlumachennia.text).where(Tlumachennia.word_id.in_(ids[j:j + IN_BATCH]))
+            ).all())
+        flush_import_chunk(session, dictionary_id, chunk, word_ids, meaning_keys, stats)
+        result = session.execute(
+            text("DELETE FROM meanings WHERE word_id = :wid AND text NOT IN (SELECT value FROM json_each(:texts))"),
+            [{"wid": word_ids[w], "texts": json.dumps(m, ensure_ascii=False)} for w, m in chunk],
+        )
+        stats["deleted_meanings"] += max(result.rowcount, 0)
+        session.commit()
+
+
+def apply_delta(session, data: dict, chunk_size: int = IMPORT_CHUNK_SIZE) -> dict:
+    """
+    Застосовує розібраний файл дельти. Дельти однієї бази мають іти по черзі:
+    ValueError, якщо дельту вже застосовано або пропущено попередню.
+    """
+    if data.get("version") != DELTA_VERSION:
+        raise ValueError(f"непідтримувана версія дельти: {data.get('version')!r}")
+    since, until = int(data["since"]), int(data["until"])
+    applied = get_mark(session, "delta_applied")
+    if applied is not None and until <= applied:
+        raise ValueError(f"цю дельту вже застосовано (база містить зміни до {applied}).")
+    if applied is not None and since > applied:
+        raise ValueError(f"пропущено дельту: база містить зміни до {applied}, а дельта починається з {since}.")
+
+    stats = {"rows": 0, "words": 0, "meanings": 0, "skipped": 0, "deleted_dictionaries": 0,
+             "deleted_words": 0, "renamed_dictionaries": 0, "deleted_meanings": 0, "seconds": 0.0}
+    started = time.perf_counter()
+    session.rollback()
+    try:
+        with pragma_profile(session):
+            for d in data.get("deleted_dictionaries", []):
+                result = session.execute(delete(Slovnyk).where(Slovnyk.nazva == d["nazva"], Slovnyk.typ == d["typ"]))
+                stats["deleted_dictionaries"] += result.rowcount
+
+            for w in data.get("deleted_words", []):
+                did = _dictionary_id(session, w["nazva"], w["typ"])
+                if did is not None:
+                    result = session.execute(delete(Slovo).where(Slovo.dictionary_id == did, Slovo.word == w["slovo"]))
+                    stats["deleted_words"] += result.rowcount
+
+            for r in data.get("renamed_dictionaries", []):
+                result = session.execute(
+                    update(Slovnyk)
+                    .where(Slovnyk.nazva == r["from"]["nazva"], Slovnyk.typ == r["from"]["typ"])
+                    .values(nazva=r["to"]["nazva"], typ=r["to"]["typ"])
+                )
+                stats["renamed_dictionaries"] += result.rowcount
+            session.commit()
+
+            for dct in data.get("dictionaries", []):
+                did = get_or_create_dictionary(session, dct["nazva"], dct["typ"]).id
+                items = list(normalized_items(dct.get("slova") or []))
+                stats["rows"] += len(items)
+                _replace_words(session, did, items, stats, chunk_size)
+
+            set_mark(session, "delta_applied", until)
+            session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        clear_caches()
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+# МЕНЮ
+def export_delta_json(session):
+    """ Експорт змін після попереднього дельта-експорту (пункт меню)."""
+    try:
+        info = export_delta_to_file(session)
+    except ValueError as e:
+        print(f"Помилка: {e}")
+        return
+    print(
+        f"Готово: дельта {info['since']}..{info['until']} -> {info['path']}\n"
+        f"Словників зі змінами: {info['dictionaries']}, слів: {info['words']}, "
+        f"видалено словників: {info['deleted_dictionaries']}, слів: {info['deleted_words']}, "
+        f"перейменовано словників: {info['renamed_dictionaries']}."
+    )
+
+
+def print_delta_stats(stats: dict):
+    print(
+        f"Дельту застосовано за {stats['seconds']:.2f} с: слів {stats['rows']} "
+        f"(нових {stats['words']}), нових тлумачень {stats['meanings']}, видалено тлумачень "
+        f"{stats['deleted_meanings']}, слів {stats['deleted_words']}, словників {stats['deleted_dictionaries']}, "
+        f"перейменовано словників {stats['renamed_dictionaries']}."
+    )
@@ -4,15 +4,32 @@ import json
 from datetime import datetime
 from pathlib import Path
 import re
-
-from sqlalchemy import select, func
-
-from .config import EXPORT_DIR, INPUT_DIR
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .archive import (
+    COMPRESSIONS, MANIFEST_FORMAT, MANIFEST_NAME, MANIFEST_VERSION,
+    is_import_file, is_manifest, list_import_files, manifest_files, open_text_writer, read_text,
+)
+from .bulk import flush_import_chunk, get_or_create_dictionary, indent_json, normalized_items
+from .cache import clear_caches, invalidate_search
+from .config import (
+    EXPORT_COMPRESSION, EXPORT_DIR, EXPORT_WORKERS, IMPORT_CHUNK_SIZE, IMPORT_WORKERS, INPUT_DIR,
+    SQLITE_BULK_PROFILE, STREAM_IMPORT_MIN_BYTES,
+)
+from .db import make_engine, pragma_profile
+from .json_stream import iter_json_file
 from .models import Slovnyk, Slovo, Tlumachennia
+from .snapshot import write_snapshot
 from .ui import ensure_export_dir, input_int, input_non_empty, input_text
 from .reports import report_counts_by_dictionary
-from .ui import run_menu, pick_id, format_dict_type
-from .services import dictionaries_list, dictionary_create, dictionary_edit, dictionary_delete
+from .ui import run_menu, pick_id, pick_id_paged, format_dict_type
+from .services import (
+    dictionaries_list, dictionary_create, dictionary_edit, dictionary_delete, delete_dictionary, print_delete_progress,
+    has_words, word_page,
+)
 
 def export_report_counts_json(session):
     ensure_export_dir()
@@ -23,40 +40,218 @@ def export_report_counts_json(session):
     print(f"\nГотово: експорт у JSON -> {path}")
 
 
-def export_dictionary_json(session):
-    """ словники JSON файл"""
-    ensure_export_dir()
-
-    dictionaries = session.execute(select(Slovnyk).order_by(Slovnyk.id)).scalars().all()
-    out = []
-
-    for d in dictionaries:
-        d_obj = {
+# Скільки рядків (слово+тлумачення) тягнути з курсора за раз під час експорту.
+EXPORT_YIELD_PER = 2000
+
+
+def iter_dictionary_words(session, dictionary_id: int):
+    """
+    Слова словника з тлумаченнями одним запитом (слова — за ключем word_key, тобто за алфавітом
+    без урахування регістру й виду апострофа, тлумачення — за id). Порядок дає індекс
+    ix_words_dictionary_id_word_key, без сортування всього словника у тимчасовому B-дереві.
+    Віддає {"id", "slovo", "tlumachennia"} по одному.
+    """
+    stmt = (
+        select(Slovo.id, Slovo.word, Tlumachennia.text)
+        .outerjoin(Tlumachennia, Tlumachennia.word_id == Slovo.id)
+        .where(Slovo.dictionary_id == dictionary_id)
+        .order_by(Slovo.word_key, Slovo.id, Tlumachennia.id)
+        .execution_options(yield_per=EXPORT_YIELD_PER)
+    )
+    current = None
+    for wid, word, mtext in session.execute(stmt):
+        if current is None or current["id"] != wid:
+            if current is not None:
+                yield current
+            current = {"id": wid, "slovo": word, "tlumachennia": []}
+        if mtext is not None:
+            current["tlumachennia"].append(mtext)
+    if current is not None:
+        yield current
+
+
+def write_dictionaries_json(session, fh, dictionaries):
+    """
+    Потоковий запис словників у JSON (той самий вигляд, що й json.dumps(..., indent=2)).
+    Повертає кількість записаних слів і тлумачень.
+    """
+    counts = {"words": 0, "meanings": 0}
+    fh.write("[")
+    for i, d in enumerate(dictionaries):
+        fh.write(",\n" if i else "\n")
+        head = {
             "id": d.id,
             "nazva": d.nazva,
             "typ": d.typ,
             "created_at": d.created_at.isoformat(sep=" ", timespec="seconds"),
-            "slova": [],
         }
+        fh.write("  {\n")
+        for key, value in head.items():
+            fh.write(f'    {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n')
+        fh.write('    "slova": [')
+        n = 0
+        for w in iter_dictionary_words(session, d.id):
+            fh.write(",\n" if n else "\n")
+            fh.write(indent_json(w, 6))
+            n += 1
+            counts["meanings"] += len(w["tlumachennia"])
+        counts["words"] += n
+        fh.write("\n    ]\n  }" if n else "]\n  }")
+    fh.write("\n]" if dictionaries else "]")
+    return counts
+
+
+def export_dictionaries_to_file(session, path: Path | None = None) -> Path:
+    """ Усі словники у JSON-файл (через тимчасовий файл, щоб не лишати напівзаписаний)."""
+    ensure_export_dir()
 
-        words_sorted = sorted(d.words, key=lambda x: (x.word or "").lower())
-        for w in words_sorted:
-            meanings_sorted = sorted(w.meanings, key=lambda x: x.id)
-            d_obj["slova"].append(
-                {
-                    "id": w.id,
-                    "slovo": w.word,
-                    "tlumachennia": [t.text for t in meanings_sorted],
-                }
-            )
-
-        out.append(d_obj)
-
-    path = EXPORT_DIR / "slovnyky_export.json"
-    path.write_text(json.dumps(out, ensure_ascii=False, indent=2), encoding="utf-8")
+    dictionaries = session.execute(select(Slovnyk).order_by(Slovnyk.id)).scalars().all()
+
+    path = path or EXPORT_DIR / "slovnyky_export.json"
+    tmp_path = path.with_name(path.name + ".tmp")
+    with pragma_profile(session), tmp_path.open("w", encoding="utf-8") as fh:
+        write_dictionaries_json(session, fh, dictionaries)
+    tmp_path.replace(path)
+    return path
+
+
+def export_dictionary_json(session):
+    """ словники JSON файл (потоково: один запит на словник, файл пишеться частинами)"""
+    path = export_dictionaries_to_file(session)
     print(f"Готово: експорт словників -> {path}")
 
 
+def _export_dictionary_part(dictionary_id: int, path_str: str, compression: str) -> dict:
+    """
+    Робота процесу експорту: один словник в один (стиснений) файл через власне з'єднання
+    лише для читання. Повертає запис маніфесту.
+    """
+    engine = make_engine(SQLITE_BULK_PROFILE, readonly=True)
+    path = Path(path_str)
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with Session(engine) as session:
+            d = session.get(Slovnyk, dictionary_id)
+            with open_text_writer(tmp_path, compression) as (fh, digest):
+                counts = write_dictionaries_json(session, fh, [d])
+    finally:
+        engine.dispose()
+    tmp_path.replace(path)
+    return {
+        "file": path.name,
+        "dictionary_id": d.id,
+        "nazva": d.nazva,
+        "typ": d.typ,
+        "bytes": digest.size,
+        **counts,
+        "sha256": digest.sha256.hexdigest(),
+    }
+
+
+def export_split_to_dir(session, directory: Path | None = None, compression: str = EXPORT_COMPRESSION,
+                        workers: int | None = EXPORT_WORKERS) -> dict:
+    """
+    Кожен словник в окремий файл (паралельно в пулі процесів, стиснення потокове) і manifest.json
+    з розмірами, кількістю слів/тлумачень і sha256 файлів. Маніфест пишеться останнім.
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"невідоме стиснення: {compression} (можна: {', '.join(COMPRESSIONS)})")
+    started = time.perf_counter()
+    directory = directory or EXPORT_DIR / "slovnyky"
+    directory.mkdir(parents=True, exist_ok=True)
+
+    dictionaries = session.execute(select(Slovnyk.id, Slovnyk.nazva).order_by(Slovnyk.id)).all()
+    session.rollback()
+    suffix = ".json" + COMPRESSIONS[compression]
+    tasks = [(did, str(directory / f"{did:04d}_{_safe_slug(nazva)}{suffix}"), compression) for did, nazva in dictionaries]
+
+    if len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            files = list(pool.map(_export_dictionary_part, *zip(*tasks)))
+    else:
+        files = [_export_dictionary_part(*task) for task in tasks]
+
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "version": MANIFEST_VERSION,
+        "created_at": datetime.now().isoformat(sep=" ", timespec="seconds"),
+        "compression": compression,
+        "files": files,
+    }
+    manifest_path = directory / MANIFEST_NAME
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path.replace(manifest_path)
+    return {
+        "path": str(directory),
+        "manifest": str(manifest_path),
+        "files": len(files),
+        "bytes": sum(f["bytes"] for f in files),
+        "words": sum(f["words"] for f in files),
+        "meanings": sum(f["meanings"] for f in files),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def export_split_json(session):
+    """ Експорт по словниках у стиснені файли з маніфестом (пункт меню)."""
+    info = export_split_to_dir(session)
+    print(
+        f"Готово: {info['files']} файлів у {info['path']} ({info['bytes']} байт, слів {info['words']}, "
+        f"{info['seconds']:.2f} с), маніфест -> {info['manifest']}"
+    )
+
+
+def iter_snapshot_groups(session):
+    """ (ключ, [(word_id, dictionary_id, слово, [тлумачення])]) за зростанням ключа (побайтово, як BINARY у SQLite)."""
+    stmt = (
+        select(Slovo.word_key, Slovo.id, Slovo.dictionary_id, Slovo.word, Tlumachennia.text)
+        .outerjoin(Tlumachennia, Tlumachennia.word_id == Slovo.id)
+        .order_by(Slovo.word_key, Slovo.id, Tlumachennia.id)
+        .execution_options(yield_per=EXPORT_YIELD_PER)
+    )
+    key = None
+    words = []
+    for wkey, wid, did, word, mtext in session.execute(stmt):
+        if wkey != key:
+            if words:
+                yield key, words
+            key, words = wkey, []
+        if not words or words[-1][0] != wid:
+            words.append((wid, did, word, []))
+        if mtext is not None:
+            words[-1][3].append(mtext)
+    if words:
+        yield key, words
+
+
+def export_snapshot_to_file(session, path: Path | None = None, mph: bool = True) -> dict:
+    """ Бінарний знімок усіх словників для snapshot.Snapshot (через тимчасовий файл)."""
+    ensure_export_dir()
+    started = time.perf_counter()
+    dictionaries = {did: (nazva, typ) for did, nazva, typ in session.execute(
+        select(Slovnyk.id, Slovnyk.nazva, Slovnyk.typ)
+    )}
+    path = path or EXPORT_DIR / "slovnyky.snap"
+    tmp_path = path.with_name(path.name + ".tmp")
+    created_at = datetime.now().isoformat(sep=" ", timespec="seconds")
+    with pragma_profile(session), tmp_path.open("wb") as fh:
+        info = write_snapshot(fh, iter_snapshot_groups(session), dictionaries, created_at, mph)
+    tmp_path.replace(path)
+    return {"path": str(path), **info, "seconds": time.perf_counter() - started}
+
+
+def export_snapshot(session):
+    """ Знімок для швидкого пошуку лише для читання (пункт меню)."""
+    info = export_snapshot_to_file(session)
+    print(
+        f"Готово: знімок -> {info['path']} ({info['bytes']} байт, ключів {info['keys']}, "
+        f"слів {info['words']}, {info['seconds']:.2f} с)."
+    )
+
+
 
 def export_word_to_file(session):
     ensure_export_dir()
@@ -80,38 +275,68 @@ def export_word_to_file(session):
 
 
 # Імпорт з JSON у базу даних.
-def _get_or_create_dictionary(session, nazva: str, typ: str) -> Slovnyk:
-    obj = session.execute(
-        select(Slovnyk).where(Slovnyk.nazva == nazva, Slovnyk.typ == typ)
-    ).scalar_one_or_none()
-    if obj:
-        return obj
-    obj = Slovnyk(nazva=nazva, typ=typ)
-    session.add(obj)
-    session.flush()
-    return obj
+def _new_import_stats() -> dict:
+    return {"rows": 0, "words": 0, "meanings": 0, "skipped": 0, "seconds": 0.0}
+
+
+def import_dictionary_items(session, nazva, typ, items, stats: dict, chunk_size: int = IMPORT_CHUNK_SIZE):
+    """
+    Імпорт одного словника з уже нормалізованих пар (слово, [тлумачення]).
+    Наявні ключі словника (слова і пари слово+тлумачення) читаються в пам'ять один раз,
+    нові рядки пишуться пачками, коміт — кожні chunk_size слів.
+    """
+    dictionary_obj = get_or_create_dictionary(session, nazva, typ)
+    did = dictionary_obj.id
+
+    word_ids = dict(session.execute(
+        select(Slovo.word, Slovo.id).where(Slovo.dictionary_id == did)
+    ).all())
+    meaning_keys = set(session.execute(
+        select(Tlumachennia.word_id, Tlumachennia.text)
+        .join(Slovo, Slovo.id == Tlumachennia.word_id)
+        .where(Slovo.dictionary_id == did)
+    ).all())
+
+    chunk = []
+    try:
+        for item in items:
+            chunk.append(item)
+            stats["rows"] += 1
+            if len(chunk) >= chunk_size:
+                flush_import_chunk(session, did, chunk, word_ids, meaning_keys, stats)
+                session.commit()
+                chunk = []
+
+        if chunk:
+            flush_import_chunk(session, did, chunk, word_ids, meaning_keys, stats)
+        session.commit()
+    finally:
+        # пачки, закомічені до можливої помилки, теж уже в базі
+        clear_caches()
 
 
-def _get_or_create_word(session, dictionary_id: int, word_text: str) -> Slovo:
-    obj = session.execute(
-        select(Slovo).where(Slovo.dictionary_id == dictionary_id, Slovo.word == word_text)
-    ).scalar_one_or_none()
-    if obj:
-        return obj
-    obj = Slovo(dictionary_id=dictionary_id, word=word_text)
-    session.add(obj)
-    session.flush()
-    return obj
+def bulk_import(session, dictionaries_data, chunk_size: int = IMPORT_CHUNK_SIZE) -> dict:
+    """ Масовий імпорт нормалізованих словників [{nazva, typ, slova}]."""
+    stats = _new_import_stats()
+    started = time.perf_counter()
 
+    for dct in dictionaries_data:
+        import_dictionary_items(
+            session, dct["nazva"], dct["typ"], normalized_items(dct["slova"]), stats, chunk_size
+        )
+
+    stats["seconds"] = time.perf_counter() - started
+    return stats
 
-def _add_meaning_if_not_exists(session, word_id: int, tekst: str) -> bool:
-    exists = session.execute(
-        select(Tlumachennia.id).where(Tlumachennia.word_id == word_id, Tlumachennia.text == tekst)
-    ).first()
-    if exists:
-        return False
-    session.add(Tlumachennia(word_id=word_id, text=tekst))
-    return True
+
+def print_import_stats(stats: dict):
+    seconds = stats["seconds"]
+    rate = stats["rows"] / seconds if seconds > 0 else 0.0
+    print(
+        f"Оброблено слів: {stats['rows']} за {seconds:.2f} с ({rate:.0f} рядків/с). "
+        f"Нових слів: {stats['words']}, нових тлумачень: {stats['meanings']}, "
+        f"пропущено дублікатів: {stats['skipped']}."
+    )
 
 
 def _safe_slug(text: str, max_len: int = 40) -> str:
@@ -158,19 +383,15 @@ def export_one_word_to_json(session):
         return
 
     # 2) вибір слова
-    words = session.execute(
-        select(Slovo).where(Slovo.dictionary_id == dictionary_obj.id).order_by(Slovo.id)
-    ).scalars().all()
-
-    if not words:
+    if not has_words(session, dictionary_obj.id):
         print("У цьому словнику немає слів.")
         return
 
-    print("\nОберіть слово:")
-    for w in words:
-        print(f"  ID {w.id}: {w.word} (тлумачень: {len(w.meanings)})")
-
-    wid = input_int("Введіть ID слова (Enter — назад): ", allow_blank=True)
+    wid = pick_id_paged(
+        lambda after, prefix, limit: word_page(session, dictionary_obj.id, after, prefix, limit),
+        "Оберіть слово:",
+        lambda w: f"  ID {w.id}: {w.word} (тлумачень: {w.meanings_count})",
+    )
     if wid is None:
         return
 
@@ -199,6 +420,146 @@ def export_one_word_to_json(session):
     print(f"Готово: експорт слова у JSON -> {path}")
 
 
+def parse_import_data(data) -> list[dict]:
+    """ Розібраний JSON -> [{nazva, typ, slova}]; ValueError з описом, якщо формат невірний."""
+    dictionaries_data = None
+
+    if isinstance(data, dict) and isinstance(data.get("dictionaries"), list):
+        dictionaries_data = data["dictionaries"]
+    elif isinstance(data, dict) and isinstance(data.get("словники"), list):
+        dictionaries_data = data["словники"]
+    elif isinstance(data, list):
+        dictionaries_data = data
+    elif isinstance(data, dict) and "nazva" in data and "typ" in data:
+        dictionaries_data = [data]
+
+    if dictionaries_data is None:
+        if isinstance(data, dict) and data.get("format") == "slovnyk-delta":
+            raise ValueError("це файл змін (дельта) — імпортуйте його окремим файлом.")
+        raise ValueError("JSON має містити 1 словник або список словників.")
+
+    normalized = []
+    for dct in dictionaries_data:
+        if not isinstance(dct, dict) or "nazva" not in dct or "typ" not in dct:
+            raise ValueError("кожен словник у JSON має містити поля 'nazva' та 'typ'.")
+
+        words_list = dct.get("slova")
+        if words_list is None:
+            words_list = dct.get("слова")
+        if words_list is None:
+            words_list = []
+
+        if not isinstance(words_list, list):
+            raise ValueError("поле 'slova' (або 'слова') має бути списком.")
+
+        normalized.append({"nazva": dct["nazva"], "typ": dct["typ"], "slova": words_list})
+    return normalized
+
+
+def _parse_import_file(path_str: str) -> dict:
+    """ Робота процесу-парсера: читання, розбір і перевірка одного файлу (без доступу до БД)."""
+    started = time.perf_counter()
+    result = {"path": path_str, "dictionaries": None, "error": None}
+    try:
+        data = json.loads(read_text(Path(path_str)))
+        result["dictionaries"] = [
+            {"nazva": d["nazva"], "typ": d["typ"], "items": list(normalized_items(d["slova"]))}
+            for d in parse_import_data(data)
+        ]
+    except json.JSONDecodeError:
+        result["error"] = "невірний формат JSON (файл не читається як JSON)."
+    except (OSError, ValueError) as e:
+        result["error"] = str(e)
+    result["parse_seconds"] = time.perf_counter() - started
+    return result
+
+
+def _write_import_file(session, result: dict, dictionaries) -> dict:
+    """ Запис розібраного файлу в базу; статистика і помилка — у result."""
+    stats = _new_import_stats()
+    started = time.perf_counter()
+    try:
+        for d in dictionaries:
+            import_dictionary_items(session, d["nazva"], d["typ"], d["items"], stats)
+    except Exception as e:
+        session.rollback()
+        result["error"] = str(e)
+    stats["seconds"] = time.perf_counter() - started
+    result.update(stats)
+    result.pop("dictionaries", None)
+    return result
+
+
+def import_directory(session, directory: Path, workers: int | None = IMPORT_WORKERS) -> list[dict]:
+    """
+    Імпорт усіх *.json (і стиснених *.json.gz/.xz/.bz2) з папки; якщо в ній є manifest.json —
+    лише файлів маніфесту, після перевірки розмірів і контрольних сум (ValueError, якщо не збігаються).
+    Файли розбираються і перевіряються паралельно в пулі процесів,
+    а в базу пише лише поточний процес (одне з'єднання) — по мірі готовності файлів.
+    Великі файли (STREAM_IMPORT_MIN_BYTES) імпортуються потоково після решти.
+    Повертає підсумок по кожному файлу.
+    """
+    manifest = directory / MANIFEST_NAME
+    files = manifest_files(manifest) if manifest.exists() else list_import_files(directory)
+    big = [f for f in files if f.stat().st_size >= STREAM_IMPORT_MIN_BYTES]
+    small = [f for f in files if f not in big]
+    summary = []
+
+    try:
+        session.rollback()
+    except Exception:
+        pass
+
+    if len(small) > 1:
+        # пул процесів потрібен лише тут — імпорт concurrent.futures.process помітно сповільнює старт
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_parse_import_file, str(f)) for f in small]
+            for fut in as_completed(futures):
+                result = fut.result()
+                if result["error"] is None:
+                    _write_import_file(session, result, result["dictionaries"])
+                summary.append(result)
+    else:
+        for f in small:
+            result = _parse_import_file(str(f))
+            if result["error"] is None:
+                _write_import_file(session, result, result["dictionaries"])
+            summary.append(result)
+
+    for f in big:
+        result = {"path": str(f), "error": None, "parse_seconds": 0.0}
+        records = (
+            {"nazva": d["nazva"], "typ": d["typ"], "items": normalized_items(d["slova"])}
+            for d in iter_json_file(f)
+        )
+        summary.append(_write_import_file(session, result, records))
+
+    summary.sort(key=lambda r: r["path"])
+    return summary
+
+
+def print_import_summary(summary: list[dict]):
+    print("\nПідсумок імпорту папки:")
+    total = _new_import_stats()
+    for r in summary:
+        name = Path(r["path"]).name
+        if r["error"] is not None and "rows" not in r:
+            print(f"- {name}: ❌ {r['error']} (розбір {r['parse_seconds']:.2f} с)")
+            continue
+        for key in total:
+            total[key] += r[key]
+        status = f" ❌ {r['error']}" if r["error"] else ""
+        print(
+            f"- {name}:{status} слів {r['rows']}, нових слів {r['words']}, "
+            f"нових тлумачень {r['meanings']}, пропущено {r['skipped']} "
+            f"(розбір {r['parse_seconds']:.2f} с, запис {r['seconds']:.2f} с)"
+        )
+    print("Разом:")
+    print_import_stats(total)
+
+
 def import_from_json(session):
     """    Імпорт словника з JSON у бд."""
     print("\n📥 ІМПОРТ З JSON У БАЗУ ДАНИХ")
@@ -219,25 +580,43 @@ def import_from_json(session):
         path = Path(path_str)
 
     if path.exists() and path.is_dir():
-        json_files = sorted(path.glob("*.json"))
+        json_files = list_import_files(path)
         if not json_files:
             print("Помилка: у вказаній папці немає жодного JSON-файлу.")
             return
-        path = json_files[0]
-        print(f"Знайдено файл: {path}")
+        print(f"Знайдено файлів: {len(json_files)}. Імпорт усієї папки...")
+        try:
+            with pragma_profile(session):
+                summary = import_directory(session, path)
+        except ValueError as e:
+            print(f"Помилка: {e}")
+            return
+        print_import_summary(summary)
+        return
 
     # Перевірка чи є файл
     if not path.exists():
         print("Помилка: файл не знайдено. Перевірте шлях.")
         return
 
-    if path.suffix.lower() != ".json":
-        print("Помилка: файл має бути у форматі .json")
+    if not is_import_file(path):
+        print("Помилка: файл має бути у форматі .json (можна стиснений .json.gz, .json.xz, .json.bz2)")
+        return
+
+    # Великий файл — потоковий режим: словники і слова читаються по одному.
+    try:
+        streaming = path.stat().st_size >= STREAM_IMPORT_MIN_BYTES
+    except OSError as e:
+        print(f"Помилка читання файлу: {e}")
+        return
+    if streaming:
+        print("Великий файл: потоковий імпорт (дані пишуться в базу пачками під час читання).")
+        _save_import(session, iter_json_file(path))
         return
 
     # Читання файлу
     try:
-        raw = path.read_text(encoding="utf-8")
+        raw = read_text(path)
     except PermissionError:
         print("Помилка: немає доступу до файлу. Перевірте права або виберіть інший файл.")
         return
@@ -250,76 +629,86 @@ def import_from_json(session):
     except json.JSONDecodeError:
         print("Помилка: невірний формат JSON (файл не читається як JSON).")
         return
-    dictionaries_data = None
-
-    if isinstance(data, dict) and isinstance(data.get("dictionaries"), list):
-        dictionaries_data = data["dictionaries"]
-    elif isinstance(data, dict) and isinstance(data.get("словники"), list):
-        dictionaries_data = data["словники"]
-    elif isinstance(data, list):
-        dictionaries_data = data
-    elif isinstance(data, dict) and "nazva" in data and "typ" in data:
-        dictionaries_data = [data]
-
-    if dictionaries_data is None:
-        print("Помилка: JSON має містити 1 словник або список словників.")
+    if is_manifest(data):
+        try:
+            stats = import_manifest(session, path, data=data)
+        except (OSError, ValueError) as e:
+            session.rollback()
+            print(f"Помилка: {e}")
+            return
+        print("Готово: імпорт за маніфестом завершено ✅")
+        print_import_stats(stats)
         return
 
+    from .delta import apply_delta, is_delta, print_delta_stats
 
-    normalized = []
-    for dct in dictionaries_data:
-        if not isinstance(dct, dict) or "nazva" not in dct or "typ" not in dct:
-            print("Помилка: кожен словник у JSON має містити поля 'nazva' та 'typ'.")
+    if is_delta(data):
+        try:
+            stats = apply_delta(session, data)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Помилка застосування дельти: {e}")
             return
+        print_delta_stats(stats)
+        return
 
-        words_list = dct.get("slova")
-        if words_list is None:
-            words_list = dct.get("слова")
-        if words_list is None:
-            words_list = []
-
-        if not isinstance(words_list, list):
-            print("Помилка: поле 'slova' (або 'слова') має бути списком.")
-            return
+    try:
+        normalized = parse_import_data(data)
+    except ValueError as e:
+        print(f"Помилка: {e}")
+        return
 
-        normalized.append({"nazva": dct["nazva"], "typ": dct["typ"], "slova": words_list})
+    _save_import(session, normalized)
+
+
+def import_file(session, path: Path, chunk_size: int = IMPORT_CHUNK_SIZE) -> dict:
+    """
+    Імпорт одного JSON-файлу без діалогу (великі — потоково). Повертає статистику.
+    Стиснені файли (.json.gz/.xz/.bz2) розпаковуються на льоту; файл дельти (delta.py)
+    застосовується як дельта, маніфест експорту — імпортом усіх його файлів.
+    Помилки читання/формату — OSError, json.JSONDecodeError, ValueError.
+    """
+    session.rollback()
+    if path.stat().st_size >= STREAM_IMPORT_MIN_BYTES:
+        with pragma_profile(session):
+            return bulk_import(session, iter_json_file(path), chunk_size)
+    data = json.loads(read_text(path))
+    if is_manifest(data):
+        return import_manifest(session, path, chunk_size, data)
+    if isinstance(data, dict) and data.get("format") == "slovnyk-delta":
+        from .delta import apply_delta
 
-    # сохранение в БД
+        try:
+            return apply_delta(session, data, chunk_size)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"невірний файл дельти: {e}") from e
+    with pragma_profile(session):
+        return bulk_import(session, parse_import_data(data), chunk_size)
+
+
+def import_manifest(session, path: Path, chunk_size: int = IMPORT_CHUNK_SIZE, data: dict | None = None) -> dict:
+    """ Імпорт усіх файлів маніфесту по черзі (спершу перевіряються розміри і sha256). Сумарна статистика."""
+    files = manifest_files(path, data)
+    stats = _new_import_stats()
+    for f in files:
+        part = import_file(session, f, chunk_size)
+        for key in stats:
+            stats[key] += part[key]
+    stats["files"] = len(files)
+    return stats
+
+
+def _save_import(session, dictionaries_data):
+    """ сохранение в БД"""
     try:
         try:
             session.rollback()
         except Exception:
             pass
 
-        for dct in normalized:
-            dictionary_obj = _get_or_create_dictionary(session, dct["nazva"], dct["typ"])
-
-            for w in dct["slova"]:
-                if not isinstance(w, dict):
-                    continue
-
-                word_text = (w.get("slovo") or w.get("word") or "").strip()
-                if not word_text:
-                    continue
-
-                word = _get_or_create_word(session, dictionary_obj.id, word_text)
-
-                meanings_list = w.get("tlumachennia")
-                if meanings_list is None:
-                    meanings_list = w.get("meanings")
-                if meanings_list is None:
-                    meanings_list = []
-
-                if not isinstance(meanings_list, list):
-                    meanings_list = [meanings_list]
-
-                for meaning in meanings_list:
-                    mtxt = str(meaning).strip()
-                    if mtxt:
-                        _add_meaning_if_not_exists(session, word.id, mtxt)
-
-        session.commit()
+        with pragma_profile(session):
+            stats = bulk_import(session, dictionaries_data)
         print("Готово: імпорт завершено ✅")
+        print_import_stats(stats)
     except Exception as e:
         session.rollback()
         print(f"Помилка під час імпорту: {e}")
@@ -411,6 +800,7 @@ def slovnyk_edit(session):
     d.nazva = new_nazva
     d.typ = new_typ
     session.commit()
+    invalidate_search()
     print("✅ Оновив словник.")
 
 
@@ -431,8 +821,7 @@ def slovnyk_delete(session):
         print("Скасовано.")
         return
 
-    session.delete(d)
-    session.commit()
+    delete_dictionary(session, sid, progress=print_delete_progress)
     print("✅ Видалив словник.")
 
 
@@ -0,0 +1,217 @@
+"""
+Потоковий (інкрементальний) розбір JSON для імпорту великих файлів.
+Файл читається шматками, слова словника віддаються по одному —
+пам'ять не залежить від розміру файлу.
+"""
+from __future__ import annotations
+
+import json
+import re
+import tempfile
+
+from .archive import open_text
+
+# розмір шматка читання файлу (символи)
+STREAM_READ_SIZE = 1 << 16
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+_NUMBER_END = re.compile(r"[,\]}\s]")
+
+WORDS_KEYS = ("slova", "слова")
+WRAPPER_KEYS = ("dictionaries", "словники")
+
+
+class JsonStream:
+    """ Читач JSON зі скінченним буфером: значення, елементи масиву і ключі об'єкта по одному."""
+
+    def __init__(self, fh, read_size: int = STREAM_READ_SIZE):
+        self.fh = fh
+        self.read_size = read_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        more = self.fh.read(self.read_size)
+        if not more:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + more
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """ наступний значущий символ ('' — кінець файлу)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def take(self, ch: str):
+        if self.peek() != ch:
+            raise ValueError(f"невірний формат JSON (очікується «{ch}»)")
+        self.pos += 1
+
+    def value(self):
+        """ одне повне значення (рядок, число, об'єкт ...) з поточної позиції"""
+        ch = self.peek()
+        if ch == "-" or ch.isdigit():
+            # число могло обірватися на межі буфера — дочитуємо до роздільника
+            while not _NUMBER_END.search(self.buf, self.pos) and self._fill():
+                pass
+        while True:
+            try:
+                val, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise ValueError("невірний формат JSON (файл не читається як JSON)") from None
+            self.pos = end
+            return val
+
+    def _separator(self, close: str) -> bool:
+        ch = self.peek()
+        self.pos += 1
+        if ch == close:
+            return False
+        if ch != ",":
+            raise ValueError("невірний формат JSON (очікується «,»)")
+        return True
+
+    def array(self):
+        """ Проходить масив: на кожному кроці викликач сам читає один елемент."""
+        self.take("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if not self._separator("]"):
+                return
+
+    def keys(self):
+        """ Проходить об'єкт: віддає ключ, викликач сам читає значення."""
+        self.take("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("невірний формат JSON (ключ об'єкта має бути рядком)")
+            self.take(":")
+            yield key
+            if not self._separator("}"):
+                return
+
+    def skip(self):
+        """ пропустити значення, не тримаючи великі масиви/об'єкти в пам'яті"""
+        ch = self.peek()
+        if ch == "[":
+            for _ in self.array():
+                self.skip()
+        elif ch == "{":
+            for _ in self.keys():
+                self.skip()
+        else:
+            self.value()
+
+
+def _iter_words(st: JsonStream):
+    for _ in st.array():
+        yield st.value()
+
+
+def _spool_words(st: JsonStream):
+    """ Слова, що йдуть раніше за nazva/typ: тимчасовий файл на диску замість пам'яті."""
+    spool = tempfile.TemporaryFile("w+", encoding="utf-8")
+    for w in _iter_words(st):
+        spool.write(json.dumps(w, ensure_ascii=False))
+        spool.write("\n")
+    spool.seek(0)
+    return spool
+
+
+def _read_spool(spool):
+    with spool:
+        for line in spool:
+            yield json.loads(line)
+
+
+def _words_value(st: JsonStream):
+    """ значення поля slova: масив -> ітератор; null -> порожньо"""
+    ch = st.peek()
+    if ch == "[":
+        return True
+    if st.value() is None:
+        return False
+    raise ValueError("поле 'slova' (або 'слова') має бути списком.")
+
+
+def _dictionary_records(st: JsonStream, top_level: bool = False):
+    """
+    Один об'єкт словника -> запис {nazva, typ, slova: ітератор слів}.
+    На верхньому рівні об'єкт може бути обгорткою {"dictionaries": [...]}.
+    """
+    head = {}
+    spool = None
+    done = False
+
+    for key in st.keys():
+        if top_level and key in WRAPPER_KEYS and st.peek() == "[":
+            yield from iter_dictionaries(st, array=True)
+            done = True
+        elif key in ("nazva", "typ"):
+            head[key] = st.value()
+        elif key in WORDS_KEYS and not done and spool is None:
+            if not _words_value(st):
+                continue
+            if "nazva" in head and "typ" in head:
+                words = _iter_words(st)
+                yield {"nazva": head["nazva"], "typ": head["typ"], "slova": words}
+                # викликач міг не дочитати слова — решту пропускаємо
+                for _ in words:
+                    pass
+                done = True
+            else:
+                spool = _spool_words(st)
+        else:
+            st.skip()
+
+    if done:
+        return
+    if "nazva" not in head or "typ" not in head:
+        if spool is not None:
+            spool.close()
+        raise ValueError("кожен словник у JSON має містити поля 'nazva' та 'typ'.")
+    words = _read_spool(spool) if spool is not None else iter(())
+    yield {"nazva": head["nazva"], "typ": head["typ"], "slova": words}
+
+
+def iter_dictionaries(st: JsonStream, array: bool | None = None):
+    """
+    Словники з потоку по одному. Формати ті самі, що й у звичайному імпорті:
+    масив словників, {"dictionaries"/"словники": [...]} або один словник.
+    """
+    ch = st.peek()
+    if array or ch == "[":
+        for _ in st.array():
+            if st.peek() != "{":
+                raise ValueError("кожен словник у JSON має містити поля 'nazva' та 'typ'.")
+            yield from _dictionary_records(st)
+    elif ch == "{":
+        yield from _dictionary_records(st, top_level=True)
+    else:
+        raise ValueError("JSON має містити 1 словник або список словників.")
+
+
+def iter_json_file(path, read_size: int = STREAM_READ_SIZE):
+    """ Потоковий розбір файлу імпорту (можна стиснений): генератор записів {nazva, typ, slova}."""
+    with open_text(path) as fh:
+        yield from iter_dictionaries(JsonStream(fh, read_size))
@@ -5,14 +5,17 @@ from .services import (
     dictionaries_list, dictionary_create, dictionary_edit, dictionary_delete,
     slova_list, word_add, word_details, meaning_add_to_word,
     word_edit, meaning_edit, word_delete, meaning_delete,
-    search
+    search, search_autocomplete, search_by_meaning, search_index_rebuild, counters_check
 )
 from .reports import (
-    report_counts_by_dictionary, report_top_words_by_meanings, report_recent_words
+    report_counts_by_dictionary, report_top_words_by_meanings, report_recent_words,
+    report_cache_stats
 )
+from .translate import translate_interactive
+from .delta import export_delta_json
 from .io_json import (
     export_report_counts_json, export_dictionary_json, export_word_to_file,
-    export_one_word_to_json, import_from_json
+    export_one_word_to_json, import_from_json, export_snapshot, export_split_json
 )
 
 
@@ -45,6 +48,16 @@ def menu_slova(session):
     run_menu("📝 Меню: Слова і тлумачення", items)
 
 
+def menu_search(session):
+    items = [
+        ("1", "🔎 Пошук слова/фрази", lambda: search(session)),
+        ("2", "⌨️ Автодоповнення (слова за початком)", lambda: search_autocomplete(session)),
+        ("3", "🌍 Переклад тексту (усі слова одним запитом)", lambda: translate_interactive(session)),
+        ("4", "🔁 Зворотний пошук (слова за тлумаченням)", lambda: search_by_meaning(session)),
+    ]
+    run_menu("🔎 Меню: Пошук", items)
+
+
 def menu_reports(session):
 
     def report_top():
@@ -67,6 +80,12 @@ def menu_reports(session):
         ("5", "📤 Експорт усіх словників у форматі JSON", lambda: export_dictionary_json(session)),
         ("6", "📤 Експорт одного слова у форматі JSON", lambda: export_one_word_to_json(session)),
         ("7", "📥 Імпорт з JSON у базу даних", lambda: import_from_json(session)),
+        ("8", "🔧 Перебудувати пошуковий індекс", lambda: search_index_rebuild(session)),
+        ("9", "📈 Статистика кешу", report_cache_stats),
+        ("10", "🔧 Перевірити лічильники слів/тлумачень", lambda: counters_check(session)),
+        ("11", "📤 Експорт змін після попереднього дельта-експорту (дельта JSON)", lambda: export_delta_json(session)),
+        ("12", "📦 Знімок бази для швидкого пошуку (бінарний файл)", lambda: export_snapshot(session)),
+        ("13", "🗜️ Експорт по словниках (стиснені файли + маніфест)", lambda: export_split_json(session)),
     ]
     run_menu("📊 Меню: Звіти / експорт / імпорт", items)
 
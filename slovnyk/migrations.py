@@ -0,0 +1,368 @@
+"""
+Версійні міграції схеми. Поточна версія бази зберігається у PRAGMA user_version.
+init_db() запускає міграції при кожному старті; виконуються лише ті, що новіші за версію бази.
+Кожна міграція ідемпотентна (IF NOT EXISTS тощо), тож повторний запуск після збою безпечний.
+"""
+from __future__ import annotations
+
+from sqlalchemy import text
+
+from .stemming import stem_key
+from .textkey import normalize_key
+
+# (версія, опис, функція(conn))
+MIGRATIONS = []
+
+
+def migration(version: int, description: str):
+    def register(fn):
+        MIGRATIONS.append((version, description, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return register
+
+
+def current_version(conn) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar_one()
+
+
+def latest_version() -> int:
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def has_column(conn, table: str, column: str) -> bool:
+    return any(row[1] == column for row in conn.execute(text(f"PRAGMA table_info({table})")))
+
+
+def backfill(conn, table: str, source: str, target: str, fn, batch: int = 10000):
+    """ target = fn(source) для всіх рядків таблиці, пачками по rowid (без завантаження всієї таблиці)."""
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text(f"SELECT id, {source} FROM {table} WHERE id > :last ORDER BY id LIMIT :n"),
+            {"last": last_id, "n": batch},
+        ).all()
+        if not rows:
+            return
+        conn.execute(
+            text(f"UPDATE {table} SET {target} = :v WHERE id = :id"),
+            [{"id": rid, "v": fn(value)} for rid, value in rows],
+        )
+        last_id = rows[-1][0]
+
+
+def run_migrations(engine) -> list[int]:
+    """ Застосовує нові міграції по черзі (кожна — окремою транзакцією). Повертає їх версії."""
+    applied = []
+    with engine.connect() as conn:
+        version = current_version(conn)
+    for number, _description, fn in MIGRATIONS:
+        if number <= version:
+            continue
+        with engine.begin() as conn:
+            fn(conn)
+            conn.execute(text(f"PRAGMA user_version = {int(number)}"))
+        applied.append(number)
+    return applied
+
+
+# ЛІЧИЛЬНИКИ dictionaries.words_count / words.meanings_count, які підтримують тригери.
+COUNTER_DDL = [
+    """CREATE TRIGGER IF NOT EXISTS words_count_ai AFTER INSERT ON words BEGIN
+        UPDATE dictionaries SET words_count = words_count + 1 WHERE id = new.dictionary_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS words_count_ad AFTER DELETE ON words BEGIN
+        UPDATE dictionaries SET words_count = words_count - 1 WHERE id = old.dictionary_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS words_count_au AFTER UPDATE OF dictionary_id ON words
+    WHEN old.dictionary_id != new.dictionary_id BEGIN
+        UPDATE dictionaries SET words_count = words_count - 1 WHERE id = old.dictionary_id;
+        UPDATE dictionaries SET words_count = words_count + 1 WHERE id = new.dictionary_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meanings_count_ai AFTER INSERT ON meanings BEGIN
+        UPDATE words SET meanings_count = meanings_count + 1 WHERE id = new.word_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meanings_count_ad AFTER DELETE ON meanings BEGIN
+        UPDATE words SET meanings_count = meanings_count - 1 WHERE id = old.word_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meanings_count_au AFTER UPDATE OF word_id ON meanings
+    WHEN old.word_id != new.word_id BEGIN
+        UPDATE words SET meanings_count = meanings_count - 1 WHERE id = old.word_id;
+        UPDATE words SET meanings_count = meanings_count + 1 WHERE id = new.word_id;
+    END""",
+]
+
+# кількість рядків, де лічильник розійшовся з фактичною кількістю
+COUNTER_DRIFT_SQL = {
+    "dictionaries": "SELECT COUNT(*) FROM dictionaries d WHERE d.words_count != "
+                    "(SELECT COUNT(*) FROM words w WHERE w.dictionary_id = d.id)",
+    "words": "SELECT COUNT(*) FROM words w WHERE w.meanings_count != "
+             "(SELECT COUNT(*) FROM meanings m WHERE m.word_id = w.id)",
+}
+
+# повний перерахунок лічильників (кожен підзапит іде по індексу *_id)
+COUNTER_REBUILD_SQL = [
+    "UPDATE dictionaries SET words_count = (SELECT COUNT(*) FROM words w WHERE w.dictionary_id = dictionaries.id)",
+    "UPDATE words SET meanings_count = (SELECT COUNT(*) FROM meanings m WHERE m.word_id = words.id)",
+]
+
+
+# ПОВНОТЕКСТОВИЙ ІНДЕКС (FTS5)
+# Міграція 1: words_fts / meanings_fts — external content таблиці над words.word і meanings.text
+# (з міграції 8 — над нормалізованими ключами, FTS_KEY_DDL).
+# Токенізатор trigram дає пошук підрядка (як LIKE '%q%'), але через індекс.
+FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5("
+    "word, content='words', content_rowid='id', tokenize='trigram')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS meanings_fts USING fts5("
+    "text, content='meanings', content_rowid='id', tokenize='trigram')",
+
+    # тригери синхронізації words -> words_fts
+    """CREATE TRIGGER IF NOT EXISTS words_fts_ai AFTER INSERT ON words BEGIN
+        INSERT INTO words_fts(rowid, word) VALUES (new.id, new.word);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS words_fts_ad AFTER DELETE ON words BEGIN
+        INSERT INTO words_fts(words_fts, rowid, word) VALUES ('delete', old.id, old.word);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS words_fts_au AFTER UPDATE OF word ON words BEGIN
+        INSERT INTO words_fts(words_fts, rowid, word) VALUES ('delete', old.id, old.word);
+        INSERT INTO words_fts(rowid, word) VALUES (new.id, new.word);
+    END""",
+
+    # тригери синхронізації meanings -> meanings_fts
+    """CREATE TRIGGER IF NOT EXISTS meanings_fts_ai AFTER INSERT ON meanings BEGIN
+        INSERT INTO meanings_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meanings_fts_ad AFTER DELETE ON meanings BEGIN
+        INSERT INTO meanings_fts(meanings_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meanings_fts_au AFTER UPDATE OF text ON meanings BEGIN
+        INSERT INTO meanings_fts(meanings_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO meanings_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+]
+
+
+@migration(1, "FTS5-індекс words_fts / meanings_fts з тригерами синхронізації")
+def _m001_search_index(conn):
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'words_fts'")
+    ).first()
+    for ddl in FTS_DDL:
+        conn.execute(text(ddl))
+    if not exists:
+        conn.execute(text("INSERT INTO words_fts(words_fts) VALUES ('rebuild')"))
+        conn.execute(text("INSERT INTO meanings_fts(meanings_fts) VALUES ('rebuild')"))
+
+
+@migration(2, "індекси meanings(word_id, id), words(dictionary_id, id), words(created_at)")
+def _m002_query_indexes(conn):
+    # тлумачення слова за порядком id (деталі слова, експорт, пошук)
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_meanings_word_id_id ON meanings (word_id, id)"))
+    # слова словника за порядком id (списки слів, pick_id)
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_words_dictionary_id_id ON words (dictionary_id, id)"))
+    # звіт «останні додані слова»
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_words_created_at ON words (created_at)"))
+    # статистика для планувальника; analysis_limit — вибірка, а не повний прохід по великих таблицях
+    conn.execute(text("PRAGMA analysis_limit = 1000"))
+    conn.execute(text("ANALYZE"))
+
+
+@migration(3, "нормалізовані ключі words.word_key / meanings.text_key з індексами")
+def _m003_normalized_keys(conn):
+    if not has_column(conn, "words", "word_key"):
+        conn.execute(text("ALTER TABLE words ADD COLUMN word_key VARCHAR NOT NULL DEFAULT ''"))
+        backfill(conn, "words", "word", "word_key", normalize_key)
+    if not has_column(conn, "meanings", "text_key"):
+        conn.execute(text("ALTER TABLE meanings ADD COLUMN text_key VARCHAR NOT NULL DEFAULT ''"))
+        backfill(conn, "meanings", "text", "text_key", normalize_key)
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_words_dictionary_id_word_key ON words (dictionary_id, word_key)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_words_word_key ON words (word_key)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_meanings_word_id_text_key ON meanings (word_id, text_key)"))
+
+
+@migration(4, "лічильники dictionaries.words_count / words.meanings_count з тригерами, індекс words(meanings_count, id)")
+def _m004_counters(conn):
+    if not has_column(conn, "dictionaries", "words_count"):
+        conn.execute(text("ALTER TABLE dictionaries ADD COLUMN words_count INTEGER NOT NULL DEFAULT 0"))
+    if not has_column(conn, "words", "meanings_count"):
+        conn.execute(text("ALTER TABLE words ADD COLUMN meanings_count INTEGER NOT NULL DEFAULT 0"))
+    for ddl in COUNTER_DDL:
+        conn.execute(text(ddl))
+    for sql in COUNTER_REBUILD_SQL:
+        conn.execute(text(sql))
+    # звіт «топ слів за кількістю тлумачень»
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_words_meanings_count_id ON words (meanings_count, id)"))
+
+
+# ЖУРНАЛ ЗМІН для дельта-експорту (delta.py): тригери пишуть у change_log кожну вставку,
+# зміну і видалення словника, слова чи тлумачення. Для змін і видалень зберігається старий
+# природний ключ (назва+тип словника, текст слова), бо в іншій базі id інші.
+# Каскадні видалення (словник -> слова -> тлумачення) не логуються: їх покриває запис про батька.
+CHANGE_LOG_DDL = [
+    """CREATE TABLE IF NOT EXISTS change_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        entity TEXT NOT NULL,       -- 'dictionary' | 'word' | 'meaning'
+        entity_id INTEGER NOT NULL,
+        op TEXT NOT NULL,           -- 'I' | 'U' | 'D'
+        parent_id INTEGER,          -- слово: старий dictionary_id; тлумачення: word_id
+        old_name TEXT,              -- словник: стара назва; слово: старий текст
+        old_typ TEXT                -- словник: старий тип
+    )""",
+    # позначки синхронізації: export — seq останнього дельта-експорту, pruned — журнал очищено до seq,
+    # delta_applied — seq вихідної бази, до якого застосовано дельти
+    "CREATE TABLE IF NOT EXISTS sync_state (name TEXT PRIMARY KEY, seq INTEGER NOT NULL)",
+
+    """CREATE TRIGGER IF NOT EXISTS change_dictionaries_ai AFTER INSERT ON dictionaries BEGIN
+        INSERT INTO change_log (entity, entity_id, op) VALUES ('dictionary', new.id, 'I');
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_dictionaries_au AFTER UPDATE OF nazva, typ ON dictionaries BEGIN
+        INSERT INTO change_log (entity, entity_id, op, old_name, old_typ)
+        VALUES ('dictionary', old.id, 'U', old.nazva, old.typ);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_dictionaries_ad AFTER DELETE ON dictionaries BEGIN
+        INSERT INTO change_log (entity, entity_id, op, old_name, old_typ)
+        VALUES ('dictionary', old.id, 'D', old.nazva, old.typ);
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS change_words_ai AFTER INSERT ON words BEGIN
+        INSERT INTO change_log (entity, entity_id, op, parent_id) VALUES ('word', new.id, 'I', new.dictionary_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_words_au AFTER UPDATE OF word, dictionary_id ON words BEGIN
+        INSERT INTO change_log (entity, entity_id, op, parent_id, old_name)
+        VALUES ('word', old.id, 'U', old.dictionary_id, old.word);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_words_ad AFTER DELETE ON words
+    WHEN EXISTS (SELECT 1 FROM dictionaries WHERE id = old.dictionary_id) BEGIN
+        INSERT INTO change_log (entity, entity_id, op, parent_id, old_name)
+        VALUES ('word', old.id, 'D', old.dictionary_id, old.word);
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS change_meanings_ai AFTER INSERT ON meanings BEGIN
+        INSERT INTO change_log (entity, entity_id, op, parent_id) VALUES ('meaning', new.id, 'I', new.word_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_meanings_au AFTER UPDATE OF text, word_id ON meanings BEGIN
+        INSERT INTO change_log (entity, entity_id, op, parent_id) VALUES ('meaning', old.id, 'U', old.word_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_meanings_move AFTER UPDATE OF word_id ON meanings
+    WHEN old.word_id != new.word_id BEGIN
+        INSERT INTO change_log (entity, entity_id, op, parent_id) VALUES ('meaning', new.id, 'U', new.word_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_meanings_ad AFTER DELETE ON meanings
+    WHEN EXISTS (SELECT 1 FROM words WHERE id = old.word_id) BEGIN
+        INSERT INTO change_log (entity, entity_id, op, parent_id) VALUES ('meaning', old.id, 'D', old.word_id);
+    END""",
+]
+
+# updated_at ставлять тригери на ті самі колонки, що й журнал змін, — для будь-якого UPDATE
+# (ORM, Core, застосування дельти). Лічильники words_count / meanings_count дату не змінюють.
+# WHEN: значення, поставлене самим запитом, не перезаписується (і тригер не викликає себе вдруге).
+_NOW_SQL = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+UPDATED_AT_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS touch_{table}_au AFTER UPDATE OF {columns} ON {table}
+    WHEN new.updated_at IS old.updated_at BEGIN
+        UPDATE {table} SET updated_at = {_NOW_SQL} WHERE id = new.id;
+    END"""
+    for table, columns in (("dictionaries", "nazva, typ"), ("words", "word, dictionary_id"), ("meanings", "text, word_id"))
+]
+
+
+@migration(5, "журнал змін change_log з тригерами, sync_state, колонки updated_at з тригерами")
+def _m005_change_tracking(conn):
+    for table in ("dictionaries", "words", "meanings"):
+        if not has_column(conn, table, "updated_at"):
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN updated_at DATETIME"))
+            conn.execute(text(f"UPDATE {table} SET updated_at = created_at"))
+    for ddl in CHANGE_LOG_DDL + UPDATED_AT_DDL:
+        conn.execute(text(ddl))
+
+
+@migration(6, "індекс meanings(text_key) для зворотного пошуку за тлумаченням")
+def _m006_reverse_lookup_index(conn):
+    # точний збіг і «починається з» по нормалізованому тексту тлумачення в усіх словниках
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_meanings_text_key ON meanings (text_key)"))
+
+
+@migration(7, "основи слів words.word_stem / meanings.text_stem з індексами (пошук з урахуванням словозміни)")
+def _m007_stems(conn):
+    if not has_column(conn, "words", "word_stem"):
+        conn.execute(text("ALTER TABLE words ADD COLUMN word_stem VARCHAR NOT NULL DEFAULT ''"))
+        backfill(conn, "words", "word", "word_stem", stem_key)
+    if not has_column(conn, "meanings", "text_stem"):
+        conn.execute(text("ALTER TABLE meanings ADD COLUMN text_stem VARCHAR NOT NULL DEFAULT ''"))
+        backfill(conn, "meanings", "text", "text_stem", stem_key)
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_words_word_stem ON words (word_stem)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_meanings_text_stem ON meanings (text_stem)"))
+
+
+# Індекс над words.word_key і meanings.text_key: запит нормалізується тим самим normalize_key,
+# тож підрядок знаходиться незалежно від виду апострофа і форми Unicode (NFC).
+# Ключі змінюються разом з текстом (models: before_update), тому тригери стежать за ключами.
+FTS_KEY_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5("
+    "word_key, content='words', content_rowid='id', tokenize='trigram')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS meanings_fts USING fts5("
+    "text_key, content='meanings', content_rowid='id', tokenize='trigram')",
+
+    """CREATE TRIGGER IF NOT EXISTS words_fts_ai AFTER INSERT ON words BEGIN
+        INSERT INTO words_fts(rowid, word_key) VALUES (new.id, new.word_key);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS words_fts_ad AFTER DELETE ON words BEGIN
+        INSERT INTO words_fts(words_fts, rowid, word_key) VALUES ('delete', old.id, old.word_key);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS words_fts_au AFTER UPDATE OF word_key ON words BEGIN
+        INSERT INTO words_fts(words_fts, rowid, word_key) VALUES ('delete', old.id, old.word_key);
+        INSERT INTO words_fts(rowid, word_key) VALUES (new.id, new.word_key);
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS meanings_fts_ai AFTER INSERT ON meanings BEGIN
+        INSERT INTO meanings_fts(rowid, text_key) VALUES (new.id, new.text_key);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meanings_fts_ad AFTER DELETE ON meanings BEGIN
+        INSERT INTO meanings_fts(meanings_fts, rowid, text_key) VALUES ('delete', old.id, old.text_key);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meanings_fts_au AFTER UPDATE OF text_key ON meanings BEGIN
+        INSERT INTO meanings_fts(meanings_fts, rowid, text_key) VALUES ('delete', old.id, old.text_key);
+        INSERT INTO meanings_fts(rowid, text_key) VALUES (new.id, new.text_key);
+    END""",
+]
+
+
+@migration(8, "FTS5-індекс над нормалізованими ключами word_key / text_key")
+def _m008_key_search_index(conn):
+    for name in ("words_fts_ai", "words_fts_ad", "words_fts_au",
+                 "meanings_fts_ai", "meanings_fts_ad", "meanings_fts_au"):
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+    conn.execute(text("DROP TABLE IF EXISTS words_fts"))
+    conn.execute(text("DROP TABLE IF EXISTS meanings_fts"))
+    for ddl in FTS_KEY_DDL:
+        conn.execute(text(ddl))
+    conn.execute(text("INSERT INTO words_fts(words_fts) VALUES ('rebuild')"))
+    conn.execute(text("INSERT INTO meanings_fts(meanings_fts) VALUES ('rebuild')"))
+
+
+# text_stem — основи всіх токенів тлумачення через пробіл, тож рівність з основою запиту
+# знаходить лише однослівні тлумачення. Токенізатор unicode61 індексує кожну основу окремо;
+# remove_diacritics 0 — щоб "й" не зливалась з "и".
+STEM_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS meaning_stems_fts USING fts5("
+    "text_stem, content='meanings', content_rowid='id', tokenize='unicode61 remove_diacritics 0')",
+
+    """CREATE TRIGGER IF NOT EXISTS meaning_stems_fts_ai AFTER INSERT ON meanings BEGIN
+        INSERT INTO meaning_stems_fts(rowid, text_stem) VALUES (new.id, new.text_stem);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meaning_stems_fts_ad AFTER DELETE ON meanings BEGIN
+        INSERT INTO meaning_stems_fts(meaning_stems_fts, rowid, text_stem) VALUES ('delete', old.id, old.text_stem);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meaning_stems_fts_au AFTER UPDATE OF text_stem ON meanings BEGIN
+        INSERT INTO meaning_stems_fts(meaning_stems_fts, rowid, text_stem) VALUES ('delete', old.id, old.text_stem);
+        INSERT INTO meaning_stems_fts(rowid, text_stem) VALUES (new.id, new.text_stem);
+    END""",
+]
+
+
+@migration(9, "FTS5-індекс основ тлумачень meaning_stems_fts (пошук за основою будь-якого слова)")
+def _m009_meaning_stems_index(conn):
+    for ddl in STEM_FTS_DDL:
+        conn.execute(text(ddl))
+    conn.execute(text("INSERT INTO meaning_stems_fts(meaning_stems_fts) VALUES ('rebuild')"))
@@ -2,9 +2,19 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import String, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Index, UniqueConstraint, event
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from .stemming import stem_key
+from .textkey import normalize_key
+
+
+def _key_default(source: str, fn=normalize_key):
+    """ default для *_key / *_stem: рахується з сусідньої колонки при будь-якому INSERT (ORM і bulk)."""
+    def default(context):
+        return fn(context.get_current_parameters().get(source))
+    return default
+
 class Base(DeclarativeBase):
 
     pass
@@ -17,12 +27,19 @@ class Slovnyk(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     nazva: Mapped[str] = mapped_column(String, nullable=False)
     typ: Mapped[str] = mapped_column(String, nullable=False)
+    # кількість слів; підтримують тригери бази (migrations.COUNTER_DDL), у коді не змінюється
+    words_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+    # час останньої зміни; при UPDATE ставлять тригери бази (migrations.UPDATED_AT_DDL)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
 
-    # Один dictionary_obj може мати багато слів
+    # Один dictionary_obj може мати багато слів.
+    # passive_deletes: дітей видаляє каскад бази (PRAGMA foreign_keys = ON у кожному профілі),
+    # ORM не завантажує їх перед видаленням.
     words: Mapped[list["Slovo"]] = relationship(
         back_populates="dictionary",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     __table_args__ = (
@@ -39,16 +56,31 @@ class Slovo(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     dictionary_id: Mapped[int] = mapped_column(ForeignKey("dictionaries.id", ondelete="CASCADE"), nullable=False)
     word: Mapped[str] = mapped_column(String, nullable=False)
+    # нормалізований ключ слова (textkey.normalize_key) для пошуку без урахування регістру
+    word_key: Mapped[str] = mapped_column(String, nullable=False, default=_key_default("word"))
+    # основи токенів слова (stemming.stem_key) для пошуку з урахуванням словозміни
+    word_stem: Mapped[str] = mapped_column(String, nullable=False, default=_key_default("word", stem_key))
+    # кількість тлумачень; підтримують тригери бази (migrations.COUNTER_DDL)
+    meanings_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
 
     dictionary: Mapped[Slovnyk] = relationship(back_populates="words")
     meanings: Mapped[list["Tlumachennia"]] = relationship(
         back_populates="word_obj",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     __table_args__ = (
         UniqueConstraint("dictionary_id", "word", name="uq_word_dictionary_word"),
+        # індекси також створюють міграції (migrations.py) для вже існуючих баз
+        Index("ix_words_dictionary_id_id", "dictionary_id", "id"),
+        Index("ix_words_created_at", "created_at"),
+        Index("ix_words_dictionary_id_word_key", "dictionary_id", "word_key"),
+        Index("ix_words_word_key", "word_key"),
+        Index("ix_words_meanings_count_id", "meanings_count", "id"),
+        Index("ix_words_word_stem", "word_stem"),
     )
 
 
@@ -61,11 +93,31 @@ class Tlumachennia(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     word_id: Mapped[int] = mapped_column(ForeignKey("words.id", ondelete="CASCADE"), nullable=False)
     text: Mapped[str] = mapped_column(String, nullable=False)
+    text_key: Mapped[str] = mapped_column(String, nullable=False, default=_key_default("text"))
+    text_stem: Mapped[str] = mapped_column(String, nullable=False, default=_key_default("text", stem_key))
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
 
     word_obj: Mapped[Slovo] = relationship(back_populates="meanings")
 
     __table_args__ = (
         UniqueConstraint("word_id", "text", name="uq_meaning_word_text"),
+        Index("ix_meanings_word_id_id", "word_id", "id"),
+        Index("ix_meanings_word_id_text_key", "word_id", "text_key"),
+        Index("ix_meanings_text_key", "text_key"),
+        Index("ix_meanings_text_stem", "text_stem"),
     )
 
+
+
+# При редагуванні через ORM ключі й основи оновлюються разом із текстом.
+@event.listens_for(Slovo, "before_update")
+def _slovo_before_update(_mapper, _connection, target):
+    target.word_key = normalize_key(target.word)
+    target.word_stem = stem_key(target.word)
+
+
+@event.listens_for(Tlumachennia, "before_update")
+def _tlumachennia_before_update(_mapper, _connection, target):
+    target.text_key = normalize_key(target.text)
+    target.text_stem = stem_key(target.text)
@@ -1,51 +1,101 @@
 from __future__ import annotations
 
-from sqlalchemy import select, func
+from sqlalchemy import select
 
+from .cache import cache_stats
 from .models import Slovnyk, Slovo, Tlumachennia
 from .ui import format_dict_type
 
-def report_counts_by_dictionary(session):
+def counts_by_dictionary(session):
+    # words_count підтримують тригери — без COUNT по всій таблиці words
     stmt = (
-        select(Slovnyk.id, Slovnyk.nazva, Slovnyk.typ, func.count(Slovo.id).label("words_count"))
-        .outerjoin(Slovo, Slovo.dictionary_id == Slovnyk.id)
-        .group_by(Slovnyk.id)
-        .order_by(func.count(Slovo.id).desc(), Slovnyk.id.desc())
+        select(Slovnyk.id, Slovnyk.nazva, Slovnyk.typ, Slovnyk.words_count)
+        .order_by(Slovnyk.words_count.desc(), Slovnyk.id.desc())
     )
-    rows = session.execute(stmt).all()
+    return session.execute(stmt).all()
+
+
+def report_counts_by_dictionary(session):
+    rows = counts_by_dictionary(session)
     print("\n📊 Звіт: кількість слів у словниках")
     for sid, nazva, typ, cnt in rows:
         print(f"- ID {sid}: {nazva} (тип: {format_dict_type(typ)}) → кількість слів: {cnt}")
     return rows
 
 
-def report_top_words_by_meanings(session, limit=10):
+def top_words_by_meanings(session, limit=10):
+    # прохід індексу ix_words_meanings_count_id з кінця, зупинка після limit рядків
     stmt = (
-        select(Slovo.id, Slovo.word, Slovnyk.nazva, Slovnyk.typ, func.count(Tlumachennia.id).label("mc"))
+        select(Slovo.id, Slovo.word, Slovnyk.nazva, Slovnyk.typ, Slovo.meanings_count)
         .join(Slovnyk, Slovnyk.id == Slovo.dictionary_id)
-        .join(Tlumachennia, Tlumachennia.word_id == Slovo.id)
-        .group_by(Slovo.id)
-        .order_by(func.count(Tlumachennia.id).desc(), Slovo.id.desc())
+        .where(Slovo.meanings_count > 0)
+        .order_by(Slovo.meanings_count.desc(), Slovo.id.desc())
         .limit(limit)
     )
-    rows = session.execute(stmt).all()
+    return session.execute(stmt).all()
+
+
+def report_top_words_by_meanings(session, limit=10):
+    rows = top_words_by_meanings(session, limit)
     print(f"\n📊 Звіт: топ-{limit} слів за кількістю тлумачень")
     for wid, w, nazva, typ, mc in rows:
         print(f"- ID слова {wid}: {w}  [{nazva} {typ}] -> {mc}")
     return rows
 
 
-def report_recent_words(session, limit=10):
+def recent_words(session, limit=10):
     stmt = (
         select(Slovo.id, Slovo.word, Slovo.created_at, Slovnyk.nazva, Slovnyk.typ)
         .join(Slovnyk, Slovnyk.id == Slovo.dictionary_id)
-        .order_by(Slovo.id.desc())
+        .order_by(Slovo.created_at.desc(), Slovo.id.desc())
         .limit(limit)
     )
-    rows = session.execute(stmt).all()
+    return session.execute(stmt).all()
+
+
+def report_recent_words(session, limit=10):
+    rows = recent_words(session, limit)
     print(f"\n📊 Звіт: останні {limit} додані слова")
     for wid, w, created_at, nazva, typ in rows:
         print(f"- ID {wid}: {w}  [{nazva} | {format_dict_type(typ)}]  дата додавання: {created_at}")
     return rows
 
 
+
+
+# звіти, доступні в пакетному режимі і через HTTP
+REPORTS = ("counts", "top", "recent")
+
+
+def report_rows(session, name: str, limit: int = 10) -> list[dict]:
+    """ Звіт name (REPORTS) як список словників для JSON."""
+    if name == "counts":
+        return [
+            {"id": sid, "nazva": nazva, "typ": typ, "words_count": cnt}
+            for sid, nazva, typ, cnt in counts_by_dictionary(session)
+        ]
+    if name == "top":
+        return [
+            {"word_id": wid, "word": word, "dictionary": nazva, "typ": typ, "meanings_count": mc}
+            for wid, word, nazva, typ, mc in top_words_by_meanings(session, limit)
+        ]
+    if name == "recent":
+        return [
+            {"word_id": wid, "word": word, "created_at": created_at.isoformat(sep=" ", timespec="seconds"),
+             "dictionary": nazva, "typ": typ}
+            for wid, word, created_at, nazva, typ in recent_words(session, limit)
+        ]
+    raise ValueError(f"Невідомий звіт: {name} (є: {', '.join(REPORTS)})")
+
+
+def report_cache_stats():
+    stats = cache_stats()
+    print("\n📊 Кеш читань")
+    for name, st in stats.items():
+        total = st["hits"] + st["misses"]
+        ratio = st["hits"] / total * 100 if total else 0.0
+        print(
+            f"- {name}: записів {st['size']}/{st['maxsize']}, влучань {st['hits']}, "
+            f"промахів {st['misses']} ({ratio:.0f}% влучань), витіснено {st['evictions']}"
+        )
+    return stats
@@ -0,0 +1,399 @@
+"""
+Локальний HTTP/JSON-сервіс словників (лише стандартна бібліотека, працює без мережі назовні).
+
+    python main.py serve [--port 8765]
+
+GET  /search?q=...&mode=substring|exact|fuzzy|prefix|stem&field=word|meaning&dictionary=ID&limit=N
+     (нічого не знайдено — "suggestions" з нечіткого пошуку)
+GET  /autocomplete?prefix=...&dictionary=ID&typ=en-uk&limit=N
+GET  /words/<id>
+GET  /reports/<counts|top|recent>?limit=N
+GET  /metrics, /health
+POST /words  {"dictionary_id": 1, "word": "...", "meanings": ["..."]}
+
+Читання виконує пул потоків з пулом з'єднань SQLite лише для читання (mode=ro),
+усі записи — один потік-писач, тож у базу завжди пише лише одне з'єднання.
+Запит читання, що не вклався в тайм-аут, отримує 504, а його SQL перериває обробник прогресу SQLite,
+тож повільні запити не займають потоки пулу після відповіді клієнту.
+"""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from .config import (
+    AUTOCOMPLETE_LIMIT, SERVER_HOST, SERVER_MAX_BODY_BYTES, SERVER_MAX_LIMIT, SERVER_PORT, SERVER_READ_WORKERS,
+    SERVER_REQUEST_TIMEOUT,
+)
+from .db import get_engine, init_db, make_engine
+from .reports import REPORTS, report_rows
+from .services import SEARCH_MODES, add_word_meanings, autocomplete, search_response, word_info
+
+# межа заголовка вхідного запиту (тіла — config.SERVER_MAX_BODY_BYTES)
+MAX_HEADER_BYTES = 64 * 1024
+# скільки секунд тримати незайняте keep-alive з'єднання
+KEEPALIVE_TIMEOUT = 15.0
+# скільки останніх запитів кожного endpoint брати для перцентилів
+LATENCY_WINDOW = 1000
+# як часто (інструкцій VM SQLite) з'єднання читання перевіряє тайм-аут запиту
+PROGRESS_STEPS = 1000
+
+# тайм-аут запиту, що виконується в цьому потоці пулу (time.monotonic) або None
+_deadline = threading.local()
+
+
+def _past_deadline() -> int:
+    """ Обробник прогресу SQLite: не 0 — перервати запит (sqlite3.OperationalError: interrupted)."""
+    deadline = getattr(_deadline, "value", None)
+    return 1 if deadline is not None and time.monotonic() > deadline else 0
+
+
+def is_loopback(host: str) -> bool:
+    """ Чи слухатиме сервер лише локальні з'єднання (localhost, 127.0.0.0/8, ::1)."""
+    if host.lower() == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+# word — за словом, meaning — зворотний пошук за текстом тлумачення
+SEARCH_FIELDS = ("word", "meaning")
+
+REASONS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 504: "Gateway Timeout",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.recent = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, ms: float, status: int):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.recent.append(ms)
+        if status >= 400:
+            self.errors += 1
+        if status == 504:
+            self.timeouts += 1
+
+    def as_dict(self) -> dict:
+        ordered = sorted(self.recent)
+
+        def pct(p):
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 3) if ordered else 0.0
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+def _int_param(params: dict, name: str, default=None):
+    value = params.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise HttpError(400, f"Параметр {name} має бути цілим числом.") from None
+
+
+def _limit_param(params: dict, default: int | None) -> int | None:
+    """ limit у межах 1..SERVER_MAX_LIMIT: SQLite LIMIT -1 чи величезне число — уся таблиця."""
+    limit = _int_param(params, "limit", default)
+    if limit is not None and not 1 <= limit <= SERVER_MAX_LIMIT:
+        raise HttpError(400, f"Параметр limit має бути від 1 до {SERVER_MAX_LIMIT}.")
+    return limit
+
+
+def content_length(headers: dict, max_bytes: int = SERVER_MAX_BODY_BYTES) -> int:
+    """ Довжина тіла з Content-Length: лише цифри (400), не більше max_bytes (413)."""
+    value = headers.get("content-length")
+    if value is None or value == "":
+        return 0
+    if not (value.isascii() and value.isdigit()):
+        raise HttpError(400, "Невірний заголовок Content-Length.")
+    length = int(value)
+    if length > max_bytes:
+        raise HttpError(413, "Завелике тіло запиту.")
+    return length
+
+
+class LookupServer:
+    def __init__(self, host: str = SERVER_HOST, port: int = SERVER_PORT,
+                 read_workers: int = SERVER_READ_WORKERS, timeout: float = SERVER_REQUEST_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+        write_engine = get_engine()
+        init_db(write_engine)
+        read_engine = make_engine(readonly=True, pool_size=read_workers)
+
+        # після 504 запит не має займати потік пулу: SQLite перериває його сам
+        @event.listens_for(read_engine, "connect")
+        def _on_connect(dbapi_conn, _record):
+            dbapi_conn.set_progress_handler(_past_deadline, PROGRESS_STEPS)
+
+        session_args = {"autoflush": False, "expire_on_commit": False, "future": True}
+        self.read_sessions = sessionmaker(bind=read_engine, **session_args)
+        self.write_sessions = sessionmaker(bind=write_engine, **session_args)
+        self.read_pool = ThreadPoolExecutor(read_workers, thread_name_prefix="slovnyk-read")
+        self.write_pool = ThreadPoolExecutor(1, thread_name_prefix="slovnyk-write")
+        self.metrics = {}
+        self.started = time.time()
+
+    # ---- endpoints (виконуються в потоках пулу) ----
+
+    def _search(self, params):
+        q = params.get("q", "").strip()
+        if not q:
+            raise HttpError(400, "Потрібен параметр q.")
+        mode = params.get("mode", "substring")
+        if mode not in SEARCH_MODES:
+            raise HttpError(400, f"mode має бути одним з: {', '.join(SEARCH_MODES)}.")
+        field = params.get("field", "word")
+        if field not in SEARCH_FIELDS:
+            raise HttpError(400, f"field має бути одним з: {', '.join(SEARCH_FIELDS)}.")
+        if field == "meaning" and mode == "fuzzy":
+            raise HttpError(400, "Пошук за тлумаченням не підтримує mode=fuzzy.")
+        dictionary_id = _int_param(params, "dictionary")
+        limit = _limit_param(params, None)
+        if limit is None and field == "word" and mode not in ("fuzzy", "prefix"):
+            # у цих режимів немає власного ліміту за замовчуванням
+            limit = SERVER_MAX_LIMIT
+        with self.read_sessions() as session:
+            try:
+                return 200, search_response(session, q, mode, dictionary_id, limit, field)
+            except ValueError as e:
+                raise HttpError(400, str(e)) from None
+
+    def _autocomplete(self, params):
+        prefix = params.get("prefix", "")
+        dictionary_id = _int_param(params, "dictionary")
+        limit = _limit_param(params, AUTOCOMPLETE_LIMIT)
+        with self.read_sessions() as session:
+            rows = autocomplete(session, prefix, limit, dictionary_id, params.get("typ") or None)
+        return 200, {
+            "prefix": prefix,
+            "results": [{"word_id": wid, "word": word, "dictionary": nazva, "typ": typ}
+                        for wid, word, nazva, typ in rows],
+        }
+
+    def _word(self, params, word_id: str):
+        if not word_id.isdigit():
+            raise HttpError(404, "Слово не знайдено.")
+        with self.read_sessions() as session:
+            info = word_info(session, int(word_id))
+        if info is None:
+            raise HttpError(404, "Слово не знайдено.")
+        return 200, info
+
+    def _report(self, params, name: str):
+        if name not in REPORTS:
+            raise HttpError(404, f"Невідомий звіт: {name}.")
+        with self.read_sessions() as session:
+            return 200, report_rows(session, name, _limit_param(params, 10))
+
+    def _add_word(self, body: dict):
+        if not isinstance(body, dict):
+            raise HttpError(400, "Тіло запиту має бути JSON-об'єктом.")
+        meanings = body.get("meanings")
+        if isinstance(meanings, str):
+            meanings = [meanings]
+        if not isinstance(meanings, list) or not isinstance(body.get("dictionary_id"), int):
+            raise HttpError(400, "Потрібні поля dictionary_id (число) і meanings (список).")
+        with self.write_sessions() as session:
+            try:
+                result = add_word_meanings(session, body["dictionary_id"], str(body.get("word") or ""),
+                                           [str(m) for m in meanings])
+            except LookupError as e:
+                raise HttpError(404, str(e)) from None
+            except ValueError as e:
+                raise HttpError(400, str(e)) from None
+        return (201 if result["created"] else 200), result
+
+    def _metrics(self):
+        return 200, {
+            "uptime_s": round(time.time() - self.started, 1),
+            "endpoints": {name: m.as_dict() for name, m in sorted(self.metrics.items())},
+        }
+
+    # ---- маршрутизація ----
+
+    def route(self, method: str, path: str, params: dict, body):
+        """ (назва endpoint, пул або None — виконати одразу, функція без аргументів)."""
+        parts = [unquote(p) for p in path.strip("/").split("/") if p]
+        if method == "GET":
+            if parts == ["health"]:
+                return "health", None, lambda: (200, {"status": "ok"})
+            if parts == ["metrics"]:
+                return "metrics", None, self._metrics
+            if parts == ["search"]:
+                return "search", self.read_pool, lambda: self._search(params)
+            if parts == ["autocomplete"]:
+                return "autocomplete", self.read_pool, lambda: self._autocomplete(params)
+            if len(parts) == 2 and parts[0] == "words":
+                return "word", self.read_pool, lambda: self._word(params, parts[1])
+            if len(parts) == 2 and parts[0] == "reports":
+                return "report", self.read_pool, lambda: self._report(params, parts[1])
+        elif method == "POST" and parts == ["words"]:
+            return "add_word", self.write_pool, lambda: self._add_word(body)
+        if parts in (["words"], ["health"], ["metrics"], ["search"], ["autocomplete"]):
+            raise HttpError(405, "Метод не підтримується.")
+        raise HttpError(404, "Невідомий шлях.")
+
+    def _with_deadline(self, fn):
+        _deadline.value = time.monotonic() + self.timeout
+        try:
+            return fn()
+        except OperationalError as e:
+            # обробник прогресу спрацював раніше за asyncio.wait_for — це той самий тайм-аут
+            if "interrupted" in str(e.orig) and _past_deadline():
+                raise asyncio.TimeoutError from None
+            raise
+        finally:
+            _deadline.value = None
+
+    async def dispatch(self, method: str, target: str, body_bytes: bytes):
+        started = time.perf_counter()
+        endpoint = "unknown"
+        try:
+            url = urlsplit(target)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            body = None
+            if body_bytes:
+                try:
+                    body = json.loads(body_bytes)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    raise HttpError(400, "Тіло запиту — невірний JSON.") from None
+            endpoint, pool, fn = self.route(method, url.path, params, body)
+            if pool is None:
+                status, payload = fn()
+            else:
+                future = asyncio.get_running_loop().run_in_executor(pool, self._with_deadline, fn)
+                status, payload = await asyncio.wait_for(future, self.timeout)
+        except HttpError as e:
+            status, payload = e.status, {"error": str(e)}
+        except asyncio.TimeoutError:
+            # SQL запиту в потоці пулу перериває _past_deadline
+            status, payload = 504, {"error": f"Перевищено час обробки ({self.timeout} с)."}
+        except Exception as e:
+            status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+        ms = (time.perf_counter() - started) * 1000
+        self.metrics.setdefault(endpoint, EndpointMetrics()).record(ms, status)
+        return status, payload
+
+    # ---- HTTP/1.1 ----
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 413, {"error": "Завеликий заголовок запиту."}, False)
+                    return
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Невірний рядок запиту."}, False)
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = content_length(headers)
+                except HttpError as e:
+                    # тіло не прочитане — з'єднання далі використовувати не можна
+                    await self._respond(writer, e.status, {"error": str(e)}, False)
+                    return
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close") or \
+                    headers.get("connection", "").lower() == "keep-alive"
+                status, payload = await self.dispatch(method.upper(), target, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status: int, payload, keep_alive: bool):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def serve_forever(self, ready=None):
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES)
+        self.port = server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready(self)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.read_pool.shutdown(wait=False, cancel_futures=True)
+        self.write_pool.shutdown(wait=True)
+
+
+def run_server(host: str = SERVER_HOST, port: int = SERVER_PORT,
+               read_workers: int = SERVER_READ_WORKERS, timeout: float = SERVER_REQUEST_TIMEOUT):
+    server = LookupServer(host, port, read_workers, timeout)
+
+    def ready(srv):
+        print(f"SLOVNYK HTTP: http://{srv.host}:{srv.port}/ (Ctrl+C — зупинити)", flush=True)
+
+    try:
+        asyncio.run(server.serve_forever(ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
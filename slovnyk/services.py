@@ -1,10 +1,22 @@
 from __future__ import annotations
 
 import re
-from sqlalchemy import select, func
+from sqlalchemy import delete, select, func, text, tuple_, Integer, Float
 from sqlalchemy.exc import IntegrityError
 
+from .cache import (
+    MEANINGS_TAG, MISS, clear_caches, invalidate_meanings, invalidate_search, invalidate_word, search_cache,
+    word_cache,
+)
+from .config import (
+    AUTOCOMPLETE_LIMIT, DELETE_CHUNK_SIZE, PAGE_SIZE, FUZZY_CANDIDATES, FUZZY_LIMIT, FUZZY_MAX_DISTANCE, REVERSE_LIMIT,
+)
+from .db import (
+    FTS_MIN_QUERY_LEN, counter_drift, fts_phrase, has_fts, rebuild_counters, rebuild_search_index, rebuild_stems,
+)
 from .models import Slovnyk, Slovo, Tlumachennia
+from .stemming import stem_key
+from .textkey import edit_distance, normalize_key, trigrams
 from .ui import (
     format_dict_type,
     get_dictionaries,
@@ -12,6 +24,7 @@ from .ui import (
     input_int,
     input_int_optional,
     pick_id,
+    pick_id_paged,
 )
 
 def dictionaries_list(session):
@@ -70,6 +83,7 @@ def dictionary_edit(session):
     obj.typ = typ
     try:
         session.commit()
+        invalidate_search()
         print("Словник успішно оновлено.")
     except IntegrityError:
         session.rollback()
@@ -93,10 +107,49 @@ def dictionary_delete(session):
     if confirm != "tak":
         print("Скасовано.")
         return
-    session.delete(obj)
-    session.commit()
+    delete_dictionary(session, sid, progress=print_delete_progress)
     print("Словник успішно видалено.")
 
+
+def print_delete_progress(done: int, total: int):
+    end = "\n" if done >= total else ""
+    print(f"\r  видалено слів: {done}/{total}", end=end, flush=True)
+
+
+def delete_dictionary(session, dictionary_id: int, chunk_size: int = DELETE_CHUNK_SIZE, progress=None) -> bool:
+    """
+    Видаляє словник з усіма словами і тлумаченнями; False — якщо словника немає.
+    Без завантаження ORM-об'єктів: слова видаляються порціями по id (тлумачення — каскадом бази),
+    потім сам словник; усе в одній транзакції. progress(видалено, всього) — після кожної порції.
+    """
+    from .delta import last_change_seq
+
+    total = session.execute(select(Slovnyk.words_count).where(Slovnyk.id == dictionary_id)).scalar_one_or_none()
+    if total is None:
+        return False
+    since = last_change_seq(session)
+    done = 0
+    while True:
+        ids = session.execute(
+            select(Slovo.id).where(Slovo.dictionary_id == dictionary_id).order_by(Slovo.id).limit(chunk_size)
+        ).scalars().all()
+        if not ids:
+            break
+        session.execute(delete(Slovo).where(Slovo.id.in_(ids)), execution_options={"synchronize_session": False})
+        done += len(ids)
+        if progress:
+            progress(done, max(total, done))
+    session.execute(delete(Slovnyk).where(Slovnyk.id == dictionary_id), execution_options={"synchronize_session": False})
+    # у журналі змін видалення словника покриває видалення його слів (як при каскаді)
+    session.execute(
+        text("DELETE FROM change_log WHERE seq > :s AND entity = 'word' AND op = 'D' AND parent_id = :d"),
+        {"s": since, "d": dictionary_id},
+    )
+    session.commit()
+    session.expire_all()
+    clear_caches()
+    return True
+
 def slova_list(session):
     # Список словників з бд.
     dictionaries = get_dictionaries(session)
@@ -118,23 +171,64 @@ def slova_list(session):
         print("Помилка: словник не знайдено.")
         return
 
-# Список слів у вибраному словнику.
-    stmt = (
-        select(Slovo.id, Slovo.word, func.count(Tlumachennia.id).label("cnt"))
-        .outerjoin(Tlumachennia, Tlumachennia.word_id == Slovo.id)
-        .where(Slovo.dictionary_id == sid)
-        .group_by(Slovo.id)
-        .order_by(Slovo.word.asc())
-    )
-    rows = session.execute(stmt).all()
-    if not rows:
+# Список слів у вибраному словнику, посторінково за алфавітом.
+    if not has_words(session, sid):
         print("У словнику немає слів.")
         return
-    print("\nСлова:")
-    for wid, w, cnt in rows:
-        print(f"- ID {wid}: {w}  (кількість тлумачень: {cnt})")
+    pick_id_paged(
+        lambda after, prefix, limit: word_page(session, sid, after, prefix, limit, by_word=True),
+        "Слова:",
+        lambda r: f"- ID {r.id}: {r.word}  (кількість тлумачень: {r.meanings_count})",
+        pick=False,
+    )
+
 
 
+def has_words(session, dictionary_id: int) -> bool:
+    return session.execute(
+        select(Slovo.id).where(Slovo.dictionary_id == dictionary_id).limit(1)
+    ).first() is not None
+
+
+def word_page(session, dictionary_id: int, after=None, prefix: str | None = None,
+              limit: int = PAGE_SIZE, by_word: bool = False):
+    """
+    Одна сторінка слів словника (id, word, meanings_count, word_key) — keyset-пагінація без OFFSET.
+    after — останній рядок попередньої сторінки; by_word=True — за алфавітом (індекс (dictionary_id, word)),
+    інакше за id. prefix — лише слова, що починаються з нього (без урахування регістру); за алфавітом
+    такі сторінки йдуть за (word_key, id) — тим самим індексом, що й фільтр.
+    """
+    stmt = (
+        select(Slovo.id, Slovo.word, Slovo.meanings_count, Slovo.word_key)
+        .where(Slovo.dictionary_id == dictionary_id)
+        .limit(limit)
+    )
+    key = normalize_key(prefix)
+    if key:
+        lo, hi = key_prefix_range(key)
+        stmt = stmt.where(Slovo.word_key >= lo, Slovo.word_key < hi)
+    if by_word and key:
+        stmt = stmt.order_by(Slovo.word_key, Slovo.id)
+        if after is not None:
+            stmt = stmt.where(tuple_(Slovo.word_key, Slovo.id) > tuple_(after.word_key, after.id))
+    elif by_word:
+        stmt = stmt.order_by(Slovo.word, Slovo.id)
+        if after is not None:
+            stmt = stmt.where(tuple_(Slovo.word, Slovo.id) > tuple_(after.word, after.id))
+    else:
+        stmt = stmt.order_by(Slovo.id)
+        if after is not None:
+            stmt = stmt.where(Slovo.id > after.id)
+    return session.execute(stmt).all()
+
+
+def pick_word(session, dictionary_id: int, title: str = "Оберіть слово (Enter — назад)"):
+    """ Вибір слова словника посторінково; повертає ID або None."""
+    return pick_id_paged(
+        lambda after, prefix, limit: word_page(session, dictionary_id, after, prefix, limit),
+        title,
+    )
+
 
 # нове слово. перше тлумачення.
 def word_add(session):
@@ -161,6 +255,7 @@ def word_add(session):
     session.add(obj)
     try:
         session.commit()
+        invalidate_search()
         print("Слово успішно додано.")
     except IntegrityError:
         session.rollback()
@@ -183,15 +278,11 @@ def word_details(session):
         return
 
     # слова словника, список, щоб було видно ID.
-    words = session.execute(
-        select(Slovo).where(Slovo.dictionary_id == did).order_by(Slovo.id)
-    ).scalars().all()
-
-    if not words:
+    if not has_words(session, did):
         print("У цьому словнику поки немає слів.")
         return
 
-    sid = pick_id(words, "Оберіть слово (Enter — назад)", ("word",))
+    sid = pick_word(session, did, "Оберіть слово (Enter — назад)")
     if sid is None:
         return
 
@@ -204,16 +295,14 @@ def word_details(session):
     print(f"Словник: {d.nazva} ({d.typ})")
     print(f"Слово: {s.word}")
     print("Тлумачення:")
-    meanings = session.execute(
-        select(Tlumachennia).where(Tlumachennia.word_id == s.id).order_by(Tlumachennia.id)
-    ).scalars().all()
+    meanings = word_meanings(session, s.id)
 
     if not meanings:
         print("  (Немає тлумачень)")
         return
 
-    for t in meanings:
-        print(f"  - {t.text}")
+    for _mid, mtext in meanings:
+        print(f"  - {mtext}")
 
 def meaning_add_to_word(session):
     dictionaries = get_dictionaries(session)
@@ -225,15 +314,11 @@ def meaning_add_to_word(session):
     if did is None:
         return
 
-    words = session.execute(
-        select(Slovo).where(Slovo.dictionary_id == did).order_by(Slovo.id)
-    ).scalars().all()
-
-    if not words:
+    if not has_words(session, did):
         print("У цьому словнику немає слів.")
         return
 
-    sid = pick_id(words, "Оберіть слово (Enter — назад)", ("word",))
+    sid = pick_word(session, did, "Оберіть слово (Enter — назад)")
     if sid is None:
         return
 
@@ -243,13 +328,11 @@ def meaning_add_to_word(session):
         return
 
     print("\nПоточні тлумачення:")
-    meanings = session.execute(
-        select(Tlumachennia).where(Tlumachennia.word_id == s.id).order_by(Tlumachennia.id)
-    ).scalars().all()
+    meanings = word_meanings(session, s.id)
 
     if meanings:
-        for t in meanings:
-            print(f"  - {t.text}")
+        for _mid, mtext in meanings:
+            print(f"  - {mtext}")
     else:
         print("  (Немає тлумачень)")
 
@@ -264,6 +347,11 @@ def meaning_add_to_word(session):
     new_meaning = Tlumachennia(text=tekst, word_id=s.id)
     session.add(new_meaning)
     session.commit()
+    invalidate_word(s.id)
+    invalidate_meanings()
+    if not meanings:
+        # слово без тлумачень не потрапляло в результати пошуку — тепер може
+        invalidate_search()
 
     print("Тлумачення додано успішно.")
 
@@ -275,15 +363,11 @@ def word_edit(session):
     if did is None:
         return
 
-    words = session.execute(
-        select(Slovo).where(Slovo.dictionary_id == did).order_by(Slovo.id)
-    ).scalars().all()
-
-    if not words:
+    if not has_words(session, did):
         print("У цьому словнику ще немає слів.")
         return
 
-    wid = pick_id(words, "Оберіть слово для редагування (Enter — назад): ", ("word",))
+    wid = pick_word(session, did, "Оберіть слово для редагування (Enter — назад): ")
     if wid is None:
         return
 
@@ -301,7 +385,7 @@ def word_edit(session):
     exists = session.execute(
         select(Slovo)
         .where(Slovo.dictionary_id == did)
-        .where(func.lower(Slovo.word) == new_text.lower())
+        .where(Slovo.word_key == normalize_key(new_text))
         .where(Slovo.id != wid)
     ).scalars().first()
 
@@ -311,6 +395,8 @@ def word_edit(session):
 
     word_obj.word = new_text
     session.commit()
+    invalidate_word(wid)
+    invalidate_search()
     print("Готово: слово відредаговано.")
 
 
@@ -321,15 +407,11 @@ def meaning_edit(session):
     if did is None:
         return
 
-    words = session.execute(
-        select(Slovo).where(Slovo.dictionary_id == did).order_by(Slovo.id)
-    ).scalars().all()
-
-    if not words:
+    if not has_words(session, did):
         print("У цьому словнику ще немає слів.")
         return
 
-    wid = pick_id(words, "Оберіть слово (Enter — назад): ", ("word",))
+    wid = pick_word(session, did, "Оберіть слово (Enter — назад): ")
     if wid is None:
         return
 
@@ -369,7 +451,7 @@ def meaning_edit(session):
     exists = session.execute(
         select(Tlumachennia)
         .where(Tlumachennia.word_id == wid)
-        .where(func.lower(Tlumachennia.text) == new_text.lower())
+        .where(Tlumachennia.text_key == normalize_key(new_text))
         .where(Tlumachennia.id != mid)
     ).scalars().first()
 
@@ -379,6 +461,8 @@ def meaning_edit(session):
 
     meaning_obj.text = new_text
     session.commit()
+    invalidate_word(wid)
+    invalidate_meanings()
     print("Готово: тлумачення відредаговано.")
 
 
@@ -389,15 +473,11 @@ def word_delete(session):
     if did is None:
         return
 
-    words = session.execute(
-        select(Slovo).where(Slovo.dictionary_id == did).order_by(Slovo.id)
-    ).scalars().all()
-
-    if not words:
+    if not has_words(session, did):
         print("У цьому словнику ще немає слів.")
         return
 
-    wid = pick_id(words, "Оберіть слово для видалення (Enter — назад): ", ("word",))
+    wid = pick_word(session, did, "Оберіть слово для видалення (Enter — назад): ")
     if wid is None:
         return
 
@@ -413,11 +493,21 @@ def word_delete(session):
         print("Скасовано.")
         return
 
-    session.delete(word_obj)
-    session.commit()
+    delete_word(session, wid)
     print("Готово: слово видалено (разом із тлумаченнями).")
 
 
+def delete_word(session, word_id: int) -> bool:
+    """ Видаляє слово; тлумачення видаляє каскад бази. False — якщо слова немає."""
+    result = session.execute(delete(Slovo).where(Slovo.id == word_id), execution_options={"synchronize_session": False})
+    session.commit()
+    if not result.rowcount:
+        return False
+    session.expire_all()
+    invalidate_word(word_id)
+    return True
+
+
 def meaning_delete(session):
     """Видалення одного тлумачення, якщо іх більше 1го"""
     dictionaries = get_dictionaries(session)
@@ -425,15 +515,11 @@ def meaning_delete(session):
     if did is None:
         return
 
-    words = session.execute(
-        select(Slovo).where(Slovo.dictionary_id == did).order_by(Slovo.id)
-    ).scalars().all()
-
-    if not words:
+    if not has_words(session, did):
         print("У цьому словнику ще немає слів.")
         return
 
-    wid = pick_id(words, "Оберіть слово (Enter — назад): ", ("word",))
+    wid = pick_word(session, did, "Оберіть слово (Enter — назад): ")
     if wid is None:
         return
 
@@ -484,24 +570,300 @@ def meaning_delete(session):
 
     session.delete(meaning_obj)
     session.commit()
+    invalidate_word(wid)
     print("Готово: тлумачення видалено.")
 
-def search(session):
-    q = input_non_empty("🔍 Пошук slova/frazy: ")
-    if q is None:
-        return
+def word_meanings(session, word_id: int) -> list[tuple[int, str]]:
+    """ Тлумачення слова [(id, text)] за порядком id; через кеш (cache.word_cache)."""
+    generation = word_cache.generation
+    meanings = word_cache.get(word_id)
+    if meanings is MISS:
+        meanings = [tuple(r) for r in session.execute(
+            select(Tlumachennia.id, Tlumachennia.text)
+            .where(Tlumachennia.word_id == word_id)
+            .order_by(Tlumachennia.id)
+        )]
+        word_cache.put(word_id, meanings, generation=generation)
+    return meanings
+
+
+def find_words(session, q: str, exact: bool = False, dictionary_id: int | None = None):
+    """
+    Пошук слів за підрядком: FTS5-індекс над word_key з ранжуванням bm25, короткі запити — через LIKE.
+    Запит нормалізується так само, як ключ (регістр, NFC, апостроф), і в точному, і в пошуку підрядка.
+    exact=True — точний збіг слова (індекс по word_key).
+    dictionary_id — лише в одному словнику.
+    Результати кешуються (cache.search_cache) з тегами id знайдених слів.
+    """
+    key = normalize_key(q)
+    cache_key = ("words", key, exact, dictionary_id)
+    generation = search_cache.generation
+    rows = search_cache.get(cache_key)
+    if rows is not MISS:
+        return rows
+    cols = (Slovnyk.nazva, Slovnyk.typ, Slovo.id, Slovo.word, Tlumachennia.id, Tlumachennia.text)
+
+    if exact:
+        stmt = (
+            select(*cols)
+            .join(Slovo, Slovo.dictionary_id == Slovnyk.id)
+            .join(Tlumachennia, Tlumachennia.word_id == Slovo.id)
+            .where(Slovo.word_key == key)
+            .order_by(Slovnyk.id.desc(), Slovo.word.asc(), Slovo.id, Tlumachennia.id.asc())
+        )
+    elif len(key) >= FTS_MIN_QUERY_LEN and has_fts(session):
+        hits = (
+            text("SELECT rowid AS word_id, bm25(words_fts) AS rank FROM words_fts WHERE words_fts MATCH :q")
+            .bindparams(q=fts_phrase(key))
+            .columns(word_id=Integer, rank=Float)
+            .subquery("hits")
+        )
+        stmt = (
+            select(*cols)
+            .select_from(hits)
+            .join(Slovo, Slovo.id == hits.c.word_id)
+            .join(Slovnyk, Slovnyk.id == Slovo.dictionary_id)
+            .join(Tlumachennia, Tlumachennia.word_id == Slovo.id)
+            .order_by(hits.c.rank, Slovnyk.id.desc(), Slovo.word.asc(), Slovo.id, Tlumachennia.id.asc())
+        )
+    else:
+        stmt = (
+            select(*cols)
+            .join(Slovo, Slovo.dictionary_id == Slovnyk.id)
+            .join(Tlumachennia, Tlumachennia.word_id == Slovo.id)
+            .where(Slovo.word_key.contains(key, autoescape=True))
+            .order_by(Slovnyk.id.desc(), Slovo.word.asc(), Tlumachennia.id.asc())
+        )
+    if dictionary_id is not None:
+        stmt = stmt.where(Slovo.dictionary_id == dictionary_id)
+    rows = [tuple(r) for r in session.execute(stmt)]
+    search_cache.put(cache_key, rows, tags={r[2] for r in rows}, generation=generation)
+    return rows
+
+
+def find_words_by_stem(session, q: str, dictionary_id: int | None = None):
+    """
+    Слова з тією самою основою, що й q («книгою» -> «книга», «books» -> «book»):
+    збіг stemming.stem_key по індексу word_stem, без обробки рядків під час пошуку.
+    Рядки — як у find_words.
+    """
+    stem = stem_key(q)
+    if not stem:
+        return []
+    cache_key = ("stem", stem, dictionary_id)
+    generation = search_cache.generation
+    rows = search_cache.get(cache_key)
+    if rows is not MISS:
+        return rows
     stmt = (
         select(Slovnyk.nazva, Slovnyk.typ, Slovo.id, Slovo.word, Tlumachennia.id, Tlumachennia.text)
         .join(Slovo, Slovo.dictionary_id == Slovnyk.id)
         .join(Tlumachennia, Tlumachennia.word_id == Slovo.id)
-        .where(Slovo.word.like(f"%{q}%"))
-        .order_by(Slovnyk.id.desc(), Slovo.word.asc(), Tlumachennia.id.asc())
+        .where(Slovo.word_stem == stem)
+        .order_by(Slovnyk.id.desc(), Slovo.word.asc(), Slovo.id, Tlumachennia.id.asc())
     )
-    rows = session.execute(stmt).all()
+    if dictionary_id is not None:
+        stmt = stmt.where(Slovo.dictionary_id == dictionary_id)
+    rows = [tuple(r) for r in session.execute(stmt)]
+    search_cache.put(cache_key, rows, tags={r[2] for r in rows}, generation=generation)
+    return rows
+
+
+REVERSE_MODES = ("substring", "exact", "prefix", "stem")
+
+
+def find_by_meaning(session, q: str, mode: str = "substring", dictionary_id: int | None = None,
+                    limit: int = REVERSE_LIMIT):
+    """
+    Зворотний пошук: слова, серед тлумачень яких є q.
+    exact — тлумачення збігається з q без урахування регістру/апострофа (індекс по text_key),
+    prefix — тлумачення починається з q (діапазон по тому ж індексу),
+    stem — тлумачення містить слово з тією самою основою (stemming.stem_key, FTS5-індекс meaning_stems_fts),
+    substring — FTS5-індекс meanings_fts над text_key з ранжуванням bm25, короткі запити — через LIKE.
+    Повертає не більше limit знайдених тлумачень [(nazva, typ, word_id, word, meaning_id, text)];
+    тлумачення одного слова йдуть поспіль, слова — за найкращим збігом.
+    """
+    if mode not in REVERSE_MODES:
+        raise ValueError(f"зворотний пошук: mode має бути одним з: {', '.join(REVERSE_MODES)}.")
+    key = stem_key(q) if mode == "stem" else normalize_key(q)
+    if not key:
+        return []
+    cache_key = ("meanings", key, mode, dictionary_id, limit)
+    generation = search_cache.generation
+    rows = search_cache.get(cache_key)
+    if rows is not MISS:
+        return rows
+    cols = (Slovnyk.nazva, Slovnyk.typ, Slovo.id, Slovo.word, Tlumachennia.id, Tlumachennia.text)
+
+    if mode == "exact":
+        stmt = (
+            select(*cols)
+            .select_from(Tlumachennia)
+            .where(Tlumachennia.text_key == key)
+            .order_by(Slovnyk.id.desc(), Slovo.word.asc(), Slovo.id, Tlumachennia.id)
+        )
+    elif mode == "stem":
+        # text_stem — основи всіх токенів тлумачення, тож шукаємо основи запиту як фразу серед них
+        hits = (
+            text("SELECT rowid AS meaning_id FROM meaning_stems_fts WHERE meaning_stems_fts MATCH :q")
+            .bindparams(q=fts_phrase(key))
+            .columns(meaning_id=Integer)
+            .subquery("hits")
+        )
+        stmt = (
+            select(*cols)
+            .select_from(hits)
+            .join(Tlumachennia, Tlumachennia.id == hits.c.meaning_id)
+            .order_by(Slovnyk.id.desc(), Slovo.word.asc(), Slovo.id, Tlumachennia.id)
+        )
+    elif mode == "prefix":
+        lo, hi = key_prefix_range(key)
+        stmt = (
+            select(*cols)
+            .select_from(Tlumachennia)
+            .where(Tlumachennia.text_key >= lo, Tlumachennia.text_key < hi)
+            .order_by(Tlumachennia.text_key, Tlumachennia.id)
+        )
+    elif len(key) >= FTS_MIN_QUERY_LEN and has_fts(session):
+        hits = (
+            text("SELECT rowid AS meaning_id, bm25(meanings_fts) AS rank FROM meanings_fts WHERE meanings_fts MATCH :q")
+            .bindparams(q=fts_phrase(key))
+            .columns(meaning_id=Integer, rank=Float)
+            .subquery("hits")
+        )
+        stmt = (
+            select(*cols)
+            .select_from(hits)
+            .join(Tlumachennia, Tlumachennia.id == hits.c.meaning_id)
+            .order_by(hits.c.rank, Tlumachennia.id)
+        )
+    else:
+        stmt = (
+            select(*cols)
+            .select_from(Tlumachennia)
+            .where(Tlumachennia.text_key.contains(key, autoescape=True))
+            .order_by(Slovnyk.id.desc(), Slovo.word.asc(), Tlumachennia.id)
+        )
+    stmt = (
+        stmt.join(Slovo, Slovo.id == Tlumachennia.word_id)
+        .join(Slovnyk, Slovnyk.id == Slovo.dictionary_id)
+        .limit(limit)
+    )
+    if dictionary_id is not None:
+        stmt = stmt.where(Slovo.dictionary_id == dictionary_id)
+
+    by_word = {}
+    for r in session.execute(stmt):
+        by_word.setdefault(r[2], []).append(tuple(r))
+    rows = [r for word_rows in by_word.values() for r in word_rows]
+    search_cache.put(cache_key, rows, tags=set(by_word) | {MEANINGS_TAG}, generation=generation)
+    return rows
+
+
+def find_similar_words(session, q: str, limit: int = FUZZY_LIMIT, max_distance: int = FUZZY_MAX_DISTANCE,
+                       dictionary_id: int | None = None):
+    """
+    Найближчі за відстанню редагування слова (для "можливо, ви мали на увазі").
+    Кандидати — слова зі спільними триграмами (trigram-індекс words_fts) і слова з тими самими
+    двома першими літерами (індекс word_key), обидва — з близькою довжиною ключа.
+    Кожна правка зачіпає щонайбільше три триграми, тож слово на відстані d мусить мати
+    щонайменше len(trigrams) - 3·d спільних триграм: решту FTS відкидає ще до LIMIT.
+    Відстань рахується лише для кандидатів, а не для кожного рядка таблиці.
+    Повертає [(distance, word_id, word, nazva, typ)] від найближчого.
+    """
+    key = normalize_key(q)
+    if len(key) < 3:
+        return []
+    cache_key = ("similar", key, limit, max_distance, dictionary_id)
+    generation = search_cache.generation
+    cached = search_cache.get(cache_key)
+    if cached is not MISS:
+        return cached
+    # для коротких слів дві помилки — це вже зовсім інше слово
+    max_distance = min(max_distance, max(1, len(key) // 3))
+
+    def candidates(stmt):
+        stmt = (
+            stmt.join(Slovnyk, Slovnyk.id == Slovo.dictionary_id)
+            .where(func.length(Slovo.word_key).between(len(key) - max_distance, len(key) + max_distance))
+            .limit(FUZZY_CANDIDATES)
+        )
+        if dictionary_id is not None:
+            stmt = stmt.where(Slovo.dictionary_id == dictionary_id)
+        return session.execute(stmt).all()
+
+    cols = (Slovo.id, Slovo.word, Slovo.word_key, Slovnyk.nazva, Slovnyk.typ)
+    lo, hi = key_prefix_range(key[:2])
+    # LIMIT без порядку взяв би перші за ключем, а не найближчі за довжиною
+    rows = candidates(
+        select(*cols).where(Slovo.word_key >= lo, Slovo.word_key < hi)
+        .order_by(func.abs(func.length(Slovo.word_key) - len(key)), Slovo.word_key)
+    )
+    if has_fts(session):
+        grams = trigrams(key)
+        # по запиту на триграму: скільки триграм ключа містить слово
+        per_gram = " UNION ALL ".join(
+            f"SELECT rowid FROM words_fts WHERE words_fts MATCH :g{i}" for i in range(len(grams))
+        )
+        hits = (
+            text(f"SELECT rowid AS word_id, count(*) AS shared FROM ({per_gram}) "
+                 "GROUP BY rowid HAVING count(*) >= :min_shared")
+            .bindparams(min_shared=max(1, len(grams) - 3 * max_distance),
+                        **{f"g{i}": fts_phrase(g) for i, g in enumerate(grams)})
+            .columns(word_id=Integer, shared=Integer)
+            .subquery("hits")
+        )
+        rows += candidates(
+            select(*cols).select_from(hits).join(Slovo, Slovo.id == hits.c.word_id)
+            .order_by(hits.c.shared.desc(), Slovo.id)
+        )
+
+    found = {}
+    for wid, word, word_key, nazva, typ in rows:
+        distance = edit_distance(key, word_key, max_distance)
+        if distance <= max_distance:
+            found[wid] = (distance, word_key, wid, word, nazva, typ)
+    best = sorted(found.values())[:limit]
+    result = [(distance, wid, word, nazva, typ) for distance, _key, wid, word, nazva, typ in best]
+    search_cache.put(cache_key, result, tags={r[1] for r in result}, generation=generation)
+    return result
+
+
+def print_suggestions(suggestions):
+    print("Можливо, ви мали на увазі:")
+    for distance, wid, word, nazva, typ in suggestions:
+        print(f"- ID {wid}: {word}  [{nazva} ({typ})]  (відмінностей: {distance})")
+
+
+def search(session):
+    q = input_non_empty("🔍 Пошук slova/frazy (=слово — точний збіг, ~слово — нечіткий): ")
+    if q is None:
+        return
+    if q.startswith("~") and len(q) > 1:
+        suggestions = find_similar_words(session, q[1:])
+        if not suggestions:
+            print("Нічого не знайдено.")
+            return
+        print_suggestions(suggestions)
+        return
+    exact = q.startswith("=") and len(q) > 1
+    rows = find_words(session, q[1:] if exact else q, exact=exact)
+    if not rows:
+        rows = find_words_by_stem(session, q[1:] if exact else q)
+        if rows:
+            print("Точних збігів немає; слова з тією самою основою:")
     if not rows:
         print("Нічого не знайдено.")
+        suggestions = find_similar_words(session, q[1:] if exact else q)
+        if suggestions:
+            print_suggestions(suggestions)
         return
 
+    print_word_rows(rows)
+
+
+def print_word_rows(rows):
+    """ Рядки (nazva, typ, word_id, word, meaning_id, text) — по слову з його тлумаченнями."""
     print("\nРезультати:")
     current = None
     for dictionary_name, typ, word_id, word_text, tl_id, tl_txt in rows:
@@ -512,4 +874,239 @@ def search(session):
         print(f"  - {tl_id}: {tl_txt}")
 
 
+def search_by_meaning(session):
+    """ Зворотний пошук: які слова мають таке тлумачення (у всіх словниках або в одному)."""
+    dictionaries = get_dictionaries(session)
+    if not dictionaries:
+        print("Немає жодного словника. Спочатку створіть словник або імпортуйте демо-дані.")
+        return
+    did = pick_id(dictionaries, "Словник (Enter або 0 — у всіх словниках)", ("nazva", "typ"))
+
+    q = input_non_empty("🔁 Тлумачення або його частина (=текст — точний збіг, текст* — початок): ")
+    if q is None:
+        return
+    if q.startswith("=") and len(q) > 1:
+        mode, q = "exact", q[1:]
+    elif q.endswith("*") and len(q) > 1:
+        mode, q = "prefix", q[:-1]
+    else:
+        mode = "substring"
+    rows = find_by_meaning(session, q, mode, did)
+    if not rows and mode == "substring":
+        rows = find_by_meaning(session, q, "stem", did)
+        if rows:
+            print("Точних збігів немає; тлумачення з тією самою основою:")
+    if not rows:
+        print("Нічого не знайдено.")
+        return
+    print_word_rows(rows)
+    if len(rows) >= REVERSE_LIMIT:
+        print(f"\nПоказано перші {REVERSE_LIMIT} тлумачень; уточніть запит.")
+
+
+def key_prefix_range(prefix_key: str) -> tuple[str, str]:
+    """
+    Межі [from, to) для "починається з" по нормалізованому ключу.
+    SQLite порівнює TEXT побайтово (UTF-8), тобто в порядку кодів символів.
+    """
+    return prefix_key, prefix_key[:-1] + chr(ord(prefix_key[-1]) + 1)
+
+
+def autocomplete(session, prefix: str, limit: int = AUTOCOMPLETE_LIMIT,
+                 dictionary_id: int | None = None, typ: str | None = None):
+    """
+    Перші limit слів, що починаються з prefix (без урахування регістру), за алфавітом.
+    Діапазонний запит по індексу word_key / (dictionary_id, word_key), без перебору таблиці.
+    """
+    key = normalize_key(prefix)
+    if not key:
+        return []
+    lo, hi = key_prefix_range(key)
+    stmt = (
+        select(Slovo.id, Slovo.word, Slovnyk.nazva, Slovnyk.typ)
+        .join(Slovnyk, Slovnyk.id == Slovo.dictionary_id)
+        .where(Slovo.word_key >= lo, Slovo.word_key < hi)
+        .order_by(Slovo.word_key, Slovo.id)
+        .limit(limit)
+    )
+    if dictionary_id is not None:
+        stmt = stmt.where(Slovo.dictionary_id == dictionary_id)
+    if typ is not None:
+        stmt = stmt.where(Slovo.dictionary_id.in_(select(Slovnyk.id).where(Slovnyk.typ == typ)))
+    return session.execute(stmt).all()
+
+
+def search_autocomplete(session):
+    """ Автодоповнення: слова, що починаються з введеного фрагмента."""
+    dictionaries = get_dictionaries(session)
+    if not dictionaries:
+        print("Немає жодного словника. Спочатку створіть словник або імпортуйте демо-дані.")
+        return
+    did = pick_id(dictionaries, "Словник (Enter або 0 — у всіх словниках)", ("nazva", "typ"))
+
+    prefix = input_non_empty("Початок слова: ")
+    if prefix is None:
+        return
+    rows = autocomplete(session, prefix, dictionary_id=did)
+    if not rows:
+        print("Нічого не знайдено.")
+        return
+
+    print("\nВаріанти:")
+    for wid, word, nazva, typ in rows:
+        print(f"- ID {wid}: {word}  [{nazva} ({typ})]")
+
+
+SEARCH_MODES = ("substring", "exact", "fuzzy", "prefix", "stem")
+
+
+def search_results(session, q: str, mode: str = "substring", dictionary_id: int | None = None,
+                   limit: int | None = None, field: str = "word") -> list[dict]:
+    """
+    Пошук для пакетного режиму і HTTP: знайдені слова як dict для JSON.
+    mode: substring (за замовчуванням), exact, fuzzy, prefix, stem (та сама основа слова).
+    field="meaning" — зворотний пошук за текстом тлумачення (find_by_meaning, без fuzzy):
+    у "meanings" лише знайдені тлумачення слова. ValueError — невідоме поле або режим.
+    """
+    if field == "meaning":
+        rows = find_by_meaning(session, q, mode, dictionary_id, limit or REVERSE_LIMIT)
+        return _group_results(rows)
+    if field != "word":
+        raise ValueError("field має бути word або meaning.")
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"mode має бути одним з: {', '.join(SEARCH_MODES)}.")
+    if mode == "fuzzy":
+        return [
+            {"word_id": wid, "word": word, "dictionary": nazva, "typ": typ, "distance": distance}
+            for distance, wid, word, nazva, typ in find_similar_words(
+                session, q, limit=limit or FUZZY_LIMIT, dictionary_id=dictionary_id
+            )
+        ]
+    if mode == "prefix":
+        return [
+            {"word_id": wid, "word": word, "dictionary": nazva, "typ": typ}
+            for wid, word, nazva, typ in autocomplete(
+                session, q, limit=limit or AUTOCOMPLETE_LIMIT, dictionary_id=dictionary_id
+            )
+        ]
+
+    if mode == "stem":
+        return _group_results(find_words_by_stem(session, q, dictionary_id), limit)
+    return _group_results(find_words(session, q, mode == "exact", dictionary_id), limit)
+
+
+def search_response(session, q: str, mode: str = "substring", dictionary_id: int | None = None,
+                    limit: int | None = None, field: str = "word") -> dict:
+    """
+    Відповідь пошуку для CLI і HTTP: {"query", "results"}.
+    Якщо за словом нічого не знайдено (substring, exact, stem), як і в меню, додає "suggestions" —
+    результати нечіткого пошуку ("можливо, ви мали на увазі") з "distance".
+    """
+    results = search_results(session, q, mode, dictionary_id, limit, field)
+    response = {"query": q, "results": results}
+    if not results and field == "word" and mode in ("substring", "exact", "stem"):
+        response["suggestions"] = search_results(session, q, "fuzzy", dictionary_id)
+    return response
+
+
+def _group_results(rows, limit: int | None = None) -> list[dict]:
+    """ Рядки (nazva, typ, word_id, word, meaning_id, text) -> слова з тлумаченнями, не більше limit слів."""
+    results = []
+    by_word = {}
+    for nazva, typ, wid, word, _mid, mtext in rows:
+        item = by_word.get(wid)
+        if item is None:
+            if limit is not None and len(results) >= limit:
+                continue
+            item = by_word[wid] = {"word_id": wid, "word": word, "dictionary": nazva, "typ": typ, "meanings": []}
+            results.append(item)
+        item["meanings"].append(mtext)
+    return results
+
+
+def word_info(session, word_id: int) -> dict | None:
+    """ Слово з тлумаченнями як dict для JSON; None — якщо такого слова немає."""
+    row = session.execute(
+        select(Slovo.id, Slovo.word, Slovo.dictionary_id, Slovnyk.nazva, Slovnyk.typ)
+        .join(Slovnyk, Slovnyk.id == Slovo.dictionary_id)
+        .where(Slovo.id == word_id)
+    ).first()
+    if row is None:
+        return None
+    wid, word, did, nazva, typ = row
+    return {
+        "word_id": wid,
+        "word": word,
+        "dictionary_id": did,
+        "dictionary": nazva,
+        "typ": typ,
+        "meanings": [mtext for _mid, mtext in word_meanings(session, wid)],
+    }
+
+
+def add_word_meanings(session, dictionary_id: int, word: str, meanings: list[str]) -> dict:
+    """
+    Додає слово (якщо його ще немає у словнику) і нові тлумачення без діалогу.
+    LookupError — немає словника, ValueError — порожнє слово або жодного тлумачення.
+    """
+    word = (word or "").strip()
+    meanings = [m.strip() for m in meanings if m and m.strip()]
+    if not word:
+        raise ValueError("Слово не може бути порожнім.")
+    if not meanings:
+        raise ValueError("Потрібне хоча б одне тлумачення.")
+    if session.get(Slovnyk, dictionary_id) is None:
+        raise LookupError("Словник не знайдено.")
+
+    word_obj = session.execute(
+        select(Slovo).where(Slovo.dictionary_id == dictionary_id, Slovo.word == word)
+    ).scalar_one_or_none()
+    created = word_obj is None
+    if created:
+        word_obj = Slovo(dictionary_id=dictionary_id, word=word)
+        session.add(word_obj)
+        session.flush()
+    existing = set(session.execute(
+        select(Tlumachennia.text).where(Tlumachennia.word_id == word_obj.id)
+    ).scalars())
+    added = 0
+    for mtext in meanings:
+        if mtext not in existing:
+            existing.add(mtext)
+            session.add(Tlumachennia(word_id=word_obj.id, text=mtext))
+            added += 1
+    session.commit()
+
+    invalidate_word(word_obj.id)
+    if added:
+        invalidate_meanings()
+    if created or added == len(existing):
+        # нове слово або слово, що було без тлумачень, — змінюються результати пошуку
+        invalidate_search()
+    return {"word_id": word_obj.id, "created": created, "added_meanings": added}
+
+
+def search_index_rebuild(session):
+    """ Перебудова FTS5-індексу і основ слів (якщо індекс розійшовся з таблицями або змінився стемер)."""
+    session.rollback()
+    rebuild_search_index(session)
+    rebuild_stems(session)
+    session.commit()
+    invalidate_search()
+    print("Готово: пошуковий індекс і основи слів перебудовано.")
+
+
+def counters_check(session):
+    """ Перевірка лічильників words_count / meanings_count; перерахунок, якщо розійшлися."""
+    session.rollback()
+    drift = counter_drift(session)
+    if not any(drift.values()):
+        print("Лічильники в порядку.")
+        return
+    print(f"Розбіжності: словників {drift['dictionaries']}, слів {drift['words']}.")
+    rebuild_counters(session)
+    session.commit()
+    print("Готово: лічильники перераховано.")
+
+
 # Експорт у папку export/ у форматі JSON.
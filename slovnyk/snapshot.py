@@ -0,0 +1,368 @@
+"""
+Компактний знімок бази для швидкого пошуку лише для читання: один бінарний файл,
+який читач відображає в пам'ять (mmap) і шукає в ньому без SQLAlchemy і без SQLite.
+Файл пише io_json.export_snapshot_to_file; тут — формат і читач.
+
+Формат (little-endian, версія SNAPSHOT_VERSION):
+    заголовок  HEADER (magic, версія, прапорці, кількості, зсуви секцій)
+    data       для кожного ключа: u32 слів; слово — u32 word_id, u32 dictionary_id,
+               u32 довжина + UTF-8 слова, u32 тлумачень; тлумачення — u32 довжина + UTF-8
+    keys       UTF-8 ключі слів (textkey.normalize_key), відсортовані побайтово, без роздільників
+    index      (keys + 1) записів INDEX_ENTRY: зсув ключа від початку keys, запису — від початку data
+               (останній запис — кінці секцій, тож довжина i-го = різниця сусідніх)
+    mph        необов'язково: мінімальна досконала хеш-функція (CHD над crc32/adler32) — i32 зміщення
+               на кошик і u32 номер ключа на кожен слот; точний пошук за O(1) замість бінарного
+    meta       JSON: {"created_at", "dictionaries": {id: [назва, тип]}}
+
+    python -m slovnyk.snapshot export/slovnyky.snap слово
+    python -m slovnyk.snapshot export/slovnyky.snap --prefix сло --limit 20
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+
+from .textkey import normalize_key
+
+SNAPSHOT_MAGIC = b"SLVSNAP\0"
+SNAPSHOT_VERSION = 1
+FLAG_MPH = 1
+
+# magic, версія, прапорці, ключів, слів, тлумачень, data, keys, index, mph, кошиків mph, meta, довжина meta
+HEADER = struct.Struct("<8sIIQQQQQQQQQQ")
+INDEX_ENTRY = struct.Struct("<QQ")
+_U32 = struct.Struct("<I")
+_U32x2 = struct.Struct("<II")
+
+# середня кількість ключів у кошику mph: більше — менша таблиця, довша побудова
+MPH_BUCKET_SIZE = 2
+# скільки зміщень пробувати для кошика, перш ніж писати знімок без mph
+MPH_MAX_TRIES = 1_000_000
+
+
+class SnapshotError(ValueError):
+    """ Файл не є знімком або має непідтримувану версію."""
+
+
+# ЗАПИС
+def encode_record(words) -> bytes:
+    """ [(word_id, dictionary_id, слово, [тлумачення])] одного ключа -> запис секції data."""
+    parts = [_U32.pack(len(words))]
+    for wid, did, word, meanings in words:
+        wb = word.encode("utf-8")
+        parts.append(_U32x2.pack(wid, did))
+        parts.append(_U32.pack(len(wb)))
+        parts.append(wb)
+        parts.append(_U32.pack(len(meanings)))
+        for m in meanings:
+            mb = m.encode("utf-8")
+            parts.append(_U32.pack(len(mb)))
+            parts.append(mb)
+    return b"".join(parts)
+
+
+def _hashes(key) -> tuple[int, int]:
+    return zlib.crc32(key), zlib.adler32(key)
+
+
+def _fmix32(x: int) -> int:
+    """ Фіналізатор MurmurHash3: перемішує біти 32-бітного числа."""
+    x ^= x >> 16
+    x = (x * 0x85EBCA6B) & 0xFFFFFFFF
+    x ^= x >> 13
+    x = (x * 0xC2B2AE35) & 0xFFFFFFFF
+    return x ^ (x >> 16)
+
+
+def _slot(h1: int, h2: int, d: int, n: int) -> int:
+    """ Слот ключа з хешами (h1, h2) для зміщення d: різні d дають незалежні слоти."""
+    return _fmix32(h1 ^ _fmix32(h2 ^ d)) % n
+
+
+def build_mph(keys_blob, key_offsets) -> tuple[array, array] | None:
+    """
+    CHD (hash and displace): кошик = crc32(ключ) % кошиків; для кошика шукається зміщення d,
+    з яким _slot(crc32, adler32, d) розкладає його ключі у вільні різні слоти. Кошик з одного
+    ключа одразу бере вільний слот (зміщення -slot-1). Повертає (зміщення на кошик,
+    слот -> номер ключа) або None, якщо для якогось кошика зміщення не знайшлось.
+    """
+    n = len(key_offsets) - 1
+    nb = max(1, n // MPH_BUCKET_SIZE)
+    view = memoryview(keys_blob)
+    hashes = [_hashes(view[key_offsets[i]:key_offsets[i + 1]]) for i in range(n)]
+    buckets = [[] for _ in range(nb)]
+    for i, (h1, _h2) in enumerate(hashes):
+        buckets[h1 % nb].append(i)
+
+    displacements = array("i", [0]) * nb
+    slots = array("I", [0xFFFFFFFF]) * n
+    taken = bytearray(n)
+    free = 0  # перший можливо вільний слот для одиночних кошиків
+    for b in sorted(range(nb), key=lambda b: len(buckets[b]), reverse=True):
+        members = buckets[b]
+        if not members:
+            continue
+        if len(members) == 1:
+            while taken[free]:
+                free += 1
+            taken[free] = 1
+            slots[free] = members[0]
+            displacements[b] = -free - 1
+            continue
+        member_hashes = [hashes[i] for i in members]
+        for d in range(1, MPH_MAX_TRIES):
+            positions = [_slot(h1, h2, d, n) for h1, h2 in member_hashes]
+            if len(set(positions)) == len(positions) and not any(taken[p] for p in positions):
+                break
+        else:
+            return None
+        for p, i in zip(positions, members):
+            taken[p] = 1
+            slots[p] = i
+        displacements[b] = d
+    return displacements, slots
+
+
+def _le(arr: array) -> bytes:
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def write_snapshot(fh, groups, dictionaries: dict, created_at: str, mph: bool = True) -> dict:
+    """
+    Пише знімок у відкритий файл (wb). groups — відсортовані побайтово (ключ, [(word_id,
+    dictionary_id, слово, [тлумачення])]); dictionaries — {id: (назва, тип)}.
+    """
+    fh.write(b"\0" * HEADER.size)
+    data_off = HEADER.size
+    keys_blob = bytearray()
+    key_offsets = array("Q")
+    data_offsets = array("Q")
+    pos = data_off
+    n_words = n_meanings = 0
+    prev = None
+    for key, words in groups:
+        kb = key.encode("utf-8")
+        if prev is not None and kb <= prev:
+            raise ValueError(f"ключі мають бути відсортовані і унікальні: {key!r}")
+        prev = kb
+        key_offsets.append(len(keys_blob))
+        keys_blob += kb
+        data_offsets.append(pos - data_off)
+        record = encode_record(words)
+        fh.write(record)
+        pos += len(record)
+        n_words += len(words)
+        n_meanings += sum(len(w[3]) for w in words)
+    n_keys = len(key_offsets)
+    key_offsets.append(len(keys_blob))
+    data_offsets.append(pos - data_off)
+
+    keys_off = pos
+    fh.write(keys_blob)
+    index_off = keys_off + len(keys_blob)
+    index = array("Q", [0]) * (2 * (n_keys + 1))
+    index[0::2] = key_offsets
+    index[1::2] = data_offsets
+    fh.write(_le(index))
+    pos = index_off + len(index) * 8
+
+    flags = 0
+    mph_off, n_buckets = pos, 0
+    table = build_mph(keys_blob, key_offsets) if mph and n_keys else None
+    if table is not None:
+        displacements, slots = table
+        flags |= FLAG_MPH
+        n_buckets = len(displacements)
+        fh.write(_le(displacements))
+        fh.write(_le(slots))
+        pos += n_buckets * 4 + n_keys * 4
+
+    meta = json.dumps(
+        {"created_at": created_at, "dictionaries": {str(k): list(v) for k, v in dictionaries.items()}},
+        ensure_ascii=False,
+    ).encode("utf-8")
+    fh.write(meta)
+
+    fh.seek(0)
+    fh.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, n_keys, n_words, n_meanings,
+                         data_off, keys_off, index_off, mph_off, n_buckets, pos, len(meta)))
+    return {"keys": n_keys, "words": n_words, "meanings": n_meanings, "bytes": pos + len(meta),
+            "mph": bool(flags & FLAG_MPH)}
+
+
+# ЧИТАННЯ
+class Snapshot:
+    """
+    Знімок, відображений у пам'ять. Точний пошук — через mph (або бінарний пошук),
+    пошук за початком — бінарний пошук по відсортованих ключах. Записи читаються прямо
+    з mmap; копіюються лише короткі ключі в бінарному пошуку і рядки результату при декодуванні.
+    """
+
+    def __init__(self, path):
+        self._fh = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # порожній файл
+            self._fh.close()
+            raise SnapshotError(f"порожній файл: {path}") from None
+        self._buf = memoryview(self._mm)
+        if len(self._mm) < HEADER.size:
+            self.close()
+            raise SnapshotError(f"не знімок SLOVNYK: {path}")
+        (magic, version, flags, self.keys, self.words, self.meanings, self._data_off, self._keys_off,
+         self._index_off, mph_off, n_buckets, meta_off, meta_len) = HEADER.unpack_from(self._mm, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise SnapshotError(f"не знімок SLOVNYK: {path}")
+        if version != SNAPSHOT_VERSION:
+            self.close()
+            raise SnapshotError(f"непідтримувана версія знімка: {version} (очікується {SNAPSHOT_VERSION})")
+        self._index = self._buf[self._index_off:self._index_off + (self.keys + 1) * INDEX_ENTRY.size].cast("Q")
+        self._n_buckets = n_buckets if flags & FLAG_MPH else 0
+        if self._n_buckets:
+            self._displacements = self._buf[mph_off:mph_off + n_buckets * 4].cast("i")
+            slots_off = mph_off + n_buckets * 4
+            self._slots = self._buf[slots_off:slots_off + self.keys * 4].cast("I")
+        meta = json.loads(str(self._buf[meta_off:meta_off + meta_len], "utf-8"))
+        self.created_at = meta.get("created_at")
+        self.dictionaries = {int(k): tuple(v) for k, v in meta.get("dictionaries", {}).items()}
+        if sys.byteorder != "little":
+            # cast() читає в порядку байтів машини; на big-endian — копія з перестановкою
+            self._index = _swapped(self._index)
+            if self._n_buckets:
+                self._displacements = _swapped(self._displacements)
+                self._slots = _swapped(self._slots)
+
+    def __len__(self):
+        return self.keys
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for name in ("_index", "_displacements", "_slots", "_buf"):
+            view = self.__dict__.pop(name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._fh.close()
+
+    def _key(self, i: int) -> memoryview:
+        start = self._keys_off + self._index[2 * i]
+        return self._buf[start:self._keys_off + self._index[2 * i + 2]]
+
+    def _find(self, kb: bytes) -> int | None:
+        """ Номер ключа kb або None."""
+        if not self.keys:
+            return None
+        if self._n_buckets:
+            h1, h2 = _hashes(kb)
+            d = self._displacements[h1 % self._n_buckets]
+            slot = -d - 1 if d < 0 else _slot(h1, h2, d, self.keys)
+            i = self._slots[slot]
+            return i if self._key(i) == kb else None
+        i = self._lower_bound(kb)
+        return i if i < self.keys and self._key(i) == kb else None
+
+    def _lower_bound(self, kb: bytes) -> int:
+        lo, hi = 0, self.keys
+        mm, keys_off, index = self._mm, self._keys_off, self._index
+        while lo < hi:
+            mid = (lo + hi) // 2
+            # mm[a:b] — короткий bytes для порівняння (memoryview не підтримує <)
+            if mm[keys_off + index[2 * mid]:keys_off + index[2 * mid + 2]] < kb:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _words(self, i: int, dictionary_id: int | None = None) -> list[dict]:
+        buf = self._buf
+        pos = self._data_off + self._index[2 * i + 1]
+        (count,) = _U32.unpack_from(buf, pos)
+        pos += 4
+        out = []
+        for _ in range(count):
+            wid, did = _U32x2.unpack_from(buf, pos)
+            (wlen,) = _U32.unpack_from(buf, pos + 8)
+            pos += 12
+            word_pos = pos
+            pos += wlen
+            (mcount,) = _U32.unpack_from(buf, pos)
+            pos += 4
+            meaning_spans = []
+            for _ in range(mcount):
+                (mlen,) = _U32.unpack_from(buf, pos)
+                meaning_spans.append((pos + 4, mlen))
+                pos += 4 + mlen
+            if dictionary_id is not None and did != dictionary_id:
+                continue
+            nazva, typ = self.dictionaries.get(did, ("", ""))
+            out.append({
+                "word_id": wid,
+                "word": str(buf[word_pos:word_pos + wlen], "utf-8"),
+                "dictionary": nazva,
+                "typ": typ,
+                "meanings": [str(buf[p:p + n], "utf-8") for p, n in meaning_spans],
+            })
+        return out
+
+    def lookup(self, word: str, dictionary_id: int | None = None) -> list[dict]:
+        """ Точний пошук (без урахування регістру): слова з тлумаченнями, як services.search_results."""
+        i = self._find(normalize_key(word).encode("utf-8"))
+        return [] if i is None else self._words(i, dictionary_id)
+
+    def prefix(self, prefix: str, limit: int = 10, dictionary_id: int | None = None) -> list[dict]:
+        """ Слова, ключ яких починається з prefix (побайтовий порядок ключів), не більше limit."""
+        kb = normalize_key(prefix).encode("utf-8")
+        out = []
+        i = self._lower_bound(kb)
+        while i < self.keys and len(out) < limit and self._key(i)[:len(kb)] == kb:
+            out.extend(self._words(i, dictionary_id)[:limit - len(out)])
+            i += 1
+        return out
+
+
+def _swapped(view: memoryview) -> array:
+    arr = array(view.format, view)
+    arr.byteswap()
+    return arr
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m slovnyk.snapshot", description="Пошук у знімку бази (JSON у stdout).")
+    parser.add_argument("path")
+    parser.add_argument("query")
+    parser.add_argument("--prefix", action="store_true", help="слова за початком")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--dictionary", type=int, help="ID словника")
+    args = parser.parse_args(argv)
+    try:
+        with Snapshot(args.path) as snap:
+            if args.prefix:
+                results = snap.prefix(args.query, args.limit, args.dictionary)
+            else:
+                results = snap.lookup(args.query, args.dictionary)
+    except (OSError, SnapshotError) as e:
+        print(json.dumps({"error": str(e)}, ensure_ascii=False), file=sys.stderr)
+        return 3
+    print(json.dumps({"query": args.query, "results": results}, ensure_ascii=False))
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
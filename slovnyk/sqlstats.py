@@ -0,0 +1,218 @@
+"""
+Статистика SQL-запитів за діями меню (вмикається SLOVNYK_SQL_STATS=1, див. config.py).
+Події engine рахують запити і їх час, курсор-лічильник — отримані рядки; повільні запити
+з EXPLAIN QUERY PLAN пишуться в журнал. Підсумок друкується в stderr при виході.
+Найчастіший запит дії показує N+1: сотні однакових SELECT на одну дію.
+"""
+from __future__ import annotations
+
+import atexit
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import event
+
+from .config import SLOW_QUERY_LOG, SLOW_QUERY_MS, SQL_STATS
+
+# запити поза будь-якою дією (старт, міграції)
+NO_ACTION = "(поза меню)"
+# для EXPLAIN QUERY PLAN; PRAGMA, BEGIN, DDL пропускаються
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+_lock = threading.Lock()
+_local = threading.local()
+_actions = {}  # назва -> ActionStats
+_installed = False
+
+
+class ActionStats:
+    def __init__(self):
+        self.calls = 0
+        self.queries = 0
+        self.rows = 0
+        self.durations = []  # секунди кожного запиту
+        self.statements = {}  # текст SQL -> скільки разів
+
+    def summary(self) -> dict:
+        ms = sorted(d * 1000 for d in self.durations)
+        top_sql, top_count = max(self.statements.items(), key=lambda kv: kv[1], default=("", 0))
+        return {
+            "calls": self.calls,
+            "queries": self.queries,
+            "rows": self.rows,
+            "total_ms": round(sum(ms), 3),
+            "p50_ms": round(_percentile(ms, 0.50), 3),
+            "p95_ms": round(_percentile(ms, 0.95), 3),
+            "max_ms": round(ms[-1], 3) if ms else 0.0,
+            "top_statement": " ".join(top_sql.split())[:200],
+            "top_statement_count": top_count,
+        }
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))]
+
+
+def _current_action() -> str:
+    stack = getattr(_local, "stack", None)
+    return stack[-1] if stack else NO_ACTION
+
+
+def _stats(name: str) -> ActionStats:
+    st = _actions.get(name)
+    if st is None:
+        st = _actions[name] = ActionStats()
+    return st
+
+
+@contextmanager
+def action(name: str):
+    """ Усі запити всередині блоку (у цьому потоці) рахуються на дію name; вкладена дія має пріоритет."""
+    if not SQL_STATS:
+        yield
+        return
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(name)
+    with _lock:
+        _stats(name).calls += 1
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+class CountingCursor(sqlite3.Cursor):
+    """ Курсор, що додає кількість отриманих рядків до поточної дії."""
+
+    def _count(self, n: int):
+        if n:
+            with _lock:
+                _stats(_current_action()).rows += n
+
+    def fetchone(self):
+        row = super().fetchone()
+        self._count(row is not None)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self._count(len(rows))
+        return rows
+
+
+class CountingConnection(sqlite3.Connection):
+    """ factory для sqlite3.connect: курсори за замовчуванням — CountingCursor."""
+
+    def cursor(self, factory=CountingCursor):
+        return super().cursor(factory)
+
+
+def connect_args() -> dict:
+    """ Аргументи create_engine(connect_args=...) для підрахунку рядків; порожні, якщо статистика вимкнена."""
+    return {"factory": CountingConnection} if SQL_STATS else {}
+
+
+def install(engine):
+    """ Підключає лічильники до engine (лише за SQL_STATS); підсумок — при виході процесу."""
+    global _installed
+    if not SQL_STATS:
+        return
+    event.listen(engine, "before_cursor_execute", _before_execute)
+    event.listen(engine, "after_cursor_execute", _after_execute)
+    if not _installed:
+        _installed = True
+        atexit.register(print_summary)
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sqlstats_started", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["sqlstats_started"].pop()
+    name = _current_action()
+    with _lock:
+        st = _stats(name)
+        st.queries += 1
+        st.durations.append(seconds)
+        st.statements[statement] = st.statements.get(statement, 0) + 1
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE", "REPLACE")) and cursor.rowcount > 0:
+            st.rows += cursor.rowcount
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        _log_slow(cursor, name, statement, parameters, executemany, seconds)
+
+
+def _explain(dbapi_conn, statement: str, parameters) -> list[str]:
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return []
+    # окремий звичайний курсор: рядки плану не рахуються як рядки дії
+    cur = sqlite3.Cursor(dbapi_conn)
+    try:
+        cur.execute("EXPLAIN QUERY PLAN " + statement, parameters or ())
+        return [row[-1] for row in cur.fetchall()]
+    except sqlite3.Error as e:
+        return [f"(план недоступний: {e})"]
+    finally:
+        cur.close()
+
+
+def _log_slow(cursor, name: str, statement: str, parameters, executemany: bool, seconds: float):
+    params = parameters[0] if executemany and parameters else parameters
+    plan = _explain(cursor.connection, statement, params)
+    lines = [
+        f"[{datetime.now().isoformat(timespec='seconds')}] {seconds * 1000:.1f} мс — {name}"
+        + (f" (executemany × {len(parameters)})" if executemany else ""),
+        statement.strip(),
+        f"параметри: {params!r}"[:500],
+        *(f"  план: {p}" for p in plan),
+        "",
+    ]
+    try:
+        SLOW_QUERY_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with _lock, SLOW_QUERY_LOG.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+    except OSError:
+        pass
+
+
+def snapshot() -> dict:
+    """ Назва дії -> підсумок (запити, час, перцентилі, рядки, найчастіший запит)."""
+    with _lock:
+        return {name: st.summary() for name, st in _actions.items()}
+
+
+def reset():
+    with _lock:
+        _actions.clear()
+
+
+def print_summary(out=None):
+    """ Таблиця дій за сумарним часом запитів (викликається при виході)."""
+    out = out or sys.stderr
+    data = snapshot()
+    if not data:
+        return
+    print("\n=== SQL: статистика за діями ===", file=out)
+    print(f"{'дія':<60} {'викл.':>5} {'запити':>7} {'рядки':>8} {'всього мс':>10} {'p50':>7} {'p95':>7}", file=out)
+    for name, s in sorted(data.items(), key=lambda kv: kv[1]["total_ms"], reverse=True):
+        print(
+            f"{name[:60]:<60} {s['calls']:>5} {s['queries']:>7} {s['rows']:>8} {s['total_ms']:>10.1f} "
+            f"{s['p50_ms']:>7.2f} {s['p95_ms']:>7.2f}",
+            file=out,
+        )
+        if s["top_statement_count"] > 1:
+            print(f"    ×{s['top_statement_count']}: {s['top_statement']}", file=out)
+    print(f"Повільні запити (≥ {SLOW_QUERY_MS:g} мс): {SLOW_QUERY_LOG}", file=out)
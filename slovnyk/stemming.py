@@ -0,0 +1,217 @@
+"""
+Основи слів для пошуку з урахуванням словозміни: «книгою» і «книга» -> «книг», «books» і «book» -> «book».
+
+Стемери — чистий Python, без словників і мережі:
+- українська — суфіксний стемер за схемою Snowball (зона RV після першої голосної,
+  закінчення дієприслівників, зворотні, прикметникові, дієслівні й іменникові);
+- англійська — алгоритм Портера.
+Мова обирається для кожного токена за абеткою (кирилиця — uk, латиниця — en).
+Свій стемер: register_stemmer("uk", fn); після заміни збережені основи треба перерахувати
+(меню «Перебудувати пошуковий індекс» або db.rebuild_stems).
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+from .textkey import normalize_key
+
+# токени ключа: літери (з апострофом усередині) або числа
+_TOKEN = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*|\d+")
+
+
+# УКРАЇНСЬКА
+_UK_VOWEL = re.compile(r"[аеєиіїоуюя]")
+_UK_PERFECTIVE_GERUND = re.compile(r"(ив|ивши|ившись|(?<=[ая])(в|вши|вшись))$")
+_UK_REFLEXIVE = re.compile(r"(с[яьи])$")
+_UK_ADJECTIVE = re.compile(
+    r"(ими|ій|ий|а|е|ова|ове|ів|є|їй|єє|еє|я|ім|ем|им|их|іх|ою|йми|іми|у|ю|ого|ому|ої)$"
+)
+_UK_PARTICIPLE = re.compile(r"(ий|ого|ому|им|ім|а|ій|у|ою|і|их|йми)$")
+_UK_VERB = re.compile(r"(сь|ся|ив|ать|ять|у|ю|ав|али|учи|ячи|вши|ши|е|ме|ати|яти|є)$")
+_UK_NOUN = re.compile(
+    r"(а|ев|ов|е|ями|ами|еи|и|ей|ой|ий|й|иям|ям|ием|ем|ам|ом|о|у|ах|иях|ях|ь|ию|ью|ю|ия|ья|я|і|ові|ї|ею|єю|ою|є|еві|єм|ів|їв)$"
+)
+_UK_DERIVATIONAL = re.compile(r"[^аеєиіїоуюя][аеєиіїоуюя]+[^аеєиіїоуюя]+[аеєиіїоуюя].*ость?$")
+
+
+def _strip(pattern: re.Pattern, rv: str) -> tuple[str, bool]:
+    new = pattern.sub("", rv, count=1)
+    return new, new != rv
+
+
+def stem_uk(word: str) -> str:
+    """ Основа українського слова (word — уже в нижньому регістрі)."""
+    word = word.replace("'", "")
+    m = _UK_VOWEL.search(word)
+    if m is None:
+        return word
+    start, rv = word[:m.end()], word[m.end():]
+
+    rv, done = _strip(_UK_PERFECTIVE_GERUND, rv)
+    if not done:
+        rv, _ = _strip(_UK_REFLEXIVE, rv)
+        rv, done = _strip(_UK_ADJECTIVE, rv)
+        if done:
+            rv, _ = _strip(_UK_PARTICIPLE, rv)
+        else:
+            rv, done = _strip(_UK_VERB, rv)
+            if not done:
+                rv, _ = _strip(_UK_NOUN, rv)
+    if rv.endswith("и"):
+        rv = rv[:-1]
+    if rv.endswith("ость") and _UK_DERIVATIONAL.search(rv):
+        rv = rv[:-4]
+    if rv.endswith("ь"):
+        rv = rv[:-1]
+        if rv.endswith("нн"):
+            rv = rv[:-1]
+    return start + rv
+
+
+# АНГЛІЙСЬКА (Портер)
+def _cv(w: str) -> str:
+    """ Рядок c/v (приголосна/голосна) для кожної літери; y — голосна після приголосної."""
+    out = []
+    for i, ch in enumerate(w):
+        if ch in "aeiou" or (ch == "y" and i > 0 and out[-1] == "c"):
+            out.append("v")
+        else:
+            out.append("c")
+    return "".join(out)
+
+
+def _measure(stem: str) -> int:
+    """ m у формі [C](VC){m}[V]"""
+    return _cv(stem).count("vc")
+
+
+def _has_vowel(stem: str) -> bool:
+    return "v" in _cv(stem)
+
+
+def _double_cons(w: str) -> bool:
+    return len(w) >= 2 and w[-1] == w[-2] and _cv(w)[-1] == "c"
+
+
+def _cvc(w: str) -> bool:
+    return len(w) >= 3 and _cv(w).endswith("cvc") and w[-1] not in "wxy"
+
+
+_EN_STEP2 = (
+    ("ational", "ate"), ("tional", "tion"), ("enci", "ence"), ("anci", "ance"), ("izer", "ize"),
+    ("bli", "ble"), ("alli", "al"), ("entli", "ent"), ("eli", "e"), ("ousli", "ous"),
+    ("ization", "ize"), ("ation", "ate"), ("ator", "ate"), ("alism", "al"), ("iveness", "ive"),
+    ("fulness", "ful"), ("ousness", "ous"), ("aliti", "al"), ("iviti", "ive"), ("biliti", "ble"),
+    ("logi", "log"),
+)
+_EN_STEP3 = (
+    ("icate", "ic"), ("ative", ""), ("alize", "al"), ("iciti", "ic"), ("ical", "ic"), ("ful", ""), ("ness", ""),
+)
+_EN_STEP4 = (
+    "al", "ance", "ence", "er", "ic", "able", "ible", "ant", "ement", "ment", "ent",
+    "ion", "ou", "ism", "ate", "iti", "ous", "ive", "ize",
+)
+
+
+# найдовші суфікси перевіряються першими
+_EN_STEP2 = tuple(sorted(_EN_STEP2, key=lambda r: -len(r[0])))
+_EN_STEP3 = tuple(sorted(_EN_STEP3, key=lambda r: -len(r[0])))
+_EN_STEP4 = tuple(sorted(_EN_STEP4, key=len, reverse=True))
+
+
+def _replace_suffix(w: str, rules, min_measure: int) -> str:
+    """ Перший (найдовший) суфікс зі списку; заміна — лише якщо m(основи) > min_measure."""
+    for suffix, repl in rules:
+        if w.endswith(suffix):
+            stem = w[:-len(suffix)]
+            return stem + repl if _measure(stem) > min_measure else w
+    return w
+
+
+def stem_en(word: str) -> str:
+    """ Основа англійського слова за алгоритмом Портера (word — уже в нижньому регістрі)."""
+    w = word.replace("'", "")
+    if len(w) <= 2:
+        return w
+
+    # 1a: множина
+    if w.endswith("sses"):
+        w = w[:-2]
+    elif w.endswith("ies"):
+        w = w[:-2]
+    elif w.endswith("s") and not w.endswith("ss"):
+        w = w[:-1]
+
+    # 1b: -ed, -ing
+    if w.endswith("eed"):
+        if _measure(w[:-3]) > 0:
+            w = w[:-1]
+    else:
+        for suffix in ("ed", "ing"):
+            if w.endswith(suffix) and _has_vowel(w[:-len(suffix)]):
+                w = w[:-len(suffix)]
+                if w.endswith(("at", "bl", "iz")):
+                    w += "e"
+                elif _double_cons(w) and w[-1] not in "lsz":
+                    w = w[:-1]
+                elif _measure(w) == 1 and _cvc(w):
+                    w += "e"
+                break
+
+    # 1c: y -> i
+    if w.endswith("y") and _has_vowel(w[:-1]):
+        w = w[:-1] + "i"
+
+    w = _replace_suffix(w, _EN_STEP2, 0)
+    w = _replace_suffix(w, _EN_STEP3, 0)
+
+    # 4: суфікси при m > 1 (-ion лише після s або t)
+    for suffix in _EN_STEP4:
+        if w.endswith(suffix):
+            stem = w[:-len(suffix)]
+            if _measure(stem) > 1 and (suffix != "ion" or stem.endswith(("s", "t"))):
+                w = stem
+            break
+
+    # 5: кінцеве -e і подвоєне -ll
+    if w.endswith("e"):
+        stem = w[:-1]
+        m = _measure(stem)
+        if m > 1 or (m == 1 and not _cvc(stem)):
+            w = stem
+    if w.endswith("ll") and _measure(w) > 1:
+        w = w[:-1]
+    return w
+
+
+# мова -> стемер токена
+STEMMERS = {"uk": stem_uk, "en": stem_en}
+
+
+def register_stemmer(language: str, fn):
+    """ Замінює або додає стемер мови: fn(токен у нижньому регістрі) -> основа."""
+    STEMMERS[language] = fn
+    stem_token.cache_clear()
+
+
+def token_language(token: str) -> str | None:
+    """ uk — є кирилиця, en — латиниця, None — інше (числа, інші абетки)."""
+    if any("Ѐ" <= ch <= "ӿ" for ch in token):
+        return "uk"
+    plain = token.replace("'", "")
+    if plain.isascii() and plain.isalpha():
+        return "en"
+    return None
+
+
+# словоформи в словниках і тлумаченнях часто повторюються
+@lru_cache(maxsize=100_000)
+def stem_token(token: str) -> str:
+    stemmer = STEMMERS.get(token_language(token))
+    return stemmer(token) if stemmer else token
+
+
+def stem_key(text: str | None) -> str:
+    """ Нормалізований текст (textkey.normalize_key) -> основи токенів через пробіл."""
+    return " ".join(stem_token(t) for t in _TOKEN.findall(normalize_key(text)))
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import unicodedata
+
+# Варіанти апострофа, які користувачі і файли імпорту пишуть по-різному.
+APOSTROPHES = "’ʼ‘`´′＇"
+_APOSTROPHE_MAP = str.maketrans({ch: "'" for ch in APOSTROPHES})
+
+
+def normalize_key(text: str | None) -> str:
+    """
+    Ключ для порівняння без урахування регістру: NFC + casefold + єдиний апостроф (').
+    casefold, на відміну від SQLite lower(), працює і для кирилиці.
+    """
+    if not text:
+        return ""
+    s = unicodedata.normalize("NFC", text.strip())
+    s = s.translate(_APOSTROPHE_MAP).casefold()
+    return unicodedata.normalize("NFC", s)
+
+
+def trigrams(key: str) -> list[str]:
+    """ Унікальні триграми ключа в порядку появи ("котик" -> кот, оти, тик)."""
+    seen = dict.fromkeys(key[i:i + 3] for i in range(len(key) - 2))
+    return list(seen)
+
+
+def edit_distance(a: str, b: str, max_distance: int | None = None) -> int:
+    """
+    Відстань редагування: вставка, видалення, заміна і перестановка сусідніх символів ("котки" -> "котик" = 1).
+    Якщо задано max_distance і відстань більша — повертає max_distance + 1 (рахунок обривається раніше).
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    limit = max_distance if max_distance is not None else len(a)
+    if len(a) - len(b) > limit:
+        return limit + 1
+    before = None
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            d = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if before is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                d = min(d, before[j - 2] + 1)
+            cur.append(d)
+        if min(cur) > limit:
+            return limit + 1
+        before, prev = prev, cur
+    return min(prev[-1], limit + 1)
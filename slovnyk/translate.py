@@ -0,0 +1,152 @@
+"""
+Пакетний переклад тексту: токенізація, унікальні ключі слів і пошук усіх одним запитом
+(IN для невеликих текстів, тимчасова таблиця — для великих).
+"""
+from __future__ import annotations
+
+import re
+import time
+from pathlib import Path
+
+from sqlalchemy import select, text
+
+from .models import Slovnyk, Slovo, Tlumachennia
+from .textkey import APOSTROPHES, normalize_key
+from .ui import input_non_empty, get_dictionaries, pick_id
+
+# слово — літери/цифри/_, всередині можуть бути апостроф або дефіс (м'ясо, будь-який, covid-19)
+_JOINERS = re.escape("'" + APOSTROPHES + "-")
+TOKEN_RE = re.compile(rf"\w+(?:[{_JOINERS}]\w+)*")
+_LETTER_RE = re.compile(r"[^\W\d_]")
+
+# більше ключів — через тимчасову таблицю замість IN (ліміт параметрів SQLite — 999)
+IN_LIMIT = 900
+
+
+def tokenize(source: str) -> list[str]:
+    """ Слова тексту в порядку появи; числа без літер пропускаються."""
+    return [t for t in TOKEN_RE.findall(source) if _LETTER_RE.search(t)]
+
+
+def _fetch_in(session, keys: list[str], dictionary_id: int | None):
+    stmt = (
+        select(Slovo.word_key, Slovo.id, Slovo.word, Slovnyk.nazva, Slovnyk.typ, Tlumachennia.text)
+        .join(Slovnyk, Slovnyk.id == Slovo.dictionary_id)
+        .outerjoin(Tlumachennia, Tlumachennia.word_id == Slovo.id)
+        .where(Slovo.word_key.in_(keys))
+        .order_by(Slovo.word_key, Slovo.id, Tlumachennia.id)
+    )
+    if dictionary_id is not None:
+        stmt = stmt.where(Slovo.dictionary_id == dictionary_id)
+    return session.execute(stmt).all()
+
+
+def _fetch_temp_table(session, keys: list[str], dictionary_id: int | None):
+    session.execute(text("CREATE TEMP TABLE IF NOT EXISTS batch_keys (key TEXT PRIMARY KEY)"))
+    session.execute(text("DELETE FROM batch_keys"))
+    session.execute(text("INSERT INTO batch_keys (key) VALUES (:k)"), [{"k": k} for k in keys])
+    where = "AND w.dictionary_id = :did" if dictionary_id is not None else ""
+    try:
+        return session.execute(text(f"""
+            SELECT w.word_key, w.id, w.word, d.nazva, d.typ, m.text
+            FROM batch_keys k
+            JOIN words w ON w.word_key = k.key {where}
+            JOIN dictionaries d ON d.id = w.dictionary_id
+            LEFT JOIN meanings m ON m.word_id = w.id
+            ORDER BY w.word_key, w.id, m.id
+        """), {"did": dictionary_id}).all()
+    finally:
+        session.execute(text("DELETE FROM batch_keys"))
+
+
+def translate_text(session, source: str, dictionary_id: int | None = None) -> dict:
+    """
+    Тлумачення всіх слів тексту. Токени зводяться до ключів (textkey.normalize_key),
+    кожен унікальний ключ шукається один раз; усі ключі — одним запитом.
+    Повертає {"tokens": [...], "unknown": [...], "stats": {...}} у порядку першої появи слова.
+    """
+    started = time.perf_counter()
+    tokens = tokenize(source)
+
+    entries = {}  # key -> {"token", "key", "count", "matches"}
+    for token in tokens:
+        key = normalize_key(token)
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = {"token": token, "key": key, "count": 0, "matches": []}
+        entry["count"] += 1
+
+    keys = list(entries)
+    if not keys:
+        rows = []
+    elif len(keys) <= IN_LIMIT:
+        rows = _fetch_in(session, keys, dictionary_id)
+    else:
+        rows = _fetch_temp_table(session, keys, dictionary_id)
+
+    current = None
+    for key, wid, word, nazva, typ, mtext in rows:
+        if current is None or current["word_id"] != wid:
+            current = {"word_id": wid, "word": word, "dictionary": nazva, "typ": typ, "meanings": []}
+            entries[key]["matches"].append(current)
+        if mtext is not None:
+            current["meanings"].append(mtext)
+
+    seconds = time.perf_counter() - started
+    known = [e for e in entries.values() if e["matches"]]
+    unknown = [e["token"] for e in entries.values() if not e["matches"]]
+    return {
+        "tokens": known,
+        "unknown": unknown,
+        "stats": {
+            "tokens": len(tokens),
+            "unique": len(entries),
+            "known": len(known),
+            "unknown": len(unknown),
+            "seconds": seconds,
+            "tokens_per_sec": len(tokens) / seconds if seconds > 0 else 0.0,
+        },
+    }
+
+
+def read_source(value: str) -> str:
+    """ Шлях до існуючого файлу — його вміст, інакше — сам рядок як текст."""
+    path = Path(value)
+    try:
+        is_file = path.is_file()
+    except (OSError, ValueError):
+        # довгий текст або символи, неможливі в імені файлу
+        return value
+    return path.read_text(encoding="utf-8") if is_file else value
+
+
+def translate_interactive(session):
+    """ Переклад тексту або файлу: тлумачення кожного слова і список невідомих слів."""
+    dictionaries = get_dictionaries(session)
+    if not dictionaries:
+        print("Немає жодного словника. Спочатку створіть словник або імпортуйте демо-дані.")
+        return
+    did = pick_id(dictionaries, "Словник (Enter або 0 — у всіх словниках)", ("nazva", "typ"))
+
+    value = input_non_empty("Текст або шлях до текстового файлу: ")
+    if value is None:
+        return
+    try:
+        source = read_source(value)
+    except UnicodeDecodeError:
+        print("Помилка: файл має бути у кодуванні UTF-8.")
+        return
+
+    result = translate_text(session, source, did)
+    for entry in result["tokens"]:
+        print(f"\n{entry['token']} (×{entry['count']})")
+        for m in entry["matches"]:
+            meanings = "; ".join(m["meanings"]) or "(немає тлумачень)"
+            print(f"  [{m['dictionary']}] {m['word']}: {meanings}")
+    if result["unknown"]:
+        print("\nНевідомі слова: " + ", ".join(result["unknown"]))
+    st = result["stats"]
+    print(
+        f"\nСлів у тексті: {st['tokens']}, унікальних: {st['unique']}, знайдено: {st['known']}, "
+        f"невідомих: {st['unknown']} ({st['seconds']:.3f} с, {st['tokens_per_sec']:.0f} слів/с)."
+    )
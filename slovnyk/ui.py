@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from .config import EXPORT_DIR
+from .config import EXPORT_DIR, PAGE_SIZE
 from sqlalchemy import select
 from .models import Slovnyk
+from .sqlstats import action
 
 def format_dict_type(typ_value: str) -> str:
 
@@ -118,6 +119,64 @@ def pick_id(rows, title="Оберіть", label_fields=("nazva", "word")):
         return None
     return val
 
+def pick_id_paged(fetch_page, title="Оберіть", show_row=None, page_size: int = PAGE_SIZE, pick: bool = True):
+    """
+    Посторінковий список з вибором ID. В пам'яті — лише одна сторінка.
+    fetch_page(after, prefix, limit) -> рядки після рядка after (None — з початку),
+    лише ті, що починаються з prefix (None — усі). Повертає вибраний ID або None.
+    pick=False — лише перегляд.
+    """
+    if show_row is None:
+        show_row = lambda r: f"  {r.id}) {r.word}"
+    starts = [None]  # після якого рядка починається кожна відкрита сторінка
+    prefix = None
+    while True:
+        rows = fetch_page(starts[-1], prefix, page_size + 1)
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        filter_note = f", фільтр: «{prefix}»" if prefix else ""
+        print(f"\n{title} (сторінка {len(starts)}{filter_note})")
+        if not rows:
+            print("  Дані відсутні.")
+        for r in rows:
+            print(show_row(r))
+        hints = []
+        if has_more:
+            hints.append("+ — далі")
+        if len(starts) > 1:
+            hints.append("- — назад")
+        hints.append("/текст — фільтр за початком слова")
+        if prefix:
+            hints.append("/ — скинути фільтр")
+        hints.append("0 або Enter — вихід")
+        print("  " + ", ".join(hints))
+
+        s_raw = safe_input("Введіть ID або команду: " if pick else "Команда: ")
+        if s_raw is None:
+            return None
+        cmd = s_raw.strip()
+        if cmd in ("", "0"):
+            return None
+        if cmd == "+":
+            if has_more:
+                starts.append(rows[-1])
+            else:
+                print("Це остання сторінка.")
+            continue
+        if cmd == "-":
+            if len(starts) > 1:
+                starts.pop()
+            continue
+        if cmd.startswith("/"):
+            prefix = cmd[1:].strip() or None
+            starts = [None]
+            continue
+        if pick and cmd.isdigit() and int(cmd) > 0:
+            return int(cmd)
+        print("Помилка: невірна команда." if not pick else "Помилка: введіть додатне ціле число або команду.")
+
+
 def run_menu(title: str, items: list[tuple[str, str, callable]], show_back: bool = True):
     while True:
         print(f"\n=== {title} ===")
@@ -142,9 +201,10 @@ def run_menu(title: str, items: list[tuple[str, str, callable]], show_back: bool
             print("Помилка: невірний пункт меню.")
             continue
 
-        for key, _, handler in items:
+        for key, label, handler in items:
             if key == ch:
-                handler()
+                with action(f"{title} / {label}"):
+                    handler()
                 break
 
 
@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# до імпорту slovnyk: тести ніколи не відкривають робочу базу data/dictionary_obj.db
+os.environ.setdefault("SLOVNYK_DB_PATH", str(Path(tempfile.mkdtemp(prefix="slovnyk-tests-")) / "default.db"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from slovnyk import db  # noqa: E402
+from slovnyk.cache import clear_caches  # noqa: E402
+from slovnyk.models import Slovnyk, Slovo, Tlumachennia  # noqa: E402
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """ Порожня база з усіма міграціями у тимчасовій папці тесту."""
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "test.db")
+    engine = db.make_engine()
+    monkeypatch.setattr(db, "_engine", engine)
+    db.SessionLocal.configure(bind=engine)
+    db.init_db(engine)
+    clear_caches()
+    yield engine
+    clear_caches()
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    s = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, future=True)()
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def add_dictionary(session):
+    """ add_dictionary("Назва", {"слово": ["тлумачення", ...]}) -> id словника"""
+    def add(nazva, words, typ="тлумачний"):
+        d = Slovnyk(nazva=nazva, typ=typ)
+        for word, meanings in words.items():
+            d.words.append(Slovo(word=word, meanings=[Tlumachennia(text=m) for m in meanings]))
+        session.add(d)
+        session.commit()
+        return d.id
+    return add
@@ -0,0 +1,67 @@
+import json
+
+from slovnyk import cli, db
+
+
+def test_search_exit_codes(engine, add_dictionary, capsys):
+    add_dictionary("Тест", {"кіт": ["тварина"]})
+    assert cli.main(["search", "--exact", "кіт"]) == cli.EXIT_OK
+    assert json.loads(capsys.readouterr().out)["results"]
+    assert cli.main(["search", "--exact", "пес"]) == cli.EXIT_NOT_FOUND
+
+
+def test_search_suggests_similar_words(engine, add_dictionary, capsys):
+    add_dictionary("Тест", {"котик": ["тварина"]})
+    assert cli.main(["search", "котек"]) == cli.EXIT_NOT_FOUND
+    response = json.loads(capsys.readouterr().out)
+    assert response["results"] == []
+    assert [s["word"] for s in response["suggestions"]] == ["котик"]
+
+    assert cli.main(["search", "котик"]) == cli.EXIT_OK
+    assert "suggestions" not in json.loads(capsys.readouterr().out)
+
+
+def test_database_error_is_exit_error(tmp_path, monkeypatch, capsys):
+    broken = tmp_path / "broken.db"
+    broken.write_bytes(b"not a sqlite database" * 100)
+    monkeypatch.setattr(db, "DB_PATH", broken)
+    monkeypatch.setattr(db, "_engine", None)
+
+    assert cli.main(["stats"]) == cli.EXIT_ERROR
+    err = capsys.readouterr().err
+    assert "DatabaseError" in json.loads(err)["error"]
+
+
+def test_serve_rejects_non_loopback_host(engine, monkeypatch, capsys):
+    from slovnyk import server
+
+    started = []
+    monkeypatch.setattr(server, "run_server", lambda *args: started.append(args))
+    assert cli.main(["serve", "--host", "0.0.0.0"]) == cli.EXIT_USAGE
+    assert "--allow-remote" in json.loads(capsys.readouterr().err)["error"]
+    assert not started
+
+    assert cli.main(["serve", "--host", "::1"]) == cli.EXIT_OK
+    assert cli.main(["serve", "--host", "0.0.0.0", "--allow-remote"]) == cli.EXIT_OK
+    assert [args[0] for args in started] == ["::1", "0.0.0.0"]
+
+
+def test_import_directory_uses_bulk_profile(engine, tmp_path, monkeypatch, capsys):
+    from sqlalchemy import text
+
+    from slovnyk import io_json
+
+    for name in ("a", "b"):
+        data = {"nazva": name, "typ": "t", "slova": [{"slovo": f"{name}-слово", "tlumachennia": ["x"]}]}
+        (tmp_path / f"{name}.json").write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    synchronous = []
+    original = io_json.import_directory
+
+    def import_directory(session, path):
+        synchronous.append(session.execute(text("PRAGMA synchronous")).scalar())
+        return original(session, path)
+
+    monkeypatch.setattr(io_json, "import_directory", import_directory)
+    assert cli.main(["import", str(tmp_path)]) == cli.EXIT_OK
+    assert synchronous == [0]  # bulk-load: synchronous=OFF
+    assert len(json.loads(capsys.readouterr().out)["files"]) == 2
@@ -0,0 +1,44 @@
+from sqlalchemy import delete, text, update
+
+from slovnyk.db import counter_drift
+from slovnyk.models import Slovo, Tlumachennia
+
+
+def _counts(session):
+    return {
+        "dictionaries": session.execute(text(
+            "SELECT d.words_count, (SELECT COUNT(*) FROM words w WHERE w.dictionary_id = d.id) FROM dictionaries d"
+        )).all(),
+        "words": session.execute(text(
+            "SELECT w.meanings_count, (SELECT COUNT(*) FROM meanings m WHERE m.word_id = w.id) FROM words w"
+        )).all(),
+    }
+
+
+def _assert_counters_match(session):
+    for rows in _counts(session).values():
+        assert all(counter == actual for counter, actual in rows)
+    assert counter_drift(session) == {"dictionaries": 0, "words": 0}
+
+
+def test_counters_follow_insert_delete_and_move(session, add_dictionary):
+    first = add_dictionary("Перший", {"кіт": ["тварина", "звір"], "пес": ["собака"]})
+    second = add_dictionary("Другий", {"дім": ["будинок"]})
+    _assert_counters_match(session)
+
+    # переміщення слова і тлумачення між батьками
+    cat = session.execute(text("SELECT id FROM words WHERE word = 'кіт'")).scalar_one()
+    dog = session.execute(text("SELECT id FROM words WHERE word = 'пес'")).scalar_one()
+    session.execute(update(Slovo).where(Slovo.id == cat).values(dictionary_id=second))
+    session.execute(update(Tlumachennia).where(Tlumachennia.word_id == cat, Tlumachennia.text == "звір")
+                    .values(word_id=dog))
+    session.commit()
+    _assert_counters_match(session)
+    assert session.execute(text("SELECT words_count FROM dictionaries WHERE id = :id"), {"id": first}).scalar() == 1
+
+    # видалення тлумачення і слова (тлумачення слова — каскадом)
+    session.execute(delete(Tlumachennia).where(Tlumachennia.text == "собака"))
+    session.execute(delete(Slovo).where(Slovo.id == cat))
+    session.commit()
+    _assert_counters_match(session)
+    assert session.execute(text("SELECT words_count FROM dictionaries WHERE id = :id"), {"id": second}).scalar() == 1
@@ -0,0 +1,26 @@
+from sqlalchemy import func, select, text
+
+from slovnyk.db import counter_drift
+from slovnyk.models import Slovnyk, Slovo, Tlumachennia
+from slovnyk.services import delete_dictionary
+
+
+def test_delete_dictionary_in_chunks(session, add_dictionary):
+    did = add_dictionary("Видалити", {f"слово{i}": [f"тлумачення {i}", "спільне"] for i in range(5)})
+    keep = add_dictionary("Лишити", {"кіт": ["тварина"]})
+    calls = []
+
+    assert delete_dictionary(session, did, chunk_size=2, progress=lambda done, total: calls.append((done, total)))
+    assert calls == [(2, 5), (4, 5), (5, 5)]
+
+    assert session.scalars(select(Slovnyk.id)).all() == [keep]
+    assert session.scalar(select(func.count()).select_from(Slovo)) == 1
+    # тлумачення видалених слів — каскадом бази
+    assert session.scalar(select(func.count()).select_from(Tlumachennia)) == 1
+    assert counter_drift(session) == {"dictionaries": 0, "words": 0}
+    # у журналі змін — лише видалення словника, без окремих слів
+    assert session.execute(text("SELECT entity, entity_id FROM change_log WHERE op = 'D'")).all() == [
+        ("dictionary", did),
+    ]
+
+    assert not delete_dictionary(session, did)
@@ -0,0 +1,124 @@
+import json
+
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.orm import sessionmaker
+
+from slovnyk import db
+from slovnyk.delta import export_delta_to_file
+from slovnyk.io_json import export_dictionaries_to_file, export_split_to_dir, import_file
+from slovnyk.models import Slovnyk, Slovo, Tlumachennia
+from slovnyk.services import add_word_meanings, delete_dictionary, delete_word
+
+
+@pytest.fixture
+def target(engine, tmp_path, monkeypatch):
+    """ Друга база — копія, яку наздоганяють дельтами."""
+    source_path = db.DB_PATH
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "target.db")
+    target_engine = db.make_engine()
+    # процеси експорту по словниках відкривають базу за DB_PATH — це має бути вихідна база
+    monkeypatch.setattr(db, "DB_PATH", source_path)
+    db.init_db(target_engine)
+    s = sessionmaker(bind=target_engine, autoflush=False, expire_on_commit=False, future=True)()
+    yield s
+    s.close()
+    target_engine.dispose()
+
+
+def _dump(session):
+    rows = session.execute(
+        select(Slovnyk.nazva, Slovnyk.typ, Slovo.word, Tlumachennia.text)
+        .join(Slovo, Slovo.dictionary_id == Slovnyk.id)
+        .outerjoin(Tlumachennia, Tlumachennia.word_id == Slovo.id)
+    ).all()
+    return sorted(tuple(r) for r in rows)
+
+
+def test_delta_round_trip(session, target, add_dictionary, tmp_path):
+    en = add_dictionary("Англійська", {"cat": ["кіт"], "dog": ["пес"], "owl": ["сова"]}, typ="en-uk")
+    old = add_dictionary("Старий", {"x": ["ікс"]})
+    import_file(target, export_dictionaries_to_file(session, tmp_path / "full.json"))
+    assert _dump(target) == _dump(session)
+
+    add_word_meanings(session, en, "cat", ["кішка"])
+    add_word_meanings(session, en, "fox", ["лис"])
+    delete_word(session, session.execute(select(Slovo.id).where(Slovo.word == "owl")).scalar_one())
+    meaning = session.execute(select(Tlumachennia).where(Tlumachennia.text == "пес")).scalar_one()
+    meaning.text = "собака"
+    session.execute(update(Slovnyk).where(Slovnyk.id == en).values(nazva="English"))
+    session.commit()
+    delete_dictionary(session, old)
+
+    first = export_delta_to_file(session, tmp_path / "delta1.json")
+    stats = import_file(target, tmp_path / "delta1.json")
+    assert stats["deleted_dictionaries"] == 1
+    assert stats["deleted_words"] == 1
+    assert stats["renamed_dictionaries"] == 1
+    assert _dump(target) == _dump(session)
+
+    # без змін — порожня дельта з наступної позначки; застосовану дельту вдруге не приймає
+    second = export_delta_to_file(session, tmp_path / "delta2.json")
+    assert second["since"] == first["until"]
+    assert json.loads((tmp_path / "delta2.json").read_text(encoding="utf-8"))["dictionaries"] == []
+    with pytest.raises(ValueError):
+        import_file(target, tmp_path / "delta1.json")
+    assert _dump(target) == _dump(session)
+
+
+def test_delta_gap_is_rejected(session, target, add_dictionary, tmp_path):
+    did = add_dictionary("Тест", {"a": ["1"]})
+    import_file(target, export_dictionaries_to_file(session, tmp_path / "full.json"))
+    add_word_meanings(session, did, "b", ["2"])
+    export_delta_to_file(session, tmp_path / "delta1.json")
+    import_file(target, tmp_path / "delta1.json")
+    add_word_meanings(session, did, "c", ["3"])
+    export_delta_to_file(session, tmp_path / "delta2.json")
+    add_word_meanings(session, did, "d", ["4"])
+    export_delta_to_file(session, tmp_path / "delta3.json")
+
+    with pytest.raises(ValueError):
+        import_file(target, tmp_path / "delta3.json")
+    import_file(target, tmp_path / "delta2.json")
+    import_file(target, tmp_path / "delta3.json")
+    assert _dump(target) == _dump(session)
+
+
+def test_updated_at_follows_any_update(session, add_dictionary):
+    did = add_dictionary("Тест", {"a": ["1"]})
+    old = "2000-01-01 00:00:00.000000"
+    for table in ("dictionaries", "words", "meanings"):
+        session.execute(text(f"UPDATE {table} SET updated_at = :t"), {"t": old})
+    session.commit()
+
+    def stamps():
+        return [session.execute(text(f"SELECT updated_at FROM {t}")).scalar_one()
+                for t in ("dictionaries", "words", "meanings")]
+
+    # лічильники (words_count / meanings_count) — не зміна запису
+    add_word_meanings(session, did, "b", ["2"])
+    session.execute(text("DELETE FROM words WHERE word = 'b'"))
+    session.commit()
+    assert stamps() == [old, old, old]
+
+    session.execute(update(Slovo).values(word="A"))
+    session.execute(update(Tlumachennia).values(text="один"))
+    session.execute(update(Slovnyk).values(nazva="Нова назва"))
+    session.commit()
+    assert all(stamp > old for stamp in stamps())
+
+
+def test_full_export_keeps_delta_chain(session, target, add_dictionary, tmp_path):
+    did = add_dictionary("Тест", {"a": ["1"]})
+    export_delta_to_file(session, tmp_path / "delta1.json")
+    import_file(target, tmp_path / "delta1.json")
+    add_word_meanings(session, did, "b", ["2"])
+    log_size = session.execute(text("SELECT count(*) FROM change_log")).scalar_one()
+
+    export_dictionaries_to_file(session, tmp_path / "full.json")
+    export_split_to_dir(session, tmp_path / "split", compression="none", workers=1)
+    assert session.execute(text("SELECT count(*) FROM change_log")).scalar_one() == log_size
+
+    export_delta_to_file(session, tmp_path / "delta2.json")
+    import_file(target, tmp_path / "delta2.json")
+    assert _dump(target) == _dump(session)
@@ -0,0 +1,124 @@
+import json
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from slovnyk.archive import MANIFEST_NAME, manifest_files
+from slovnyk.db import counter_drift
+from slovnyk.io_json import (
+    bulk_import, export_dictionaries_to_file, export_split_to_dir, import_directory, import_file, iter_dictionary_words,
+    parse_import_data,
+)
+from slovnyk.json_stream import iter_json_file
+from slovnyk.models import Slovnyk
+
+WORDS = [
+    {"slovo": "кіт", "tlumachennia": ["тварина", "мурчить"]},
+    {"slovo": "м'ята", "tlumachennia": ["рослина"]},
+    {"slovo": "Ábc   \"лапки\"", "tlumachennia": []},
+]
+
+IMPORT_SHAPES = {
+    "list": [{"nazva": "A", "typ": "t", "slova": WORDS}, {"nazva": "B", "typ": "t", "slova": None}],
+    "wrapper": {"dictionaries": [{"typ": "t", "nazva": "A", "slova": WORDS, "extra": {"x": [1, 2]}}]},
+    "ukrainian": {"словники": [{"nazva": "A", "typ": "t", "слова": WORDS}]},
+    "single": {"nazva": "A", "typ": "t", "slova": WORDS},
+    "words-first": [{"slova": WORDS, "count": 3, "nazva": "A", "typ": "t"}],
+    "no-words": [{"nazva": "A", "typ": "t"}],
+}
+
+
+def _materialized(records):
+    return [{"nazva": d["nazva"], "typ": d["typ"], "slova": list(d["slova"])} for d in records]
+
+
+@pytest.mark.parametrize("read_size", [7, 1 << 16])
+@pytest.mark.parametrize("shape", IMPORT_SHAPES)
+def test_stream_parser_matches_parse_import_data(tmp_path, shape, read_size):
+    data = IMPORT_SHAPES[shape]
+    path = tmp_path / "in.json"
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+
+    expected = [{**d, "slova": d["slova"] or []} for d in parse_import_data(data)]
+    assert _materialized(iter_json_file(path, read_size)) == expected
+
+
+@pytest.mark.parametrize("data", [
+    [{"nazva": "A"}], {"slova": []}, 42, [{"nazva": "A", "typ": "t", "slova": "кіт"}],
+])
+def test_stream_parser_rejects_like_parse_import_data(tmp_path, data):
+    path = tmp_path / "bad.json"
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    with pytest.raises(ValueError):
+        parse_import_data(data)
+    with pytest.raises(ValueError):
+        _materialized(iter_json_file(path))
+
+
+def test_export_order_and_round_trip(session, add_dictionary, tmp_path):
+    did = add_dictionary("Тест", {"ясен": ["дерево"], "Бук": ["дерево"], "аґрус": ["кущ", "ягода"], "ялина": []})
+
+    words = list(iter_dictionary_words(session, did))
+    assert [w["slovo"] for w in words] == ["аґрус", "Бук", "ялина", "ясен"]
+    assert words[0]["tlumachennia"] == ["кущ", "ягода"]
+
+    path = export_dictionaries_to_file(session, tmp_path / "export.json")
+    exported = json.loads(path.read_text(encoding="utf-8"))
+    assert exported[0]["slova"] == words
+
+    session.execute(delete(Slovnyk))
+    session.commit()
+    assert import_file(session, path)["words"] == 4
+    new_id = session.execute(select(Slovnyk.id).where(Slovnyk.nazva == "Тест")).scalar_one()
+    assert [w["slovo"] for w in iter_dictionary_words(session, new_id)] == ["аґрус", "Бук", "ялина", "ясен"]
+
+
+@pytest.mark.parametrize("corrupt", ["manifest", "file"])
+def test_split_import_rejects_checksum_mismatch(session, add_dictionary, tmp_path, corrupt):
+    add_dictionary("A", {"кіт": ["тварина"]})
+    add_dictionary("B", {"пес": ["собака"]})
+    out = tmp_path / "split"
+    export_split_to_dir(session, out, compression="gzip")
+    manifest_path = out / MANIFEST_NAME
+    assert len(manifest_files(manifest_path)) == 2
+
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    entry = manifest["files"][1]
+    if corrupt == "manifest":
+        entry["sha256"] = "0" * 64
+        manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    else:
+        # той самий розмір, інший вміст: ловить лише sha256
+        part = out / entry["file"]
+        data = bytearray(part.read_bytes())
+        data[-10] ^= 0xFF
+        part.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="контрольна сума"):
+        manifest_files(manifest_path)
+    with pytest.raises(ValueError, match="контрольна сума"):
+        import_directory(session, out)
+    assert session.scalar(select(func.count()).select_from(Slovnyk)) == 2
+
+
+def test_bulk_import_skips_duplicates_across_chunks(session, add_dictionary):
+    did = add_dictionary("A", {"кіт": ["тварина"]}, typ="t")
+    data = [{"nazva": "A", "typ": "t", "slova": [
+        {"slovo": " кіт ", "tlumachennia": ["тварина", " мурчить "]},
+        {"slovo": "пес", "tlumachennia": ["собака", "собака"]},
+        {"slovo": "", "tlumachennia": ["без слова"]},
+        {"word": "дім", "meanings": "будинок"},
+        {"slovo": "пес", "tlumachennia": ["собака", "гавкає"]},
+    ]}]
+
+    stats = bulk_import(session, data, chunk_size=2)
+    assert {k: stats[k] for k in ("rows", "words", "meanings", "skipped")} == {
+        "rows": 4, "words": 2, "meanings": 4, "skipped": 3,
+    }
+    words = {d["slovo"]: d["tlumachennia"] for d in iter_dictionary_words(session, did)}
+    assert words == {"кіт": ["тварина", "мурчить"], "пес": ["собака", "гавкає"], "дім": ["будинок"]}
+    assert counter_drift(session) == {"dictionaries": 0, "words": 0}
+
+    # повторний імпорт нічого не додає
+    again = bulk_import(session, data, chunk_size=2)
+    assert (again["words"], again["meanings"], again["skipped"]) == (0, 0, 7)
@@ -0,0 +1,64 @@
+import sqlite3
+
+from sqlalchemy import text
+
+from slovnyk import db
+from slovnyk.cache import clear_caches
+from slovnyk.migrations import current_version, has_column, latest_version, run_migrations
+from slovnyk.services import find_by_meaning, find_words, find_words_by_stem
+
+# схема версії 0 — як у бази, створеної до міграцій (data/dictionary_obj.db)
+LEGACY_SCHEMA = """
+CREATE TABLE dictionaries (
+    id INTEGER NOT NULL, nazva VARCHAR NOT NULL, typ VARCHAR NOT NULL, created_at DATETIME NOT NULL,
+    PRIMARY KEY (id), CONSTRAINT uq_dictionary_nazva_typ UNIQUE (nazva, typ)
+);
+CREATE TABLE words (
+    id INTEGER NOT NULL, dictionary_id INTEGER NOT NULL, word VARCHAR NOT NULL, created_at DATETIME NOT NULL,
+    PRIMARY KEY (id), CONSTRAINT uq_word_dictionary_word UNIQUE (dictionary_id, word),
+    FOREIGN KEY(dictionary_id) REFERENCES dictionaries (id) ON DELETE CASCADE
+);
+CREATE TABLE meanings (
+    id INTEGER NOT NULL, word_id INTEGER NOT NULL, text VARCHAR NOT NULL, created_at DATETIME NOT NULL,
+    PRIMARY KEY (id), CONSTRAINT uq_meaning_word_text UNIQUE (word_id, text),
+    FOREIGN KEY(word_id) REFERENCES words (id) ON DELETE CASCADE
+);
+INSERT INTO dictionaries VALUES (1, 'Тест', 'тлумачний', '2024-01-01 10:00:00.000000');
+INSERT INTO words VALUES (1, 1, 'М’ята', '2024-01-01 10:00:00.000000'), (2, 1, 'книга', '2024-01-01 10:00:00.000000');
+INSERT INTO meanings VALUES
+    (1, 1, 'рослина з п’ятьма пелюстками', '2024-01-01 10:00:00.000000'),
+    (2, 2, 'зшиті аркуші з текстом', '2024-01-01 10:00:00.000000'),
+    (3, 2, 'видання книгою', '2024-01-01 10:00:00.000000');
+"""
+
+
+def test_migrates_version_0_to_latest(tmp_path, monkeypatch):
+    path = tmp_path / "legacy.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(LEGACY_SCHEMA)
+    monkeypatch.setattr(db, "DB_PATH", path)
+    engine = db.make_engine()
+    clear_caches()
+    try:
+        with engine.connect() as conn:
+            assert current_version(conn) == 0
+        db.init_db(engine)
+
+        with engine.connect() as conn:
+            assert current_version(conn) == latest_version()
+            for table, column in [("words", "word_key"), ("words", "word_stem"), ("words", "meanings_count"),
+                                  ("dictionaries", "words_count"), ("meanings", "text_stem"),
+                                  ("meanings", "updated_at")]:
+                assert has_column(conn, table, column)
+            assert db.counter_drift(conn) == {"dictionaries": 0, "words": 0}
+            assert conn.execute(text("SELECT COUNT(*) FROM words WHERE updated_at != created_at")).scalar() == 0
+        # повторний запуск нічого не робить
+        assert run_migrations(engine) == []
+
+        with db.SessionLocal(bind=engine) as session:
+            assert [r[3] for r in find_words(session, "м'ята", exact=True)] == ["М’ята"]
+            assert {r[3] for r in find_words_by_stem(session, "книгою")} == {"книга"}
+            assert {r[3] for r in find_by_meaning(session, "п'ятьма")} == {"М’ята"}
+            assert {r[5] for r in find_by_meaning(session, "книги", mode="stem")} == {"видання книгою"}
+    finally:
+        engine.dispose()
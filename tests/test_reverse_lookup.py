@@ -0,0 +1,42 @@
+import pytest
+
+from slovnyk.services import add_word_meanings, find_by_meaning
+
+
+@pytest.fixture
+def dictionary_id(add_dictionary):
+    return add_dictionary("Англо-український", {"cat": ["кіт"], "dog": ["пес", "собака"]}, typ="перекладний")
+
+
+def _words(rows):
+    return [r[3] for r in rows]
+
+
+@pytest.mark.parametrize("mode,query", [("exact", "кошеня"), ("substring", "кошеня"), ("stem", "кошеням")])
+def test_cached_result_sees_new_meaning(session, dictionary_id, mode, query):
+    assert find_by_meaning(session, query, mode=mode) == []
+
+    add_word_meanings(session, dictionary_id, "cat", ["кошеня"])
+
+    assert _words(find_by_meaning(session, query, mode=mode)) == ["cat"]
+
+
+def test_modes(session, dictionary_id):
+    assert _words(find_by_meaning(session, "СОБАКА", mode="exact")) == ["dog"]
+    assert _words(find_by_meaning(session, "соба", mode="prefix")) == ["dog"]
+    assert _words(find_by_meaning(session, "собаками", mode="stem")) == ["dog"]
+    assert _words(find_by_meaning(session, "оба", mode="substring")) == ["dog"]
+    with pytest.raises(ValueError):
+        find_by_meaning(session, "кіт", mode="fuzzy")
+
+
+def test_stem_matches_any_word_of_meaning(session, add_dictionary):
+    add_dictionary("Тест", {"bookshop": ["магазин книжок"], "reader": ["той, хто читає книгу"], "book": ["книга"]})
+    assert sorted(_words(find_by_meaning(session, "книгою", mode="stem"))) == ["book", "reader"]
+    assert _words(find_by_meaning(session, "магазином", mode="stem")) == ["bookshop"]
+
+
+def test_short_substring_escapes_like_wildcards(session, add_dictionary):
+    add_dictionary("Тест", {"percent": ["50%"], "cat": ["кіт"]})
+    assert _words(find_by_meaning(session, "%")) == ["percent"]
+    assert find_by_meaning(session, "_") == []
@@ -0,0 +1,104 @@
+import unicodedata
+
+import pytest
+
+from slovnyk.services import find_by_meaning, find_similar_words, find_words, search_results
+
+
+@pytest.fixture
+def dictionary_id(add_dictionary):
+    return add_dictionary("Тест", {
+        "м’ята": ["рослина з п’ятьма пелюстками"],
+        "Київ": ["столиця"],
+        "кит": ["морський ссавець"],
+    })
+
+
+def _words(rows):
+    return sorted({r[3] for r in rows})
+
+
+@pytest.mark.parametrize("q", ["м'ята", "м’ята", "мʼята", "М'ЯТ", "'ят", "'я"])
+def test_substring_ignores_apostrophe_variant(session, dictionary_id, q):
+    assert _words(find_words(session, q)) == ["м’ята"]
+
+
+def test_substring_matches_any_unicode_form(session, dictionary_id):
+    decomposed = unicodedata.normalize("NFD", "київ")
+    assert decomposed != "київ"
+    assert _words(find_words(session, decomposed)) == ["Київ"]
+    assert _words(find_words(session, "иї")) == ["Київ"]
+
+
+def test_exact_and_substring_agree(session, dictionary_id):
+    assert _words(find_words(session, "м'ята", exact=True)) == _words(find_words(session, "м'ята"))
+
+
+def test_reverse_substring_ignores_apostrophe_variant(session, dictionary_id):
+    assert _words(find_by_meaning(session, "п'ять")) == ["м’ята"]
+    assert _words(find_by_meaning(session, "П'ЯТЬМА", mode="exact")) == []
+    assert _words(find_by_meaning(session, "п'ятьма пел")) == ["м’ята"]
+
+
+def test_short_substring_escapes_like_wildcards(session, add_dictionary):
+    add_dictionary("Тест", {"50%": ["відсоток"], "a_b": ["підкреслення"], "кіт": ["тварина"]})
+    assert _words(find_words(session, "%")) == ["50%"]
+    assert _words(find_words(session, "_")) == ["a_b"]
+    assert find_words(session, "к_") == []
+
+
+@pytest.mark.parametrize("field", ["word", "meaning"])
+def test_unknown_mode_is_rejected(session, dictionary_id, field):
+    with pytest.raises(ValueError):
+        search_results(session, "кит", "fuzy", field=field)
+
+
+def test_fuzzy_uses_key_index(session, dictionary_id):
+    assert [r[2] for r in find_similar_words(session, "мята")] == ["м’ята"]
+
+
+def test_fuzzy_prefix_candidates_nearest_length_first(session, add_dictionary, monkeypatch):
+    from slovnyk import services
+
+    # ключі "коа…" коротші і менші за "котік": без ORDER BY LIMIT узяв би лише їх
+    add_dictionary("Тест", {**{f"коа{c}": ["шум"] for c in "абвгд"}, "котік": ["звір"]})
+    monkeypatch.setattr(services, "FUZZY_CANDIDATES", 2)
+    monkeypatch.setattr(services, "has_fts", lambda _session: False)
+    assert [r[2] for r in find_similar_words(session, "котик")] == ["котік"]
+
+
+def test_fuzzy_trigram_candidates_need_enough_shared(session, add_dictionary, monkeypatch):
+    from slovnyk import services
+
+    # спільна лише "ара": щоб бути на відстані 2, слово мусить мати щонайменше 10 - 3·2 = 4 триграми ключа
+    add_dictionary("Тест", {**{f"{c}бараббббббб": ["шум"] for c in "бвгдежзийк"}, "оранжерейний": ["теплиця"]})
+    checked = []
+    original = services.edit_distance
+
+    def edit_distance(a, b, max_distance):
+        checked.append(b)
+        return original(a, b, max_distance)
+
+    monkeypatch.setattr(services, "edit_distance", edit_distance)
+    assert [r[2] for r in find_similar_words(session, "аранжерейний")] == ["оранжерейний"]
+    assert checked == ["оранжерейний"]
+
+
+def test_result_read_before_invalidation_is_not_cached(session, engine, dictionary_id):
+    from sqlalchemy import event
+
+    from slovnyk.cache import MISS, invalidate_search, search_cache
+
+    def writer_commits_meanwhile(*_args):
+        invalidate_search()
+
+    # скидання кешу, поки читач іде в базу: прочитаний результат міг уже застаріти
+    event.listen(engine, "before_cursor_execute", writer_commits_meanwhile)
+    try:
+        assert _words(find_words(session, "кит", exact=True)) == ["кит"]
+    finally:
+        event.remove(engine, "before_cursor_execute", writer_commits_meanwhile)
+    assert search_cache.get(("words", "кит", True, None)) is MISS
+
+    find_words(session, "кит", exact=True)
+    assert search_cache.get(("words", "кит", True, None)) is not MISS
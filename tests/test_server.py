@@ -0,0 +1,111 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from slovnyk.server import HttpError, LookupServer, content_length
+
+
+@pytest.mark.parametrize("headers,expected", [({}, 0), ({"content-length": ""}, 0), ({"content-length": "42"}, 42)])
+def test_content_length(headers, expected):
+    assert content_length(headers) == expected
+
+
+@pytest.mark.parametrize("value,status", [
+    ("abc", 400), ("-1", 400), ("+5", 400), ("1e3", 400), (" 5", 400), ("١٢", 400), ("101", 413),
+])
+def test_content_length_rejected(value, status):
+    with pytest.raises(HttpError) as e:
+        content_length({"content-length": value}, max_bytes=100)
+    assert e.value.status == status
+
+
+async def _exchange(server, raw: bytes):
+    """ Сирий запит на запущений сервер -> (статус, JSON-відповідь)."""
+    srv = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+    port = srv.sockets[0].getsockname()[1]
+    async with srv:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), json.loads(body)
+
+
+@pytest.fixture
+def server(engine, add_dictionary):
+    add_dictionary("Тест", {"кіт": ["свійська тварина"]})
+    srv = LookupServer(port=0, read_workers=1)
+    yield srv
+    srv.close()
+
+
+@pytest.mark.parametrize("length,status", [("abc", 400), ("-5", 400), ("99999999999", 413)])
+def test_bad_content_length_gets_response(server, length, status):
+    raw = f"POST /words HTTP/1.1\r\nContent-Length: {length}\r\nConnection: close\r\n\r\n".encode()
+    got, payload = asyncio.run(_exchange(server, raw))
+    assert got == status
+    assert "error" in payload
+
+
+def test_post_and_search(server):
+    body = json.dumps({"dictionary_id": 1, "word": "кіт", "meanings": ["мурчить"]}).encode()
+    raw = (f"POST /words HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode() + body
+    status, payload = asyncio.run(_exchange(server, raw))
+    assert status == 200
+    assert payload["added_meanings"] == 1
+
+    raw = "GET /search?q=%D0%BA%D1%96%D1%82&mode=exact HTTP/1.1\r\nConnection: close\r\n\r\n".encode()
+    status, payload = asyncio.run(_exchange(server, raw))
+    assert status == 200
+    assert payload["results"]
+
+
+def _get(server, target):
+    raw = f"GET {target} HTTP/1.1\r\nConnection: close\r\n\r\n".encode()
+    return asyncio.run(_exchange(server, raw))
+
+
+@pytest.mark.parametrize("path", ["/search?q=a", "/autocomplete?prefix=a", "/reports/top"])
+@pytest.mark.parametrize("limit", ["-1", "0", "1001", "99999999999"])
+def test_limit_out_of_range(server, path, limit):
+    status, payload = _get(server, f"{path}&limit={limit}" if "?" in path else f"{path}?limit={limit}")
+    assert status == 400
+    assert "limit" in payload["error"]
+
+
+def test_limit_in_range(server, add_dictionary):
+    add_dictionary("Ще", {"кит": ["ссавець"], "кит2": ["ще"]})
+    status, payload = _get(server, "/search?q=%D0%BA%D0%B8&limit=1")
+    assert status == 200
+    assert len(payload["results"]) == 1
+
+
+def test_timeout_interrupts_query(engine, add_dictionary, monkeypatch):
+    from sqlalchemy import text
+
+    from slovnyk import server as server_module
+
+    add_dictionary("Тест", {"кіт": ["тварина"]})
+    slow_sql = text("WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 300000000) "
+                    "SELECT count(*) FROM c")
+
+    def slow_search(session, *args):
+        session.execute(slow_sql).scalar()
+        return []
+
+    monkeypatch.setattr(server_module, "search_response", slow_search)
+    srv = LookupServer(port=0, read_workers=1, timeout=0.2)
+    try:
+        status, _ = _get(srv, "/search?q=abc")
+        assert status == 504
+        # єдиний потік читання звільнився: наступний запит не чекає на повільний SQL
+        started = time.perf_counter()
+        status, _ = _get(srv, "/words/1")
+        assert status == 200
+        assert time.perf_counter() - started < 2
+    finally:
+        srv.close()
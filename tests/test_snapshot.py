@@ -0,0 +1,27 @@
+import pytest
+
+from slovnyk.io_json import export_snapshot_to_file
+from slovnyk.snapshot import Snapshot
+
+
+@pytest.fixture
+def words(add_dictionary):
+    words = {f"слово{i}": [f"тлумачення {i}"] for i in range(500)}
+    words.update({"М’ята": ["рослина"], "кіт": ["тварина", "звір"], "cat": ["кіт"]})
+    add_dictionary("Тест", words)
+    return words
+
+
+@pytest.mark.parametrize("mph", [True, False])
+def test_round_trip_finds_every_key(session, words, tmp_path, mph):
+    info = export_snapshot_to_file(session, tmp_path / "test.snap", mph=mph)
+    assert info["keys"] == len(words)
+    with Snapshot(tmp_path / "test.snap") as snap:
+        for word, meanings in words.items():
+            found = snap.lookup(word)
+            assert [(r["word"], r["meanings"]) for r in found] == [(word, meanings)]
+        # регістр і вид апострофа — як у normalize_key
+        assert snap.lookup("м'ята")[0]["word"] == "М’ята"
+        for absent in ("слово500", "слово", "кітт", "ki", "", "ята"):
+            assert snap.lookup(absent) == []
+        assert [r["word"] for r in snap.prefix("слово49", limit=20)] == ["слово49", *(f"слово49{i}" for i in range(10))]
@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import event
+
+from slovnyk.services import word_page
+
+
+@pytest.fixture
+def dictionary_id(add_dictionary):
+    return add_dictionary("Тест", {w: ["-"] for w in ("Кіт", "кит", "Кобза", "коза", "лис", "Антон", "бобер")})
+
+
+def _all_pages(session, dictionary_id, prefix, by_word, limit=2):
+    rows, after = [], None
+    while True:
+        page = word_page(session, dictionary_id, after, prefix, limit, by_word=by_word)
+        rows.extend(r.word for r in page)
+        if len(page) < limit:
+            return rows
+        after = page[-1]
+
+
+def test_prefix_pages_follow_word_key(session, dictionary_id):
+    assert _all_pages(session, dictionary_id, "К", by_word=True) == ["кит", "Кобза", "коза", "Кіт"]
+    assert _all_pages(session, dictionary_id, "ко", by_word=True) == ["Кобза", "коза"]
+
+
+def test_pages_without_prefix(session, dictionary_id):
+    words = _all_pages(session, dictionary_id, None, by_word=True)
+    assert words == sorted(words)
+    assert len(words) == 7
+    assert _all_pages(session, dictionary_id, "к", by_word=False) == ["Кіт", "кит", "Кобза", "коза"]
+
+
+def test_prefix_page_uses_word_key_index(session, engine, dictionary_id):
+    first = word_page(session, dictionary_id, None, "к", 2, by_word=True)
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    word_page(session, dictionary_id, first[-1], "к", 2, by_word=True)
+    event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[-1]
+    plan = " ".join(r[3] for r in session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters))
+    assert "ix_words_dictionary_id_word_key" in plan
+    assert "TEMP B-TREE" not in plan